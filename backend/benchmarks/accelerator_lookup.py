@@ -0,0 +1,101 @@
+"""Accelerator lookup by name: ILIKE vs slug index vs the in-process resolver.
+
+Fills a scratch table shaped like `accelerators` (unique university, slug
+with the covering unique index) and times single-row lookups the way the
+routes do them. Needs a local Postgres (defaults to the app's DB settings):
+
+    python -m benchmarks.accelerator_lookup --rows 100000 --lookups 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import asyncpg
+
+from src.core.normalization import slugify
+
+TABLE = "bench_accelerators"
+
+
+async def setup(conn: asyncpg.Connection, rows: int):
+    await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    await conn.execute(
+        f"CREATE TABLE {TABLE} ("
+        "id serial PRIMARY KEY, university varchar NOT NULL UNIQUE, slug varchar NOT NULL, "
+        "description varchar, is_active boolean NOT NULL DEFAULT true)"
+    )
+    await conn.copy_records_to_table(
+        TABLE,
+        records=[
+            (f"University of Example {i}", slugify(f"University of Example {i}"))
+            for i in range(rows)
+        ],
+        columns=["university", "slug"]
+    )
+    await conn.execute(f"CREATE UNIQUE INDEX ix_{TABLE}_slug ON {TABLE} (slug) INCLUDE (id)")
+    # sets the visibility map, without which no scan is index-only
+    await conn.execute(f"VACUUM ANALYZE {TABLE}")
+
+
+async def plan(conn: asyncpg.Connection, query: str, arg: str) -> str:
+    lines = await conn.fetch(f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) {query}", arg)
+    return lines[0][0].strip()
+
+
+async def timed(lookups, lookup) -> float:
+    started = time.perf_counter()
+    for name in lookups:
+        assert await lookup(name) is not None
+    return (time.perf_counter() - started) / len(lookups) * 1e6
+
+
+async def run(dsn: str, rows: int, lookups: int):
+    conn = await asyncpg.connect(dsn)
+    try:
+        await setup(conn, rows)
+        names = [f"University of Example {random.randrange(rows)}" for _ in range(lookups)]
+
+        ilike = f"SELECT id FROM {TABLE} WHERE university ILIKE $1"
+        by_slug = f"SELECT id FROM {TABLE} WHERE slug = $1"
+        cache = {}
+
+        async def cached(name):
+            slug = slugify(name)
+            if slug not in cache:
+                cache[slug] = await conn.fetchval(by_slug, slug)
+            return cache[slug]
+
+        results = [
+            ("university ILIKE", await plan(conn, ilike, names[0]),
+             await timed(names, lambda name: conn.fetchval(ilike, name))),
+            ("slug =", await plan(conn, by_slug, slugify(names[0])),
+             await timed(names, lambda name: conn.fetchval(by_slug, slugify(name)))),
+        ]
+        await timed(names, cached)
+        results.append(("resolver cache (warm)", "no query", await timed(names, cached)))
+
+        print(f"{rows} accelerators, {lookups} lookups")
+        for label, node, micros in results:
+            print(f"{label:<22} {micros:10.1f} us/lookup  {node}")
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_DSN")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    dsn = args.dsn
+    if dsn is None:
+        from src.core.config import settings
+        dsn = settings.DATABASE_DSN
+    asyncio.run(run(dsn, args.rows, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
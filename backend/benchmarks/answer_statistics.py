@@ -0,0 +1,118 @@
+"""Cold answer statistics over a large answer table.
+
+Fills a scratch table shaped like research_answers with scale, multiple
+choice and checkbox answers, then times the grouped aggregate the
+statistics endpoint runs plus the post-processing in
+src.project.project_research.statistics. Exits non-zero above --max-ms.
+Needs a local Postgres (defaults to the app's DB settings):
+
+    python -m benchmarks.answer_statistics --answers 1000000 --questions 30 --max-ms 1000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import asyncpg
+
+from src.project.project_research import statistics
+
+TABLE = "bench_answer_statistics"
+OPTIONS = ["a", "b", "c", "d", "e"]
+
+
+def synthetic_rows(answers: int, questions: int):
+    for answer_id in range(1, answers + 1):
+        question_id = answer_id % questions
+        kind = question_id % 3
+        if kind == 0:
+            text = str(min(10, max(1, round(random.gauss(6, 2)))))
+        elif kind == 1:
+            text = random.choice(OPTIONS)
+        else:
+            text = json.dumps(random.sample(OPTIONS, random.randint(1, 3)))
+        yield (answer_id, question_id, text, answer_id % 50)
+
+
+async def setup(conn: asyncpg.Connection, answers: int, questions: int):
+    await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    await conn.execute(
+        f"CREATE TABLE {TABLE} (id int PRIMARY KEY, question_id int NOT NULL, "
+        "answer_text varchar NOT NULL, accelerator_id int)"
+    )
+    await conn.copy_records_to_table(TABLE, records=synthetic_rows(answers, questions))
+    await conn.execute(f"VACUUM ANALYZE {TABLE}")
+
+
+def post_process(rows):
+    counts = {}
+    for question_id, answer_text, count in rows:
+        counts.setdefault(question_id, []).append((answer_text, count))
+    summaries = statistics.scale_summaries([
+        (question_id, value, count)
+        for question_id, answers in counts.items() if question_id % 3 == 0
+        for answer_text, count in answers
+        if (value := statistics.parse_scale(answer_text)) is not None
+    ])
+    distributions = {
+        question_id: statistics.choice_counts(answers, OPTIONS, multiple=question_id % 3 == 2)
+        for question_id, answers in counts.items()
+    }
+    return summaries, distributions
+
+
+async def run(dsn: str, answers: int, questions: int, repeat: int) -> float:
+    conn = await asyncpg.connect(dsn)
+    try:
+        await setup(conn, answers, questions)
+        query = (
+            f"SELECT question_id, answer_text, count(*) FROM {TABLE} "
+            "WHERE question_id = ANY($1) GROUP BY question_id, answer_text"
+        )
+        scoped = query.replace("WHERE", "WHERE accelerator_id = $2 AND")
+        question_ids = list(range(questions))
+        results = {}
+        for label, sql, args in (("all projects", query, ()), ("one accelerator", scoped, (7,))):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = await conn.fetch(sql, question_ids, *args)
+                aggregated = time.perf_counter()
+                post_process(rows)
+                finished = time.perf_counter()
+                timings.append((aggregated - started, finished - aggregated, len(rows)))
+            sql_time, python_time, groups = min(timings)
+            results[label] = (sql_time + python_time) * 1000
+            print(
+                f"{label:<16} sql {sql_time * 1000:8.1f} ms  post-processing {python_time * 1000:6.2f} ms  "
+                f"({groups} groups)"
+            )
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        return max(results.values())
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_DSN")
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if a cold computation takes longer")
+    args = parser.parse_args()
+
+    dsn = args.dsn
+    if dsn is None:
+        from src.core.config import settings
+        dsn = settings.DATABASE_DSN
+    slowest = asyncio.run(run(dsn, args.answers, args.questions, args.repeat))
+    if args.max_ms is not None and slowest > args.max_ms:
+        print(f"over budget: {slowest:.1f} ms > {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Write throughput under contention: compare-and-swap vs SELECT ... FOR UPDATE.
+
+Every worker repeatedly does a read-modify-write on one of a few hot rows,
+the way concurrent project edits and stage advances do. Needs a local
+Postgres (defaults to the app's DB settings):
+
+    python -m benchmarks.contention --workers 32 --rows 4 --ops 200
+"""
+import argparse
+import asyncio
+import time
+
+import asyncpg
+
+TABLE = "bench_contention"
+
+
+async def setup(pool: asyncpg.Pool, rows: int):
+    async with pool.acquire() as conn:
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.execute(
+            f"CREATE TABLE {TABLE} (id int PRIMARY KEY, version int NOT NULL, value int NOT NULL)"
+        )
+        await conn.executemany(
+            f"INSERT INTO {TABLE} VALUES ($1, 1, 0)",
+            [(i,) for i in range(rows)]
+        )
+
+
+async def cas_worker(pool: asyncpg.Pool, worker: int, rows: int, ops: int) -> int:
+    retries = 0
+    for op in range(ops):
+        row_id = (worker + op) % rows
+        while True:
+            async with pool.acquire() as conn:
+                version, value = await conn.fetchrow(
+                    f"SELECT version, value FROM {TABLE} WHERE id = $1", row_id
+                )
+                status = await conn.execute(
+                    f"UPDATE {TABLE} SET value = $1, version = version + 1 "
+                    f"WHERE id = $2 AND version = $3",
+                    value + 1, row_id, version
+                )
+            if status.endswith(" 1"):
+                break
+            retries += 1
+    return retries
+
+
+async def lock_worker(pool: asyncpg.Pool, worker: int, rows: int, ops: int) -> int:
+    for op in range(ops):
+        row_id = (worker + op) % rows
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                value = await conn.fetchval(
+                    f"SELECT value FROM {TABLE} WHERE id = $1 FOR UPDATE", row_id
+                )
+                await conn.execute(
+                    f"UPDATE {TABLE} SET value = $1, version = version + 1 WHERE id = $2",
+                    value + 1, row_id
+                )
+    return 0
+
+
+async def run(dsn: str, workers: int, rows: int, ops: int):
+    pool = await asyncpg.create_pool(dsn, min_size=workers, max_size=workers)
+    try:
+        for name, worker in (("compare-and-swap", cas_worker), ("select for update", lock_worker)):
+            await setup(pool, rows)
+            started = time.perf_counter()
+            retries = await asyncio.gather(
+                *(worker(pool, i, rows, ops) for i in range(workers))
+            )
+            elapsed = time.perf_counter() - started
+
+            total = await pool.fetchval(f"SELECT sum(value) FROM {TABLE}")
+            assert total == workers * ops, f"lost updates: {total} != {workers * ops}"
+            print(
+                f"{name:<18} {workers * ops / elapsed:9.0f} writes/s  "
+                f"retries={sum(retries)}  elapsed={elapsed:.2f}s"
+            )
+        async with pool.acquire() as conn:
+            await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    finally:
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_DSN")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=4, help="number of hot rows")
+    parser.add_argument("--ops", type=int, default=200, help="writes per worker")
+    args = parser.parse_args()
+
+    dsn = args.dsn
+    if dsn is None:
+        from src.core.config import settings
+        dsn = settings.DATABASE_DSN
+    asyncio.run(run(dsn, args.workers, args.rows, args.ops))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Request throughput at high log volume: no logging vs a synchronous
+handler vs the queue pipeline from src.core.logging_config, without and
+with 10% sampling of the handler's logger.
+
+Each request logs --lines records. The sink stands in for stdout and
+sleeps --sink-latency-ms per write, like a backed-up container log
+driver. Run from the backend directory:
+
+    python -m benchmarks.logging_throughput --requests 2000 --lines 20 --sink-latency-ms 0.05
+"""
+import argparse
+import asyncio
+import logging
+import queue
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.core.logging_config import ContextFilter, DroppingQueueHandler, JsonFormatter, LogWriter, RequestIdMiddleware
+
+logger = logging.getLogger("benchmark.handler")
+
+
+class SlowSink:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, text: str):
+        self.writes += text.count("\n")
+        if self.latency:
+            time.sleep(self.latency)
+
+    def flush(self):
+        pass
+
+
+def make_app(lines: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        for line in range(lines):
+            logger.info("handled item %s step %s", item_id, line, extra={"item_id": item_id})
+        return {"id": item_id}
+
+    return app
+
+
+def configure(mode: str, sink: SlowSink):
+    root = logging.getLogger()
+    root.handlers = []
+    writer = None
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+    elif mode == "sync":
+        output = logging.StreamHandler(sink)
+        output.setFormatter(JsonFormatter())
+        output.addFilter(ContextFilter({}))
+        root.addHandler(output)
+        root.setLevel(logging.INFO)
+    else:
+        log_queue = queue.SimpleQueue()
+        handler = DroppingQueueHandler(log_queue, maxsize=10000)
+        handler.addFilter(ContextFilter({"benchmark.handler": 0.1} if mode == "sampled" else {}))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        writer = LogWriter(log_queue, sink, JsonFormatter())
+        writer.start()
+    return writer
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        pending = iter(range(requests))
+
+        async def worker():
+            for item_id in pending:
+                response = await client.get(f"/items/{item_id}")
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--lines", type=int, default=20, help="log records per request")
+    parser.add_argument("--sink-latency-ms", type=float, default=0.05)
+    args = parser.parse_args()
+
+    app = make_app(args.lines)
+    print(f"{'mode':<6} {'req/s':>9} {'lines':>9} {'dropped':>8}")
+    for mode in ("off", "sync", "queue", "sampled"):
+        sink = SlowSink(args.sink_latency_ms / 1000)
+        DroppingQueueHandler.dropped = 0
+        writer = configure(mode, sink)
+        rate = asyncio.run(drive(app, args.requests, args.concurrency))
+        if writer:
+            writer.stop()
+        print(f"{mode:<6} {rate:9.0f} {sink.writes:9d} {DroppingQueueHandler.dropped:8d}")
+
+
+if __name__ == "__main__":
+    main()
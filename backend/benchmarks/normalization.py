@@ -0,0 +1,56 @@
+"""Phone and email validations per second, uncached vs the normalization cache,
+one call at a time and as a bulk import through normalize_many.
+
+The workload repeats `--distinct` values, the way the same users keep
+logging in and saving their profiles. Run from the backend directory:
+
+    python -m benchmarks.normalization --calls 50000 --distinct 500
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from src.core.normalization import normalize_email, normalize_many, normalize_phone
+
+
+def workload(kind: str, distinct: int, calls: int) -> List[str]:
+    if kind == "phone":
+        values = [f"+7 912 {i // 10000 % 1000:03d}-{i // 100 % 100:02d}-{i % 100:02d}" for i in range(distinct)]
+    else:
+        values = [f"User.{i}@Example.com" for i in range(distinct)]
+    return [values[i % distinct] for i in range(calls)]
+
+
+def rate(normalize: Callable[[str], str], values: List[str]) -> float:
+    started = time.perf_counter()
+    for value in values:
+        normalize(value)
+    return len(values) / (time.perf_counter() - started)
+
+
+def batch_rate(normalize: Callable[[str], str], values: List[str]) -> float:
+    started = time.perf_counter()
+    normalize_many(normalize, values)
+    return len(values) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'':6} {'uncached/s':>12} {'cached/s':>12} {'speedup':>8} {'batch/s':>12}")
+    for kind, normalize in (("phone", normalize_phone), ("email", normalize_email)):
+        values = workload(kind, args.distinct, args.calls)
+        normalize.__wrapped__(values[0])  # load metadata outside the timing
+        before = rate(normalize.__wrapped__, values)
+        normalize.cache_clear()
+        after = rate(normalize, values)
+        normalize.cache_clear()
+        batch = batch_rate(normalize, values)
+        print(f"{kind:6} {before:12.0f} {after:12.0f} {after / before:7.1f}x {batch:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Per-accelerator answer queries and VACUUM: plain vs LIST-partitioned table.
+
+Builds two scratch copies of research_answers with the same synthetic data,
+one plain (indexed on research_project_id and accelerator_id) and one
+partitioned by accelerator like revision 0b6e1f4c9d83 does it, with the
+largest accelerators in their own partitions and the long tail in the
+default one. Then it times per-accelerator reads and, after rewriting one
+accelerator's answers the way saves do, the VACUUM that cleans up after
+them. Needs a local Postgres (defaults to the app's DB settings):
+
+    python -m benchmarks.partitioning --answers 5000000 --accelerators 200 --partitions 20
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import asyncpg
+
+PLAIN = "bench_answers_plain"
+PARTITIONED = "bench_answers_partitioned"
+COLUMNS = "id bigint NOT NULL, answer_text varchar NOT NULL, question_id int NOT NULL, research_project_id int NOT NULL, accelerator_id int"
+
+
+def synthetic_rows(answers: int, accelerators: int):
+    # a few large accelerators and a long tail, like real enrolment
+    weights = [1 / (rank + 1) for rank in range(accelerators)]
+    accelerator_ids = random.choices(range(1, accelerators + 1), weights=weights, k=answers)
+    for answer_id, accelerator_id in enumerate(accelerator_ids, start=1):
+        research_project_id = accelerator_id * 10000 + answer_id % 500
+        yield (answer_id, f"answer {answer_id}", answer_id % 40, research_project_id, accelerator_id)
+
+
+async def setup(conn: asyncpg.Connection, answers: int, accelerators: int, partitions: int):
+    await conn.execute(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED} CASCADE")
+    await conn.execute(f"CREATE TABLE {PLAIN} ({COLUMNS}, PRIMARY KEY (id))")
+    await conn.execute(f"CREATE TABLE {PARTITIONED} ({COLUMNS}) PARTITION BY LIST (accelerator_id)")
+    for accelerator_id in range(1, partitions + 1):
+        await conn.execute(
+            f"CREATE TABLE {PARTITIONED}_a{accelerator_id} PARTITION OF {PARTITIONED} "
+            f"FOR VALUES IN ({accelerator_id})"
+        )
+    await conn.execute(f"CREATE TABLE {PARTITIONED}_default PARTITION OF {PARTITIONED} DEFAULT")
+
+    for table in (PLAIN, PARTITIONED):
+        # the same rows in both tables, without holding them all in memory
+        random.seed(answers)
+        await conn.copy_records_to_table(table, records=synthetic_rows(answers, accelerators))
+    await conn.execute(f"CREATE INDEX ON {PLAIN} (research_project_id)")
+    await conn.execute(f"CREATE INDEX ON {PLAIN} (accelerator_id)")
+    await conn.execute(f"CREATE INDEX ON {PARTITIONED} (id)")
+    await conn.execute(f"CREATE INDEX ON {PARTITIONED} (research_project_id)")
+    for table in (PLAIN, PARTITIONED):
+        await conn.execute(f"VACUUM ANALYZE {table}")
+
+
+async def query_times(conn: asyncpg.Connection, table: str, accelerator_ids, repeat: int) -> float:
+    query = (
+        f"SELECT question_id, count(*) FROM {table} "
+        "WHERE accelerator_id = $1 GROUP BY question_id"
+    )
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for accelerator_id in accelerator_ids:
+            await conn.fetch(query, accelerator_id)
+    return (time.perf_counter() - started) / (repeat * len(accelerator_ids)) * 1000
+
+
+async def churn(conn: asyncpg.Connection, table: str, accelerator_id: int, fraction: float):
+    """Replace a share of one accelerator's answers, as save_research_answers does"""
+    await conn.execute(
+        f"WITH gone AS (DELETE FROM {table} WHERE accelerator_id = $1 AND random() < $2 RETURNING *) "
+        f"INSERT INTO {table} SELECT id, answer_text || '*', question_id, research_project_id, accelerator_id FROM gone",
+        accelerator_id, fraction
+    )
+
+
+async def vacuum_time(conn: asyncpg.Connection, table: str) -> float:
+    started = time.perf_counter()
+    await conn.execute(f"VACUUM {table}")
+    return (time.perf_counter() - started) * 1000
+
+
+async def run(dsn: str, answers: int, accelerators: int, partitions: int, repeat: int):
+    conn = await asyncpg.connect(dsn)
+    try:
+        started = time.perf_counter()
+        await setup(conn, answers, accelerators, partitions)
+        print(f"{answers} answers, {accelerators} accelerators, {partitions} partitions + default "
+              f"(setup {time.perf_counter() - started:.1f}s)")
+
+        large = list(range(1, min(partitions, 5) + 1))
+        tail = random.sample(range(partitions + 1, accelerators + 1), max(0, min(5, accelerators - partitions)))
+        for label, accelerator_ids in (("large accelerators", large), ("long-tail accelerators", tail)):
+            if not accelerator_ids:
+                continue
+            plain = await query_times(conn, PLAIN, accelerator_ids, repeat)
+            partitioned = await query_times(conn, PARTITIONED, accelerator_ids, repeat)
+            print(f"{label:<24} plain {plain:9.2f} ms/query  partitioned {partitioned:9.2f} ms/query")
+
+        # after churn only the changed accelerator's partition needs vacuuming
+        await churn(conn, PLAIN, 1, 0.2)
+        await churn(conn, PARTITIONED, 1, 0.2)
+        plain = await vacuum_time(conn, PLAIN)
+        partition = await vacuum_time(conn, f"{PARTITIONED}_a1")
+        print(f"{'vacuum after churn':<24} plain {plain:9.1f} ms        partition {partition:9.1f} ms")
+
+        await conn.execute(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED} CASCADE")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_DSN")
+    parser.add_argument("--answers", type=int, default=5_000_000)
+    parser.add_argument("--accelerators", type=int, default=200)
+    parser.add_argument("--partitions", type=int, default=20, help="accelerators with their own partition")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dsn = args.dsn
+    if dsn is None:
+        from src.core.config import settings
+        dsn = settings.DATABASE_DSN
+    asyncio.run(run(dsn, args.answers, args.accelerators, args.partitions, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
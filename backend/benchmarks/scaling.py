@@ -0,0 +1,124 @@
+"""Throughput from 1 to N uvicorn workers against a running Postgres.
+
+Starts the app with --workers 1, 2, 4, ... up to --max-workers, keeping
+DB_CONNECTION_BUDGET fixed, and drives it with concurrent GETs. Every
+non-2xx response counts as an error. Most routes need a bearer token;
+pass one with --token (or BENCHMARK_TOKEN) or let --email/--password log
+in first. Run from the backend directory with the usual .env:
+
+    python -m benchmarks.scaling --max-workers 8 --path /accelerators/ --seconds 10 \
+        --email admin@example.com --password Secret123
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+import httpx
+
+
+async def wait_ready(client: httpx.AsyncClient, path: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get(path)
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+            continue
+        if not response.is_success:
+            # a 401 would otherwise be measured as (very fast) throughput
+            raise RuntimeError(f"GET {path} returned {response.status_code}; pass --token or --email/--password")
+        return
+    raise RuntimeError("server did not start")
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/auth/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def load(client: httpx.AsyncClient, path: str, seconds: float, latencies: List[float]) -> int:
+    errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        if not response.is_success:
+            errors += 1
+    return errors
+
+
+async def measure(args: argparse.Namespace):
+    path, connections, seconds = args.path, args.connections, args.seconds
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=30) as client:
+        await wait_ready(client, "/docs")
+        token = args.token or (args.email and await login(client, args.email, args.password))
+        if token:
+            client.headers["Authorization"] = f"Bearer {token}"
+        await wait_ready(client, path)
+        # warm every worker's pool and caches before measuring
+        await asyncio.gather(*(load(client, path, 1, []) for _ in range(connections)))
+        latencies: List[float] = []
+        errors = await asyncio.gather(
+            *(load(client, path, seconds, latencies) for _ in range(connections))
+        )
+    latencies.sort()
+    return (
+        len(latencies) / seconds,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+        sum(errors)
+    )
+
+
+def run(workers: int, args) -> tuple:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), JOBS_IN_PROCESS="false")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.main:app",
+            "--port", str(args.port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log"
+        ],
+        env=env
+    )
+    try:
+        return asyncio.run(measure(args))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--path", default="/accelerators/")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default=os.environ.get("BENCHMARK_TOKEN"), help="bearer access token")
+    parser.add_argument("--email", help="log in as this user when no --token is given")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    workers = 1
+    baseline = None
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    while workers <= args.max_workers:
+        rps, p50, p99, errors = run(workers, args)
+        baseline = baseline or rps
+        print(f"{workers:>7} {rps:9.0f} {rps / baseline:7.2f}x {p50:8.1f} {p99:8.1f} {errors:>6}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
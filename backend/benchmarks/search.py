@@ -0,0 +1,123 @@
+"""Full-text answer search vs the ILIKE scan it replaces.
+
+Fills a scratch table shaped like research_answers with mixed Russian and
+English text, gives it the trigger-maintained tsvector and GIN index of
+revision 4d8c1a6e2f97, then times the ranked, highlighted search the
+/search endpoint runs (see src.search.service) for rare, common and phrase
+queries, with and without an accelerator filter, next to ILIKE. Needs a
+local Postgres (defaults to the app's DB settings):
+
+    python -m benchmarks.search --answers 3000000 --accelerators 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import asyncpg
+
+from src.search.service import HEADLINE_OPTIONS
+
+TABLE = "bench_search_answers"
+WORDS = (
+    "исследование гипотеза эксперимент ракета топливо двигатель испытание модель данные "
+    "рынок клиент продукт команда прототип проверка результат анализ выборка опрос "
+    "research hypothesis experiment rocket fuel engine test model data market customer "
+    "product team prototype validation result analysis sample survey"
+).split()
+# (label, query, the substring an ILIKE has to look for instead)
+QUERIES = (
+    ("rare word", "криогенный", "криоген"),
+    ("common word", "эксперимент", "эксперимент"),
+    ("english, stemmed", "rockets", "rocket"),
+    ("phrase", '"solid fuel"', "solid fuel"),
+)
+
+
+def synthetic_rows(answers: int, accelerators: int):
+    for answer_id in range(1, answers + 1):
+        words = random.choices(WORDS, k=random.randint(5, 40))
+        if answer_id % 5000 == 0:
+            words.append("криогенный")
+        if answer_id % 200 == 0:
+            words += ["solid", "fuel"]
+        yield (answer_id, " ".join(words), answer_id % 40, random.randint(1, accelerators))
+
+
+async def setup(conn: asyncpg.Connection, answers: int, accelerators: int):
+    await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    await conn.execute(
+        f"CREATE TABLE {TABLE} (id int PRIMARY KEY, answer_text varchar NOT NULL, "
+        "question_id int NOT NULL, accelerator_id int, search_vector tsvector)"
+    )
+    await conn.execute(
+        f"CREATE TRIGGER {TABLE}_search_vector BEFORE INSERT OR UPDATE OF answer_text ON {TABLE} "
+        "FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.russian', answer_text)"
+    )
+    await conn.copy_records_to_table(
+        TABLE,
+        records=synthetic_rows(answers, accelerators),
+        columns=["id", "answer_text", "question_id", "accelerator_id"]
+    )
+    await conn.execute(f"CREATE INDEX ON {TABLE} USING gin (search_vector)")
+    await conn.execute(f"CREATE INDEX ON {TABLE} (accelerator_id)")
+    await conn.execute(f"VACUUM ANALYZE {TABLE}")
+
+
+async def timed(conn: asyncpg.Connection, sql: str, args, repeat: int):
+    best, rows = None, []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await conn.fetch(sql, *args)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(rows)
+
+
+async def run(dsn: str, answers: int, accelerators: int, limit: int, repeat: int):
+    conn = await asyncpg.connect(dsn)
+    try:
+        started = time.perf_counter()
+        await setup(conn, answers, accelerators)
+        print(f"{answers} answers, {accelerators} accelerators (setup {time.perf_counter() - started:.1f}s)")
+
+        ranked = (
+            "SELECT id, ts_rank_cd(search_vector, q) AS rank, answer_text "
+            f"FROM {TABLE}, websearch_to_tsquery('russian'::regconfig, $1) q "
+            "WHERE search_vector @@ q {filter} ORDER BY rank DESC, id LIMIT $2"
+        )
+        search = (
+            f"SELECT id, rank, ts_headline('russian'::regconfig, answer_text, "
+            f"websearch_to_tsquery('russian'::regconfig, $1), '{HEADLINE_OPTIONS}') "
+            f"FROM ({ranked}) AS ranked ORDER BY rank DESC, id"
+        )
+        scan = f"SELECT id, answer_text FROM {TABLE} WHERE answer_text ILIKE $1 {{filter}} ORDER BY id LIMIT $2"
+        for scope, condition, extra in (("all", "", ()), ("accelerator", "AND accelerator_id = $3", (7,))):
+            for label, query, substring in QUERIES:
+                fts, hits = await timed(conn, search.format(filter=condition), (query, limit, *extra), repeat)
+                ilike, _ = await timed(conn, scan.format(filter=condition), (f"%{substring}%", limit, *extra), repeat)
+                print(f"{scope:<12} {label:<18} full-text {fts:9.2f} ms ({hits:3} hits)  ILIKE {ilike:9.2f} ms")
+
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_DSN")
+    parser.add_argument("--answers", type=int, default=3_000_000)
+    parser.add_argument("--accelerators", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dsn = args.dsn
+    if dsn is None:
+        from src.core.config import settings
+        dsn = settings.DATABASE_DSN
+    asyncio.run(run(dsn, args.answers, args.accelerators, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
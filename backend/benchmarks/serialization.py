@@ -0,0 +1,62 @@
+"""Serialization cost per 1,000 rows: default FastAPI path vs the fast read path.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import timeit
+from types import SimpleNamespace
+from typing import List
+
+from pydantic import TypeAdapter
+
+from src.core.fast_json import dumps
+from src.project.schemas import ProjectResponse, ProjectType
+
+
+def make_rows(count: int) -> List[dict]:
+    types = list(ProjectType)
+    return [
+        {
+            "name": f"project-{i}",
+            "description": "Описание проекта " * 8,
+            "id": i,
+            "type": types[i % len(types)],
+            "stage": "planning",
+            "user_id": i % 50,
+            "accelerator_id": None if i % 3 else i % 7,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    objects = [SimpleNamespace(**row) for row in rows]
+    adapter = TypeAdapter(List[ProjectResponse])
+
+    def response_model_path():
+        validated = adapter.validate_python(objects, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_path():
+        return dumps(rows)
+
+    assert json.loads(response_model_path()) == json.loads(fast_path())
+
+    for name, func in (("response_model + json", response_model_path), ("core rows + orjson", fast_path)):
+        seconds = min(timeit.repeat(func, number=args.repeat, repeat=3)) / args.repeat
+        per_thousand = seconds * 1000 / args.rows
+        print(f"{name:<24} {per_thousand * 1e3:8.3f} ms per 1,000 rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Import-time profile and startup budget for the API process.
+
+Imports src.main in fresh interpreters, reports the slowest modules
+(cumulative and self time, from -X importtime) and fails when the median
+import time or the peak RSS after import exceeds the budget. Run from the
+backend directory with the usual .env:
+
+    python -m benchmarks.startup --top 25 --max-seconds 1.5 --max-rss-mb 120
+
+tests/test_startup_budget.py checks the same budget on every test run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# cold-start budget of one API worker: import src.main, no I/O yet
+BUDGET_SECONDS = 1.5
+BUDGET_RSS_MB = 120
+
+PROBE = (
+    "import json, resource, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "print(json.dumps({{\n"
+    "    'seconds': time.perf_counter() - started,\n"
+    "    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024\n"
+    "}}))\n"
+)
+
+
+def probe(module: str, importtime: bool = False) -> Tuple[dict, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", PROBE.format(module=module)]
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) per line of -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def by_package(modules: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--runs", type=int, default=5, help="timed imports, median is reported")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--max-seconds", type=float, default=None, help=f"e.g. {BUDGET_SECONDS}")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help=f"e.g. {BUDGET_RSS_MB}")
+    args = parser.parse_args()
+
+    # first run warms the bytecode cache and gives the per-module breakdown
+    _, stderr = probe(args.module, importtime=True)
+    modules = parse_importtime(stderr)
+
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[2])[:args.top]:
+        print(f"{cumulative_us / 1000:13.1f} {self_us / 1000:8.1f}  {name}")
+
+    print(f"\n{'self ms':>8}  package")
+    packages = sorted(by_package(modules).items(), key=lambda p: -p[1])
+    for package, self_us in packages[:args.top]:
+        print(f"{self_us / 1000:8.1f}  {package}")
+
+    samples = [probe(args.module)[0] for _ in range(args.runs)]
+    seconds = statistics.median(s["seconds"] for s in samples)
+    rss_mb = max(s["rss_mb"] for s in samples)
+    print(f"\nimport {args.module}: {seconds:.3f}s median of {args.runs}, peak RSS {rss_mb:.1f} MB")
+
+    failures = []
+    if args.max_seconds is not None and seconds > args.max_seconds:
+        failures.append(f"import time {seconds:.3f}s exceeds budget {args.max_seconds}s")
+    if args.max_rss_mb is not None and rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.1f} MB exceeds budget {args.max_rss_mb} MB")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,18 @@
 #!/bin/sh
 alembic revision --autogenerate -m "init"
 alembic upgrade head
-exec poetry run uvicorn src.main:app --host 0.0.0.0 --port ${APP_PORT:-8000}
\ No newline at end of file
+# WEB_CONCURRENCY worker processes share DB_CONNECTION_BUDGET (see src.core.config).
+# On SIGTERM workers stop accepting and finish in-flight requests for up to
+# GRACEFUL_TIMEOUT seconds.
+WORKERS=${WEB_CONCURRENCY:-1}
+# With several workers uvicorn's supervisor replaces each one after
+# MAX_REQUESTS requests. A single worker runs without a supervisor and would
+# just exit, so it is never recycled.
+RECYCLE=""
+if [ "$WORKERS" -gt 1 ]; then
+    RECYCLE="--limit-max-requests ${MAX_REQUESTS:-10000}"
+fi
+exec poetry run uvicorn src.main:app --host 0.0.0.0 --port ${APP_PORT:-8000} \
+    --workers "$WORKERS" \
+    $RECYCLE \
+    --timeout-graceful-shutdown ${GRACEFUL_TIMEOUT:-30}
\ No newline at end of file
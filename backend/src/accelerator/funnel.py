@@ -0,0 +1,34 @@
+"""Rebuild the accelerator stage funnel counts from projects.
+
+The counts are kept current by triggers; run this after restoring data or
+to correct drift:
+
+    python -m src.accelerator.funnel
+"""
+import argparse
+import asyncio
+import time
+
+from src.db.database import async_session_factory
+# register related models for mapper configuration
+from src.auth.models import User
+from src.accelerator.service import rebuild_stage_funnel
+
+
+async def rebuild():
+    async with async_session_factory() as db:
+        started = time.perf_counter()
+        rows = await rebuild_stage_funnel(db)
+        await db.commit()
+        elapsed = time.perf_counter() - started
+
+    print(f"Rebuilt {rows} stage counts in {elapsed * 1000:.1f} ms")
+
+
+def main():
+    argparse.ArgumentParser(description="Rebuild the accelerator stage funnel counts").parse_args()
+    asyncio.run(rebuild())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Index
 from datetime import datetime
 from src.db.database import Base
 
@@ -8,12 +9,45 @@ class Accelerator(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     university: Mapped[str] = mapped_column(unique=True, nullable=False, index=True)
+    # normalized university name, see slugify(); how routes address accelerators
+    slug: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # deleting an accelerator detaches its projects (ON DELETE SET NULL), it never deletes them
     projects: Mapped[list["Project"]] = relationship(
-        back_populates="accelerator", 
-        cascade="all, delete-orphan"
-    )
\ No newline at end of file
+        back_populates="accelerator",
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        # slug -> id resolution is answered from the index alone
+        Index(
+            "ix_accelerators_slug",
+            "slug",
+            unique=True,
+            postgresql_include=["id"]
+        ),
+    )
+
+
+class AcceleratorStageCount(Base):
+    """How many live projects of an accelerator are at each stage.
+
+    Maintained by triggers on projects and research_projects (revision
+    c2e7a9f05b14), so every write path, database cascades included, keeps it
+    current; rebuild_stage_funnel() recomputes it from scratch.
+    """
+    __tablename__ = "accelerator_stage_counts"
+
+    # no foreign key: counts of a deleted accelerator drain to zero as its
+    # projects are detached, in the same statement that removes it
+    accelerator_id: Mapped[int] = mapped_column(primary_key=True)
+    # "project": category is the project type, stage is Project.stage
+    # "research": category is the research phase, stage the research stage
+    funnel: Mapped[str] = mapped_column(primary_key=True)
+    category: Mapped[str] = mapped_column(primary_key=True)
+    stage: Mapped[str] = mapped_column(primary_key=True)
+    projects: Mapped[int] = mapped_column(nullable=False, server_default="0")
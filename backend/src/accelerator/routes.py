@@ -4,21 +4,35 @@ from typing import List
 from src.accelerator.schemas import (
     AcceleratorInDB,
     AcceleratorCreate,
-    AcceleratorUpdate
+    AcceleratorUpdate,
+    AcceleratorBulkStatus,
+    AcceleratorReassign,
+    AcceleratorMerge,
+    AcceleratorBulkResult,
+    AcceleratorFunnel
 )
 from src.accelerator.service import (
     create_accelerator,
-    get_accelerator_by_university,
+    get_accelerator,
     search_accelerators,
-    update_accelerator_by_university,
-    delete_accelerator_by_university,
-    toggle_accelerator_status
+    search_accelerator_rows,
+    accelerator_rows_query,
+    update_accelerator,
+    delete_accelerator,
+    toggle_accelerator_status,
+    set_accelerators_status,
+    reassign_projects,
+    merge_accelerators,
+    get_stage_funnel
 )
 from src.db.database import get_async_session
-from src.auth.service import AuthService, allow_admin
+from src.db.unit_of_work import UnitOfWorkRoute, get_unit_of_work
+from src.core.fast_json import FastJSONResponse
+from src.core.streaming import StreamFormat, streaming_response
+from src.auth.service import AuthService, allow_admin, allow_staff, require_admin
 from src.auth.models import User
 
-accelerator_router = APIRouter(prefix="/accelerators", tags=["Accelerators"])
+accelerator_router = APIRouter(prefix="/accelerators", tags=["Accelerators"], route_class=UnitOfWorkRoute)
 
 @accelerator_router.get("/", response_model=List[AcceleratorInDB])
 async def search_accelerators_endpoint(
@@ -26,9 +40,24 @@ async def search_accelerators_endpoint(
     active_only: bool = Query(True),
     skip: int = 0,
     limit: int = 100,
+    fast: bool = False,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
+    if stream:
+        return streaming_response(
+            accelerator_rows_query(search, skip, limit, active_only),
+            stream
+        )
+    if fast:
+        return FastJSONResponse(await search_accelerator_rows(
+            db,
+            search_term=search,
+            active_only=active_only,
+            skip=skip,
+            limit=limit
+        ))
     return await search_accelerators(
         db,
         search_term=search,
@@ -37,13 +66,13 @@ async def search_accelerators_endpoint(
         limit=limit
     )
 
-@accelerator_router.get("/{university}", response_model=AcceleratorInDB)
+@accelerator_router.get("/{ref}", response_model=AcceleratorInDB)
 async def get_accelerator_endpoint(
-    university: str,
+    ref: str,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
-    accelerator = await get_accelerator_by_university(db, university)
+    accelerator = await get_accelerator(db, ref)
     if not accelerator:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,42 +80,91 @@ async def get_accelerator_endpoint(
         )
     return accelerator
 
+@accelerator_router.get("/{ref}/funnel", response_model=AcceleratorFunnel)
+async def get_stage_funnel_endpoint(
+    ref: str,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(allow_staff)
+):
+    """How many projects of the accelerator are at each project and research stage"""
+    funnel = await get_stage_funnel(db, ref)
+    if funnel is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Accelerator not found"
+        )
+    return funnel
+
 @accelerator_router.post("/", response_model=AcceleratorInDB, status_code=201)
 async def create_accelerator_endpoint(
     accelerator: AcceleratorCreate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: User = Depends(allow_admin)
 ):
     return await create_accelerator(db, accelerator)
 
-@accelerator_router.put("/{university}", response_model=AcceleratorInDB)
+@accelerator_router.put("/{ref}", response_model=AcceleratorInDB)
 async def update_accelerator_endpoint(
-    university: str,
+    ref: str,
     accelerator: AcceleratorUpdate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: User = Depends(allow_admin)
 ):
-    updated = await update_accelerator_by_university(db, university, accelerator)
+    updated = await update_accelerator(db, ref, accelerator)
     if not updated:
         raise HTTPException(status_code=404, detail="Accelerator not found")
     return updated
 
-@accelerator_router.delete("/{university}", status_code=204)
+@accelerator_router.delete("/{ref}", status_code=204)
 async def delete_accelerator_endpoint(
-    university: str,
-    db: AsyncSession = Depends(get_async_session),
+    ref: str,
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: User = Depends(allow_admin)
 ):
-    if not await delete_accelerator_by_university(db, university):
+    if not await delete_accelerator(db, ref):
         raise HTTPException(status_code=404, detail="Accelerator not found")
 
-@accelerator_router.post("/{university}/toggle-status", response_model=AcceleratorInDB)
+@accelerator_router.post("/{ref}/toggle-status", response_model=AcceleratorInDB)
 async def toggle_accelerator_status_endpoint(
-    university: str,
-    db: AsyncSession = Depends(get_async_session),
+    ref: str,
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: User = Depends(allow_admin)
 ):
-    result = await toggle_accelerator_status(db, university)
+    result = await toggle_accelerator_status(db, ref)
     if not result:
         raise HTTPException(status_code=404, detail="Accelerator not found")
-    return result
\ No newline at end of file
+    return result
+
+@accelerator_router.post("/bulk/status", response_model=AcceleratorBulkResult, tags=["accelerators admin"])
+async def set_accelerators_status_endpoint(
+    data: AcceleratorBulkStatus,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: User = Depends(require_admin)
+):
+    """Activate or deactivate many accelerators with one statement"""
+    return await set_accelerators_status(db, data.universities, data.is_active)
+
+@accelerator_router.post("/bulk/reassign", response_model=AcceleratorBulkResult, tags=["accelerators admin"])
+async def reassign_projects_endpoint(
+    data: AcceleratorReassign,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: User = Depends(require_admin)
+):
+    """Move all projects from one accelerator to another"""
+    result = await reassign_projects(db, data.source, data.target)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Accelerator not found")
+    return result
+
+@accelerator_router.post("/bulk/merge", response_model=AcceleratorBulkResult, tags=["accelerators admin"])
+async def merge_accelerators_endpoint(
+    data: AcceleratorMerge,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: User = Depends(require_admin)
+):
+    """Fold duplicate accelerators into the target: their projects move to it
+    and the duplicates are deleted"""
+    result = await merge_accelerators(db, data.target, data.duplicates)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Accelerator not found")
+    return result
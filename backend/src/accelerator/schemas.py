@@ -1,5 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import List
+from enum import Enum
 
 class Accelerator(BaseModel):
     university: str
@@ -18,5 +20,37 @@ class AcceleratorInDB(Accelerator):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
+    slug: str
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+class AcceleratorBulkStatus(BaseModel):
+    universities: List[str] = Field(min_length=1, max_length=1000)
+    is_active: bool
+
+class AcceleratorReassign(BaseModel):
+    source: str
+    target: str
+
+class AcceleratorMerge(BaseModel):
+    target: str
+    duplicates: List[str] = Field(min_length=1, max_length=1000)
+
+class AcceleratorBulkResult(BaseModel):
+    accelerators_updated: int = 0
+    accelerators_removed: int = 0
+    projects_moved: int = 0
+
+class FunnelKind(str, Enum):
+    PROJECT = "project"
+    RESEARCH = "research"
+
+class StageCount(BaseModel):
+    category: str
+    stage: str
+    projects: int
+
+class AcceleratorFunnel(BaseModel):
+    accelerator_id: int
+    projects: List[StageCount] = []
+    research: List[StageCount] = []
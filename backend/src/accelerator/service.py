@@ -1,46 +1,77 @@
+import re
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from src.accelerator.models import Accelerator
-from src.accelerator.schemas import AcceleratorCreate, AcceleratorUpdate
-from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import select, insert, update, delete, func, literal, text, cast, String, Select
+from src.core.cache import LocalCache, invalidate
+from src.core.fast_json import schema_columns, rows_to_dicts
+from src.core.normalization import slugify
+from src.accelerator.models import Accelerator, AcceleratorStageCount
+from src.accelerator.schemas import (
+    AcceleratorCreate,
+    AcceleratorUpdate,
+    AcceleratorInDB,
+    AcceleratorBulkResult,
+    AcceleratorFunnel,
+    FunnelKind,
+    StageCount
+)
+from src.project.models import Project
+from src.project.schemas import STAGE_MAPPING
+from src.project.project_research.models import ResearchProject
+from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 
+# search results; the catalogue is small, read on every page and rarely edited
+accelerator_cache = LocalCache("accelerators", maxsize=256, ttl=300)
+# slug -> id; an id never changes, so entries only go stale on rename or delete
+accelerator_id_cache = LocalCache("accelerator_ids", maxsize=16384, ttl=3600)
+
+NUMERIC_ID = re.compile(r"[0-9]{1,10}")
+INT4_MAX = 2_147_483_647
+
+async def _id_for_slug(db: AsyncSession, slug: str) -> Optional[int]:
+    async def load():
+        result = await db.execute(select(Accelerator.id).where(Accelerator.slug == slug))
+        return result.scalar_one_or_none()
+
+    return await accelerator_id_cache.get_or_load(slug, load)
+
+async def resolve_accelerator_id(db: AsyncSession, ref: str) -> Optional[int]:
+    """Id of the accelerator addressed by `ref`: a numeric id, a slug or the
+    university name itself (which slugifies to the slug)"""
+    # ASCII digits that fit an int4 id; isdigit() also accepts "²" or "٣",
+    # which int() rejects or maps to ids the column cannot hold
+    if NUMERIC_ID.fullmatch(ref) and int(ref) <= INT4_MAX:
+        return int(ref)
+    return await _id_for_slug(db, slugify(ref))
+
 async def create_accelerator(
     db: AsyncSession, 
     accelerator: AcceleratorCreate
 ) -> Accelerator:
-    existing = await get_accelerator_by_university(db, accelerator.university)
-    if existing:
+    slug = slugify(accelerator.university)
+    if await _id_for_slug(db, slug) is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Accelerator with this university already exists"
         )
     
-    db_accelerator = Accelerator(**accelerator.model_dump())
+    db_accelerator = Accelerator(**accelerator.model_dump(), slug=slug)
     db.add(db_accelerator)
-    await db.commit()
-    await db.refresh(db_accelerator)
+    await db.flush()
+    await invalidate(db, "accelerators")
     return db_accelerator
 
-async def get_accelerator_by_university(
+async def get_accelerator(
     db: AsyncSession, 
-    university: str
+    ref: str
 ) -> Optional[Accelerator]:
-    result = await db.execute(
-        select(Accelerator)
-        .where(Accelerator.university.ilike(university))
-    )
-    return result.scalars().first()
+    accelerator_id = await resolve_accelerator_id(db, ref)
+    if accelerator_id is None:
+        return None
+    return await db.get(Accelerator, accelerator_id)
 
-async def search_accelerators(
-    db: AsyncSession,
-    search_term: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    active_only: bool = True
-) -> List[Accelerator]:
-    query = select(Accelerator)
-    
+def _search_query(query, search_term: Optional[str], active_only: bool):
     if active_only:
         query = query.where(Accelerator.is_active == True)
     
@@ -49,50 +80,303 @@ async def search_accelerators(
             Accelerator.university.ilike(f"%{search_term}%")
         )
     
-    result = await db.execute(
-        query.order_by(Accelerator.university)
-        .offset(skip)
-        .limit(limit)
+    return query.order_by(Accelerator.university)
+
+async def search_accelerators(
+    db: AsyncSession,
+    search_term: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True
+) -> List[AcceleratorInDB]:
+    async def load():
+        query = _search_query(select(Accelerator), search_term, active_only)
+        result = await db.execute(query.offset(skip).limit(limit))
+        # schemas, not ORM instances: those belong to the session that loaded them
+        return [AcceleratorInDB.model_validate(accelerator) for accelerator in result.scalars()]
+
+    return await accelerator_cache.get_or_load(
+        ("schemas", search_term, skip, limit, active_only),
+        load
+    )
+
+def accelerator_rows_query(
+    search_term: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True
+) -> Select:
+    query = _search_query(
+        select(*schema_columns(Accelerator, AcceleratorInDB)),
+        search_term,
+        active_only
+    )
+    return query.offset(skip).limit(limit)
+
+async def search_accelerator_rows(
+    db: AsyncSession,
+    search_term: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True
+) -> List[Dict[str, Any]]:
+    async def load():
+        result = await db.execute(
+            accelerator_rows_query(search_term, skip, limit, active_only)
+        )
+        return rows_to_dicts(result)
+
+    return await accelerator_cache.get_or_load(
+        ("rows", search_term, skip, limit, active_only),
+        load
     )
-    return result.scalars().all()
 
-async def update_accelerator_by_university(
+async def update_accelerator(
     db: AsyncSession,
-    university: str,
+    ref: str,
     accelerator: AcceleratorUpdate
 ) -> Optional[Accelerator]:
-    db_accelerator = await get_accelerator_by_university(db, university)
+    db_accelerator = await get_accelerator(db, ref)
     if not db_accelerator:
         return None
     
     update_data = accelerator.model_dump(exclude_unset=True)
+    if update_data.get("university") is not None:
+        slug = slugify(update_data["university"])
+        if slug != db_accelerator.slug:
+            if await _id_for_slug(db, slug) is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Accelerator with this university already exists"
+                )
+            await invalidate(db, "accelerator_ids", db_accelerator.slug)
+            db_accelerator.slug = slug
     for key, value in update_data.items():
         setattr(db_accelerator, key, value)
     
-    await db.commit()
-    await db.refresh(db_accelerator)
+    await db.flush()
+    await invalidate(db, "accelerators")
+    await invalidate(db, "answer_statistics")
     return db_accelerator
 
-async def delete_accelerator_by_university(
+async def delete_accelerator(
     db: AsyncSession, 
-    university: str
+    ref: str
 ) -> bool:
+    accelerator_id = await resolve_accelerator_id(db, ref)
+    if accelerator_id is None:
+        return False
     result = await db.execute(
         delete(Accelerator)
-        .where(Accelerator.university.ilike(university))
+        .where(Accelerator.id == accelerator_id)
+        .returning(Accelerator.slug)
     )
-    await db.commit()
-    return result.rowcount > 0
+    slug = result.scalar_one_or_none()
+    if slug is None:
+        return False
+    await invalidate(db, "accelerators")
+    await invalidate(db, "accelerator_ids", slug)
+    await invalidate(db, "answer_statistics")
+    return True
 
 async def toggle_accelerator_status(
     db: AsyncSession,
-    university: str
+    ref: str
 ) -> Optional[Accelerator]:
-    db_accelerator = await get_accelerator_by_university(db, university)
+    db_accelerator = await get_accelerator(db, ref)
     if not db_accelerator:
         return None
     
     db_accelerator.is_active = not db_accelerator.is_active
-    await db.commit()
-    await db.refresh(db_accelerator)
-    return db_accelerator
\ No newline at end of file
+    await db.flush()
+    await invalidate(db, "accelerators")
+    await invalidate(db, "answer_statistics")
+    return db_accelerator
+
+def _universities(universities: List[str]):
+    return Accelerator.slug.in_({slugify(u) for u in universities})
+
+def _accelerator_id(university: str):
+    return (
+        select(Accelerator.id)
+        .where(Accelerator.slug == slugify(university))
+        .scalar_subquery()
+    )
+
+async def set_accelerators_status(
+    db: AsyncSession,
+    universities: List[str],
+    is_active: bool
+) -> AcceleratorBulkResult:
+    """One UPDATE; rows already in the requested state are not touched"""
+    result = await db.execute(
+        update(Accelerator)
+        .where(_universities(universities), Accelerator.is_active != is_active)
+        .values(is_active=is_active, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await invalidate(db, "accelerators")
+    await invalidate(db, "answer_statistics")
+    return AcceleratorBulkResult(accelerators_updated=result.rowcount)
+
+async def reassign_projects(
+    db: AsyncSession,
+    source: str,
+    target: str
+) -> Optional[AcceleratorBulkResult]:
+    """Move every project of `source` to `target` in one statement.
+
+    Returns None when either accelerator does not exist.
+    """
+    ids = select(
+        _accelerator_id(source).label("source_id"),
+        _accelerator_id(target).label("target_id")
+    ).cte("ids")
+    moved = (
+        update(Project)
+        .where(
+            Project.accelerator_id == ids.c.source_id,
+            ids.c.target_id.is_not(None),
+            # reassigning to itself must not bump every project's version
+            ids.c.source_id != ids.c.target_id
+        )
+        .values(
+            accelerator_id=ids.c.target_id,
+            version=Project.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .returning(Project.id)
+        .cte("moved")
+    )
+    result = await db.execute(
+        select(
+            ids.c.source_id,
+            ids.c.target_id,
+            select(func.count()).select_from(moved).scalar_subquery().label("moved")
+        )
+    )
+    row = result.one()
+    if row.source_id is None or row.target_id is None:
+        return None
+    if row.moved:
+        await invalidate(db, "answer_statistics")
+    return AcceleratorBulkResult(projects_moved=row.moved)
+
+async def merge_accelerators(
+    db: AsyncSession,
+    target: str,
+    duplicates: List[str]
+) -> Optional[AcceleratorBulkResult]:
+    """Move the duplicates' projects to `target` and delete the duplicates,
+    in one statement. Returns None when `target` does not exist."""
+    target_id = select(_accelerator_id(target).label("id")).cte("target")
+    merged = (
+        select(Accelerator.id)
+        .where(_universities(duplicates), Accelerator.id != target_id.c.id)
+        .cte("merged")
+    )
+    moved = (
+        update(Project)
+        .where(Project.accelerator_id.in_(select(merged.c.id)))
+        .values(
+            accelerator_id=target_id.c.id,
+            version=Project.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .returning(Project.id)
+        .cte("moved")
+    )
+    # the projects already point at the target when the SET NULL action runs
+    removed = (
+        delete(Accelerator)
+        .where(Accelerator.id.in_(select(merged.c.id)))
+        .returning(Accelerator.id)
+        .cte("removed")
+    )
+    result = await db.execute(
+        select(
+            target_id.c.id,
+            select(func.count()).select_from(moved).scalar_subquery().label("moved"),
+            select(func.count()).select_from(removed).scalar_subquery().label("removed")
+        )
+    )
+    row = result.one()
+    if row.id is None:
+        return None
+    await invalidate(db, "accelerators")
+    await invalidate(db, "accelerator_ids")
+    await invalidate(db, "answer_statistics")
+    return AcceleratorBulkResult(projects_moved=row.moved, accelerators_removed=row.removed)
+
+# funnel order of the project stages, by project type value
+_PROJECT_STAGES = {project_type.value: stages for project_type, stages in STAGE_MAPPING.items()}
+
+def _stage_order(row: AcceleratorStageCount) -> tuple:
+    stages = _PROJECT_STAGES.get(row.category, []) if row.funnel == FunnelKind.PROJECT else []
+    position = stages.index(row.stage) if row.stage in stages else len(stages)
+    return (row.category, position, row.stage)
+
+async def get_stage_funnel(
+    db: AsyncSession,
+    ref: str
+) -> Optional[AcceleratorFunnel]:
+    """Projects per stage, read from the maintained counts: one index range
+    scan over the accelerator's stages, however many projects it has"""
+    accelerator_id = await resolve_accelerator_id(db, ref)
+    if accelerator_id is None or await db.get(Accelerator, accelerator_id) is None:
+        return None
+
+    result = await db.execute(
+        select(AcceleratorStageCount)
+        .where(
+            AcceleratorStageCount.accelerator_id == accelerator_id,
+            AcceleratorStageCount.projects > 0
+        )
+    )
+    funnel = AcceleratorFunnel(accelerator_id=accelerator_id)
+    for row in sorted(result.scalars(), key=_stage_order):
+        stages = funnel.projects if row.funnel == FunnelKind.PROJECT else funnel.research
+        stages.append(StageCount(category=row.category, stage=row.stage, projects=row.projects))
+    return funnel
+
+async def rebuild_stage_funnel(db: AsyncSession) -> int:
+    """Recompute every accelerator's stage counts; returns the number of rows.
+
+    Trigger updates from concurrent writes wait for the table lock and then
+    apply on top of the rebuilt counts, so nothing is lost or counted twice.
+    """
+    await db.execute(text("LOCK TABLE accelerator_stage_counts IN EXCLUSIVE MODE"))
+    await db.execute(delete(AcceleratorStageCount))
+
+    live = (Project.accelerator_id.is_not(None), Project.deleted_at.is_(None))
+    category = func.lower(cast(Project.type, String))
+    project_counts = (
+        select(
+            Project.accelerator_id,
+            literal(FunnelKind.PROJECT.value),
+            category,
+            Project.stage,
+            func.count()
+        )
+        .where(*live)
+        .group_by(Project.accelerator_id, category, Project.stage)
+    )
+    research_counts = (
+        select(
+            Project.accelerator_id,
+            literal(FunnelKind.RESEARCH.value),
+            ResearchProject.current_phase,
+            ResearchProject.current_stage,
+            func.count()
+        )
+        .join(Project, Project.id == ResearchProject.project_id)
+        .where(*live)
+        .group_by(Project.accelerator_id, ResearchProject.current_phase, ResearchProject.current_stage)
+    )
+    result = await db.execute(
+        insert(AcceleratorStageCount).from_select(
+            ["accelerator_id", "funnel", "category", "stage", "projects"],
+            project_counts.union_all(research_counts)
+        )
+    )
+    return result.rowcount
@@ -15,11 +15,12 @@ class User(Base):
     role: Mapped[Role] = mapped_column(nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
 
-    verification_token: Mapped["VerificationToken"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan")
-    password_reset_token: Mapped["PasswordResetToken"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan")
+    # the database cascades these; passive_deletes keeps the ORM from loading them first
+    verification_token: Mapped["VerificationToken"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    password_reset_token: Mapped["PasswordResetToken"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
 
-    profile: Mapped["UserInfo"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan")
-    projects: Mapped["Project"] = relationship(back_populates="user", cascade="all, delete-orphan")
+    profile: Mapped["UserInfo"] = relationship(back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    projects: Mapped["Project"] = relationship(back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class VerificationToken(Base):
@@ -27,7 +28,7 @@ class VerificationToken(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     token: Mapped[str] = mapped_column(unique=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     is_used: Mapped[bool] = mapped_column(default=False)
 
@@ -39,7 +40,7 @@ class PasswordResetToken(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     token: Mapped[str] = mapped_column(unique=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     is_used: Mapped[bool] = mapped_column(default=False)
 
@@ -1,9 +1,12 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError
 from datetime import timedelta
 from src.db.database import get_async_session
+from src.db.unit_of_work import UnitOfWorkRoute, get_unit_of_work
 from src.auth.schemas import Token, UserCreate, UserResponse, ResetPassword
 from src.auth.service import (
     AuthService,
@@ -13,11 +16,12 @@ from src.auth.service import (
 )
 from src.auth.models import User, VerificationToken, PasswordResetToken
 from src.core.config import settings
+from src.core.cache import invalidate
 
-auth_router = APIRouter(prefix="/auth", tags=["auth"])
+auth_router = APIRouter(prefix="/auth", tags=["auth"], route_class=UnitOfWorkRoute)
 
 @auth_router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_session)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_unit_of_work)):
     return await AuthService.create_user(db, user_data)
 
 @auth_router.post("/token", response_model=Token)
@@ -78,6 +82,9 @@ async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_async
             "refresh_token": refresh_token,
             "token_type": "bearer"
         }
+    except DBAPIError:
+        # UnitOfWorkRoute retries serialization failures and deadlocks
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -85,7 +92,7 @@ async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_async
         )
 
 @auth_router.post("/verify-email")
-async def verify_email(token: str, db: AsyncSession = Depends(get_async_session)):
+async def verify_email(token: str, db: AsyncSession = Depends(get_unit_of_work)):
     is_valid = await EmailTokenService.verify_token(db, token, 'verification')
     if not is_valid:
         raise HTTPException(
@@ -105,12 +112,12 @@ async def verify_email(token: str, db: AsyncSession = Depends(get_async_session)
         .values(disabled=False)
     )
     await EmailTokenService.mark_token_as_used(db, token, 'verification')
-    await db.commit()
+    await invalidate(db, "users")
     
     return {"message": "Email verified successfully"}
 
 @auth_router.post("/request-password-reset")
-async def request_password_reset(email: str, db: AsyncSession = Depends(get_async_session)):
+async def request_password_reset(email: str, db: AsyncSession = Depends(get_unit_of_work)):
     user = await AuthService.get_user_by_email(db, email)
     if not user:
         return {"message": "If email exists, password reset link has been sent"}
@@ -119,7 +126,7 @@ async def request_password_reset(email: str, db: AsyncSession = Depends(get_asyn
     return {"message": "If email exists, password reset link has been sent"}
 
 @auth_router.post("/reset-password")
-async def reset_password(data: ResetPassword, db: AsyncSession = Depends(get_async_session)):
+async def reset_password(data: ResetPassword, db: AsyncSession = Depends(get_unit_of_work)):
     is_valid = await EmailTokenService.verify_token(db, data.token, 'password_reset')
     if not is_valid:
         raise HTTPException(
@@ -133,11 +140,11 @@ async def reset_password(data: ResetPassword, db: AsyncSession = Depends(get_asy
     )
     password_reset_token = result.scalars().first()
     
-    hashed_password = SecurityService.get_password_hash(data.new_password)
+    hashed_password = await asyncio.to_thread(SecurityService.get_password_hash, data.new_password)
     await db.execute(
         update(User)
         .where(User.id == password_reset_token.user_id)
         .values(hashed_password=hashed_password)
     )
     await EmailTokenService.mark_token_as_used(db, data.token, 'password_reset')
-    await db.commit()
\ No newline at end of file
+    await invalidate(db, "users")
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, field_validator
-from email_validator import validate_email, EmailNotValidError
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from src.core.normalization import normalize_email
 from datetime import datetime
 from enum import Enum
 
@@ -18,16 +18,13 @@ class TokenData(BaseModel):
     email: EmailStr
 
 class UserBase(BaseModel):
-    email: EmailStr
+    # plain str: EmailStr would run email_validator a second time, uncached
+    email: str = Field(json_schema_extra={"format": "email"})
     role: Role
 
     @field_validator('email')
     def validate_email(cls, v):
-        try:
-            email_info = validate_email(v, check_deliverability=False)
-            return email_info.normalized
-        except EmailNotValidError as e:
-            raise ValueError(f"Invalid email address: {str(e)}")
+        return normalize_email(v)
 
 class UserCreate(UserBase):
     password: str
@@ -52,6 +49,15 @@ class UserInDB(UserBase):
     created_at: datetime
     disabled: bool
 
+class CurrentUser(BaseModel):
+    """The authenticated user as cached per token subject; not bound to a session"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    email: str
+    role: Role
+    disabled: bool
+
 class ResetPassword(BaseModel):
     token: str
     new_password: str
@@ -1,9 +1,8 @@
 import jwt
+import asyncio
+import logging
 import uuid
 import bcrypt
-import aiosmtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Annotated
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 from datetime import datetime, timedelta, timezone
@@ -13,13 +12,21 @@ from sqlalchemy import delete, update
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.database import get_async_session
-from src.auth.schemas import Role, TokenData, UserBase, UserCreate, UserInDB
+from src.jobs.service import enqueue
+from src.core.cache import LocalCache
+from src.auth.schemas import CurrentUser, Role, TokenData, UserBase, UserCreate, UserInDB
 from src.auth.models import User, VerificationToken, PasswordResetToken
 from src.core.config import settings
 
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# users looked up by the access token subject on every authenticated request;
+# holds CurrentUser snapshots, never ORM instances tied to a finished session
+user_cache = LocalCache("users", maxsize=4096, ttl=60)
+
 
 class SecurityService:
     @staticmethod
@@ -134,6 +141,11 @@ class SecurityService:
 class EmailService:
     @staticmethod
     async def send_email(to: str, subject: str, body: str, is_html: bool = False):
+        # only the job workers send mail; keep SMTP and MIME out of API startup
+        import aiosmtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         try:
             if not all([
                 settings.SMTP_HOST,
@@ -159,11 +171,11 @@ class EmailService:
                 start_tls=settings.START_TLS,
                 timeout=10
             )
-            print(f"Email sent successfully to {to}")
+            logger.info("Email sent", extra={"to": to})
             return True
         
         except Exception as e:
-            print(f"Failed to send email: {str(e)}")
+            logger.warning("Failed to send email: %s", e, extra={"to": to})
             return False
     
     @staticmethod
@@ -174,11 +186,8 @@ class EmailService:
         verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token.token}"
         body = f"Перейдите по ссылке для подтверждения: {verification_url}"
         
-        return await EmailService.send_email(
-            to=user.email,
-            subject=subject,
-            body=body
-        )
+        # queued in the request's transaction: no email for a token that was rolled back
+        await enqueue(db, "send_email", {"to": user.email, "subject": subject, "body": body}, priority=10)
     
     @staticmethod
     async def send_password_reset_email(db: AsyncSession, email: str) -> bool:
@@ -192,11 +201,8 @@ class EmailService:
         reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token.token}"
         body = f"Для сброса пароля перейдите по ссылке: {reset_url}"
         
-        return await EmailService.send_email(
-            to=user.email,
-            subject=subject,
-            body=body
-        )
+        await enqueue(db, "send_email", {"to": user.email, "subject": subject, "body": body}, priority=10)
+        return True
 
 class EmailTokenService:
     @staticmethod
@@ -213,8 +219,7 @@ class EmailTokenService:
         )
         
         db.add(token)
-        await db.commit()
-        await db.refresh(token)
+        await db.flush()
         return token
     
     @staticmethod
@@ -227,8 +232,7 @@ class EmailTokenService:
         )
         
         db.add(token)
-        await db.commit()
-        await db.refresh(token)
+        await db.flush()
         return token
 
     @staticmethod
@@ -271,8 +275,6 @@ class EmailTokenService:
                 .where(PasswordResetToken.token == token)
                 .values(is_used=True)
             )
-        
-        await db.commit()
 
 
 class AuthService:
@@ -286,16 +288,21 @@ class AuthService:
         user = await AuthService.get_user_by_email(db, email)
         if not user:
             return False
-        if not SecurityService.verify_password(password, user.hashed_password):
+        # bcrypt takes ~200 ms of CPU; run it in a thread so the loop keeps serving
+        if not await asyncio.to_thread(SecurityService.verify_password, password, user.hashed_password):
             return False
         return user
     
+    @staticmethod
+    async def get_current_user_snapshot(db: AsyncSession, email: str) -> CurrentUser | None:
+        user = await AuthService.get_user_by_email(db, email)
+        return CurrentUser.model_validate(user) if user else None
+
     @staticmethod
     async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
-        db: AsyncSession = Depends(get_async_session),
-        required_roles: list[Role] | None = None,
-) -> User:
+        db: AsyncSession = Depends(get_async_session)
+) -> CurrentUser:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -309,10 +316,10 @@ class AuthService:
             if payload['token_type'] != 'access':
                 raise InvalidTokenError("Invalid token type")
             
-            if required_roles and Role(payload['role']) not in required_roles:
-                raise HTTPException(status_code=403, detail="Insufficient permissions")
-            
-            user = await AuthService.get_user_by_email(db, email=payload['sub'])
+            user = await user_cache.get_or_load(
+                payload['sub'],
+                lambda: AuthService.get_current_user_snapshot(db, payload['sub'])
+            )
             if user is None:
                 raise credentials_exception
                 
@@ -324,7 +331,9 @@ class AuthService:
     
     @staticmethod
     async def get_current_active_user(
-        current_user: Annotated[UserInDB, Depends(get_current_user)]
+        # in the class body get_current_user is still the staticmethod object,
+        # which FastAPI would call as a sync function; depend on the coroutine function
+        current_user: Annotated[CurrentUser, Depends(get_current_user.__func__)]
     ):
         if current_user.disabled:
             raise HTTPException(status_code=400, detail="Inactive user")
@@ -338,7 +347,7 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        hashed_password = SecurityService.get_password_hash(user_data.password)
+        hashed_password = await asyncio.to_thread(SecurityService.get_password_hash, user_data.password)
         user = User(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -347,8 +356,7 @@ class AuthService:
         )
         
         db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
     
         await EmailService.send_verification_email(db, user)
 
@@ -358,7 +366,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: list[Role]):
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, current_user: User = Depends(AuthService.get_current_active_user)):
+    async def __call__(self, current_user: CurrentUser = Depends(AuthService.get_current_active_user)):
         if current_user.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -369,4 +377,6 @@ class RoleChecker:
 allow_superadmin = RoleChecker([Role.superadmin, Role.admin, Role.teacher, Role.student])
 allow_admin = RoleChecker([Role.admin, Role.teacher, Role.student])
 allow_teacher = RoleChecker([Role.teacher])
-allow_student = RoleChecker([Role.student])
\ No newline at end of file
+allow_student = RoleChecker([Role.student])
+require_admin = RoleChecker([Role.superadmin, Role.admin])
+allow_staff = RoleChecker([Role.superadmin, Role.admin, Role.teacher])
\ No newline at end of file
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.notify import PgListener, notify
+
+CACHE_CHANNEL = "cache_invalidation"
+
+_MISSING = object()
+
+CACHES: Dict[str, "LocalCache"] = {}
+
+
+class LocalCache:
+    """Per-process LRU cache with a TTL.
+
+    The TTL only bounds staleness if a notification is lost; writers call
+    invalidate() so every worker drops its copy as soon as they commit.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # bumped on every invalidation so a load that raced one is not stored
+        self.generation = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        CACHES[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING or entry[0] < time.monotonic():
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value, or the loader's result; None results are not cached"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self.generation
+        value = await loader()
+        if value is not None and generation == self.generation:
+            self.set(key, value)
+        return value
+
+    def discard(self, key: Optional[Hashable] = None):
+        self.generation += 1
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+
+async def invalidate(db: AsyncSession, name: str, key: Optional[str] = None):
+    """Drop `key` (or the whole cache) here now and in every worker on commit"""
+    CACHES[name].discard(key)
+    await notify(db, CACHE_CHANNEL, name if key is None else f"{name}:{key}")
+
+
+def _on_invalidation(payload: Optional[str]):
+    if payload is None:
+        # reconnected: anything could have changed while we were not listening
+        for cache in CACHES.values():
+            cache.discard()
+        return
+    name, _, key = payload.partition(":")
+    cache = CACHES.get(name)
+    if cache is not None:
+        cache.discard(key or None)
+
+
+async def listen_for_invalidations(listener: PgListener):
+    await listener.subscribe(CACHE_CHANNEL, _on_invalidation)
@@ -0,0 +1,86 @@
+import re
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import HTTPException, Request, Response, status
+
+ETAG_VERSION_PATTERN = re.compile(r'^"[a-z_]+-\d+-v(\d+)(?:-[0-9a-f]+)?"$')
+
+
+def make_etag(kind: str, object_id: int, version: int, variant: str = "") -> str:
+    """Strong ETag built from the row version.
+
+    `variant` distinguishes representations of the same row, e.g. different
+    query parameters selecting different fields.
+    """
+    etag = f"{kind}-{object_id}-v{version}"
+    if variant:
+        etag += f"-{zlib.crc32(variant.encode()):08x}"
+    return f'"{etag}"'
+
+
+def etag_version(etag: str) -> int | None:
+    match = ETAG_VERSION_PATTERN.match(etag.strip())
+    return int(match.group(1)) if match else None
+
+
+def if_match_version(request: Request) -> int | None:
+    """Version the client expects to overwrite, from a strong If-Match ETag"""
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    version = etag_version(if_match)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be a single strong ETag returned by this API"
+        )
+    return version
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None = None):
+    response.headers.update(validator_headers(etag, last_modified))
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified)
+    )
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import ClassVar
+from typing import ClassVar, Dict
 import ssl
 
 class Settings(BaseSettings):
@@ -29,6 +29,43 @@ class Settings(BaseSettings):
     VERIFICATION_TOKEN_EXPIRE_HOURS: int = 24
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
 
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 10
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 600
+
+    JOBS_IN_PROCESS: bool = True
+    JOBS_CONCURRENCY: int = 4
+    JOBS_POLL_SECONDS: float = 5
+    JOBS_DRAIN_SECONDS: float = 10
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_TIMEOUT_SECONDS: int = 120
+    JOB_LOCK_TIMEOUT_SECONDS: int = 300
+    PURGE_BATCH_SIZE: int = 5000
+
+    SSE_HEARTBEAT_SECONDS: float = 15
+    SSE_RETRY_MILLISECONDS: int = 3000
+
+    WEB_CONCURRENCY: int = 1
+    DB_CONNECTION_BUDGET: int = 20
+    DB_POOL_TIMEOUT: float = 10
+
+    OPENAPI_PATH: str | None = None
+
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 1
+
+    LOOP_MONITOR_INTERVAL_MS: float = 100
+    LOOP_LAG_THRESHOLD_MS: float = 100
+
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    # logger name prefix -> fraction of INFO/DEBUG records kept, e.g. {"uvicorn.access": 0.1}
+    LOG_SAMPLING: Dict[str, float] = {}
+    SQL_ECHO: bool = False
+
     APP_PORT: int = Field(..., env="APP_PORT")
     APP_HOST: str = Field(..., env="APP_HOST")
 
@@ -39,6 +76,15 @@ class Settings(BaseSettings):
     def DATABASE_URL_asyncpg(self):
         return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+    @property
+    def DATABASE_DSN(self):
+        return f'postgresql://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
+
+    @property
+    def DB_POOL_SIZE(self):
+        # the budget is for all workers; each also holds one LISTEN connection
+        return max(1, self.DB_CONNECTION_BUDGET // self.WEB_CONCURRENCY - 1)
+
     @property
     def ssl_context(self):
         context = ssl.create_default_context()
@@ -0,0 +1,220 @@
+import atexit
+import logging
+import queue
+import random
+import sys
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import Dict, Optional, TextIO
+import orjson
+from src.core.config import settings
+
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 64
+
+# attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_exception_formatter = logging.Formatter()
+
+_writer: Optional["LogWriter"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class ContextFilter(logging.Filter):
+    """Tags records with the current request id and samples noisy loggers.
+
+    Runs in the calling thread before the record is queued, so sampled out
+    records cost no formatting or I/O. Warnings and errors are always kept.
+    """
+
+    def __init__(self, sampling: Dict[str, float]):
+        super().__init__()
+        # longest prefix first, so "src.db.notify" overrides "src.db"
+        self.sampling = sorted(sampling.items(), key=lambda item: -len(item[0]))
+        # per logger name; there are as many entries as loggers, which is few
+        self._rates: Dict[str, float] = {}
+
+    def sample_rate(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = self._rates[name] = next(
+                (rate for prefix, rate in self.sampling if name == prefix or name.startswith(prefix + ".")),
+                1.0
+            )
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            rate = self.sample_rate(record.name)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        record.request_id = request_id.get()
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: when the writer falls behind by more than
+    `maxsize` records, new ones are dropped and counted"""
+
+    dropped = 0
+
+    def __init__(self, log_queue: queue.SimpleQueue, maxsize: int):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the stdlib version formats and copies the record; only the arguments
+        # must be resolved here, before the objects they refer to change
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.maxsize:
+            DroppingQueueHandler.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class LogWriter(threading.Thread):
+    """Drains the queue in batches and writes each batch with one call"""
+
+    BATCH_SIZE = 512
+
+    def __init__(self, log_queue: queue.SimpleQueue, stream: TextIO, formatter: logging.Formatter):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is None
+            lines = [self.format(record) for record in batch if record is not None]
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
+            if stopping:
+                return
+
+    def format(self, record: logging.LogRecord) -> str:
+        try:
+            return self.formatter.format(record)
+        except Exception as e:
+            return f"Failed to format log record from {record.name}: {e}"
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+
+def setup_logging():
+    """Route all logging through a queue to one writer thread.
+
+    Callers only merge the message arguments and enqueue the record; JSON
+    encoding and the write to stdout happen in the writer thread, one write
+    per batch.
+    """
+    global _writer
+    if _writer is not None:
+        return
+
+    if settings.LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    log_queue = queue.SimpleQueue()
+    handler = DroppingQueueHandler(log_queue, settings.LOG_QUEUE_SIZE)
+    handler.addFilter(ContextFilter(settings.LOG_SAMPLING))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # uvicorn installs its own synchronous stdout handlers before importing the app
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+    # SQL statements go through the same pipeline instead of engine echo
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.SQL_ECHO else logging.WARNING)
+
+    _writer = LogWriter(log_queue, sys.stdout, formatter)
+    _writer.start()
+    atexit.register(_writer.stop)
+
+
+def log_queue_stats() -> dict:
+    """Backlog of this worker's log writer and the records dropped so far"""
+    return {
+        "queued": _writer.queue.qsize() if _writer is not None else 0,
+        "maxsize": settings.LOG_QUEUE_SIZE,
+        "dropped": DroppingQueueHandler.dropped,
+    }
+
+
+class RequestIdMiddleware:
+    """Takes X-Request-ID from the client or generates one, makes it
+    available to every log record of the request and echoes it back"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        value = None
+        for name, header in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                value = header.decode("latin-1")[:MAX_REQUEST_ID_LENGTH]
+                break
+        value = value or uuid.uuid4().hex
+        token = request_id.set(value)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, value.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional
+from src.core.config import settings
+from src.core.schemas import LoopLagMetrics, LoopStall
+
+logger = logging.getLogger(__name__)
+
+LAG_WINDOW = 600
+RECENT_STALLS = 20
+STACK_DEPTH = 30
+
+# request scope per running task, so a stall can be traced to a route
+_task_scopes: "weakref.WeakKeyDictionary[asyncio.Task, dict]" = weakref.WeakKeyDictionary()
+
+
+def _route_of(scope: dict) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a timer.
+
+    A coroutine sleeps `interval` in a loop; any extra delay is time the
+    loop spent running something else without yielding. A watchdog thread
+    notices when the current tick is more than `threshold` late and
+    captures the loop thread's stack and the route of the running task,
+    while the blocking call is still on the stack.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+        threshold: float = settings.LOOP_LAG_THRESHOLD_MS / 1000
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.recent_stalls: Deque[LoopStall] = deque(maxlen=RECENT_STALLS)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._tick_started = time.monotonic()
+        self._captured_tick: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._tick_started = time.monotonic()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+        self._watchdog.join()
+
+    def metrics(self) -> LoopLagMetrics:
+        lags = sorted(self.lags)
+        def percentile(p: float) -> float:
+            return lags[min(len(lags) - 1, int(len(lags) * p))] * 1000 if lags else 0.0
+        return LoopLagMetrics(
+            interval_ms=self.interval * 1000,
+            threshold_ms=self.threshold * 1000,
+            samples=len(lags),
+            last_lag_ms=self.lags[-1] * 1000 if self.lags else 0.0,
+            p50_lag_ms=percentile(0.5),
+            p99_lag_ms=percentile(0.99),
+            max_lag_ms=self.max_lag * 1000,
+            stalls=self.stall_count,
+            recent_stalls=list(self.recent_stalls)
+        )
+
+    async def _tick(self):
+        while True:
+            self._tick_started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._tick_started - self.interval)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.stall_count += 1
+                if self._captured_tick == self._tick_started and self.recent_stalls:
+                    # the watchdog saw this stall while it was happening
+                    self.recent_stalls[-1].blocked_ms = lag * 1000
+
+    def _watch(self):
+        while not self._stopped.wait(self.threshold / 2):
+            tick_started = self._tick_started
+            late = time.monotonic() - tick_started - self.interval
+            if late < self.threshold or self._captured_tick == tick_started:
+                continue
+            self._captured_tick = tick_started
+            frame = sys._current_frames().get(self._loop_thread_id)
+            task = asyncio.current_task(self._loop)
+            scope = _task_scopes.get(task) if task is not None else None
+            stall = LoopStall(
+                detected_at=datetime.utcnow(),
+                blocked_ms=late * 1000,
+                route=_route_of(scope) if scope else None,
+                stack=traceback.format_stack(frame, limit=STACK_DEPTH) if frame else []
+            )
+            self.recent_stalls.append(stall)
+            logger.warning(
+                "Event loop blocked for %.0f ms in %s",
+                stall.blocked_ms,
+                stall.route or "a background task",
+                extra={"stack": "".join(stall.stack[-5:])}
+            )
+
+
+class RouteTrackingMiddleware:
+    """Remembers which request each task serves, for LoopLagMonitor"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        task = asyncio.current_task()
+        _task_scopes[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _task_scopes.pop(task, None)
@@ -0,0 +1,85 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# the same addresses and numbers come back on every login, register and
+# profile request; parsing them is far more expensive than a dict lookup
+NORMALIZATION_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_phone(value: str) -> str:
+    """E.164 form of an international phone number; ValueError if invalid"""
+    # phonenumbers loads large metadata tables; import it on first use, not at startup
+    import phonenumbers
+    try:
+        parsed = phonenumbers.parse(value, None)
+    except phonenumbers.NumberParseException:
+        raise ValueError("Phone number must be in international format (+XXX...)")
+    if not phonenumbers.is_valid_number(parsed):
+        raise ValueError("Invalid phone number")
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_email(value: str) -> str:
+    """Normalized email address, without a deliverability check; ValueError if invalid"""
+    from email_validator import validate_email, EmailNotValidError
+    try:
+        return validate_email(value, check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        raise ValueError(f"Invalid email address: {str(e)}")
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def slugify(value: str) -> str:
+    """Lowercase words joined by hyphens, e.g. "МГУ им. Ломоносова" -> "мгу-им-ломоносова".
+
+    Never all digits, so a slug cannot be mistaken for a numeric id.
+    """
+    slug = re.sub(r"[\W_]+", "-", unicodedata.normalize("NFKC", value).casefold()).strip("-")
+    if slug.isdigit():
+        slug = f"n-{slug}"
+    return slug or "-"
+
+
+def normalize_many(
+    normalize: Callable[[str], str],
+    values: Iterable[Optional[str]]
+) -> Tuple[List[Optional[str]], Dict[int, str]]:
+    """Normalize a batch, e.g. a bulk import, without stopping at the first bad value.
+
+    `normalize` is one of the cached normalizers above, so repeated values in
+    the batch, or ones seen by earlier requests, are not parsed again.
+    Returns the normalized values (None where a value is empty or invalid)
+    and the error message for each invalid position.
+    """
+    normalized: List[Optional[str]] = []
+    errors: Dict[int, str] = {}
+    for index, value in enumerate(values):
+        if not value:
+            normalized.append(None)
+            continue
+        try:
+            normalized.append(normalize(value))
+        except ValueError as e:
+            normalized.append(None)
+            errors[index] = str(e)
+    return normalized, errors
+
+
+def normalization_cache_stats() -> Dict[str, dict]:
+    """Hit ratio of each normalization cache in this worker"""
+    stats = {}
+    for normalize in (normalize_phone, normalize_email, slugify):
+        info = normalize.cache_info()
+        lookups = info.hits + info.misses
+        stats[normalize.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_ratio": info.hits / lookups if lookups else 0.0
+        }
+    return stats
@@ -1,5 +1,104 @@
+import argparse
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Dict
 from fastapi.openapi.utils import get_openapi
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from src.core.config import settings
+from src.core.conditional import is_not_modified, validator_headers
+from src.core.fast_json import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class OpenAPIDocument:
+    """The OpenAPI schema encoded once, with precompressed variants.
+
+    Each encoding has its own strong ETag, since the bytes differ.
+    """
+
+    def __init__(self, body: bytes):
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.variants: Dict[str, bytes] = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0)
+        }
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        self.etags = {
+            encoding: f'"openapi-{digest}-{encoding}"' for encoding in self.variants
+        }
+
+    # smallest first: the tie-break between equally preferred encodings
+    PREFERENCE = ("br", "gzip", "identity")
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """The variant with the highest Accept-Encoding q-value (RFC 9110
+        section 12.5.3); q=0 refuses an encoding, "*" stands for any not listed"""
+        qualities: Dict[str, float] = {}
+        for part in accept_encoding.lower().split(","):
+            coding, *params = (item.strip() for item in part.split(";"))
+            if not coding:
+                continue
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+                    # also false for nan: an invalid q-value refuses the coding
+                    if not 0.0 <= quality <= 1.0:
+                        quality = 0.0
+            qualities[coding] = quality
+
+        def quality(encoding: str) -> float:
+            if encoding in qualities:
+                return qualities[encoding]
+            if "*" in qualities:
+                return qualities["*"]
+            # identity is acceptable unless refused, by name or through "*",
+            # but below anything the client did list
+            return 0.001 if encoding == "identity" else 0.0
+
+        candidates = [
+            (quality(encoding), -rank, encoding)
+            for rank, encoding in enumerate(self.PREFERENCE)
+            if encoding in self.variants
+        ]
+        best_quality, _, best = max(candidates)
+        # nothing acceptable: the uncompressed body beats a 406
+        return best if best_quality > 0 else "identity"
+
+    def response(self, request: Request) -> Response:
+        encoding = self.negotiate(request.headers.get("accept-encoding", ""))
+        headers = validator_headers(self.etags[encoding])
+        headers["Cache-Control"] = "public, no-cache"
+        headers["Vary"] = "Accept-Encoding"
+        if is_not_modified(request, self.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type="application/json", headers=headers)
+
+
+def openapi_document(app: FastAPI) -> OpenAPIDocument:
+    """Built on first use (normally at startup) from OPENAPI_PATH if exported
+    at build time, otherwise from the routes."""
+    document = getattr(app.state, "openapi_document", None)
+    if document is None:
+        if settings.OPENAPI_PATH and Path(settings.OPENAPI_PATH).is_file():
+            body = Path(settings.OPENAPI_PATH).read_bytes()
+        else:
+            body = dumps(app.openapi())
+        document = app.state.openapi_document = OpenAPIDocument(body)
+    return document
+
 
 def setup_openapi_config(app: FastAPI):
     def custom_openapi():
@@ -59,4 +158,29 @@ def setup_openapi_config(app: FastAPI):
         app.openapi_schema = openapi_schema
         return app.openapi_schema
     
-    app.openapi = custom_openapi
\ No newline at end of file
+    app.openapi = custom_openapi
+
+    async def openapi_json(request: Request) -> Response:
+        return openapi_document(request.app).response(request)
+
+    # replace FastAPI's route, which re-encodes the schema on every request
+    app.router.routes = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+    app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the OpenAPI document")
+    parser.add_argument("output", help="e.g. openapi.json; serve it by setting OPENAPI_PATH")
+    args = parser.parse_args()
+
+    from src.main import app
+    body = dumps(app.openapi())
+    Path(args.output).write_bytes(body)
+    print(f"Wrote {len(body)} bytes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
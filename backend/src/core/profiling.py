@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from src.core.config import settings
+from src.db.query_stats import current_query_stats
+from src.auth.schemas import Role
+from src.auth.service import SecurityService
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+OTHER_WORK = "[event loop: awaiting I/O or running other requests]"
+
+
+class StackSampler:
+    """Samples the event loop thread's stack from a background thread.
+
+    A sample is attributed to the request only while the loop is executing
+    the request's own coroutine chain, i.e. while `root` is on the stack;
+    everything else is counted as OTHER_WORK so the total stays wall time.
+    """
+
+    def __init__(self, root: FrameType, interval: float):
+        self.root = root
+        self.interval = interval
+        self.samples: Counter[Tuple[str, ...]] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if self._stopped.is_set():
+                # the loop is already in stop(), not in the request
+                break
+            self.samples[self._stack(frame)] += 1
+
+    def _stack(self, frame: Optional[FrameType]) -> Tuple[str, ...]:
+        names = []
+        while frame is not None:
+            if frame is self.root:
+                return tuple(reversed(names))
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}:{code.co_firstlineno}")
+            frame = frame.f_back
+        return (OTHER_WORK,)
+
+    def folded(self, root_name: str) -> str:
+        """Collapsed stacks, one `frame;frame;frame count` line per distinct stack,
+        as read by flamegraph.pl and speedscope"""
+        return "".join(
+            ";".join((root_name,) + stack) + f" {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+
+def _is_admin(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            try:
+                SecurityService.decode_access_token(token, expected_roles=[Role.admin, Role.superadmin])
+            except HTTPException:
+                return False
+            return True
+    return False
+
+
+def _write_profile(directory: Path, name: str, folded: str, report: dict):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{name}.folded").write_text(folded)
+    (directory / f"{name}.json").write_text(json.dumps(report, indent=2))
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand.
+
+    A request is profiled when an admin sends `X-Profile: 1`, or at random
+    with probability PROFILE_SAMPLE_RATE. The stack samples are written to
+    PROFILE_DIR as a .folded flamegraph file, next to a .json report with
+    the request's SQL timings; the response carries the file name in
+    X-Profile-Id. Other requests only pay for a header scan.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> bool:
+        if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return True
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value not in (b"", b"0") and _is_admin(scope)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{scope['method']}-{slug}-{uuid.uuid4().hex[:8]}"
+        response_status = None
+
+        async def send_with_profile_id(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", name.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        sampler = StackSampler(sys._getframe(), settings.PROFILE_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            duration = time.perf_counter() - started
+            # set by QueryStatsMiddleware further down, in this same task
+            stats = current_query_stats()
+            report = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope["query_string"].decode("latin-1"),
+                "status": response_status,
+                "duration_ms": duration * 1000,
+                "interval_ms": settings.PROFILE_INTERVAL_MS,
+                "samples": sum(sampler.samples.values()),
+                "sql": None if stats is None else {
+                    "statements": stats.statements,
+                    "round_trips": stats.round_trips,
+                    "duration_ms": stats.duration * 1000,
+                    "timings": [
+                        {"statement": statement, "duration_ms": elapsed * 1000}
+                        for statement, elapsed in stats.timings
+                    ]
+                }
+            }
+            root_name = f"{scope['method']} {scope['path']}".replace(";", "_").replace(" ", "_")
+            try:
+                await asyncio.to_thread(
+                    _write_profile, Path(settings.PROFILE_DIR), name, sampler.folded(root_name), report
+                )
+            except OSError as e:
+                logger.warning("Failed to write profile %s: %s", name, e)
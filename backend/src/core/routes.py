@@ -0,0 +1,34 @@
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from src.auth.service import require_admin
+from src.auth.models import User
+from src.core.logging_config import log_queue_stats
+from src.core.normalization import normalization_cache_stats
+from src.core.schemas import CacheStats, LogQueueMetrics, LoopLagMetrics
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics admin"])
+
+@metrics_router.get("/loop", response_model=LoopLagMetrics)
+async def get_loop_metrics(
+    request: Request,
+    current_user: User = Depends(require_admin)
+):
+    """Event loop scheduling delay of this worker, with the most recent stalls"""
+    monitor = getattr(request.app.state, "loop_monitor", None)
+    if monitor is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Loop monitor is not running"
+        )
+    return monitor.metrics()
+
+@metrics_router.get("/normalization", response_model=Dict[str, CacheStats])
+async def get_normalization_metrics(current_user: User = Depends(require_admin)):
+    """Hit ratios of the phone, email and slug normalization caches of this worker"""
+    return normalization_cache_stats()
+
+@metrics_router.get("/logging", response_model=LogQueueMetrics)
+async def get_logging_metrics(current_user: User = Depends(require_admin)):
+    """Log records waiting for the writer thread of this worker, and how many
+    were dropped because it fell behind"""
+    return log_queue_stats()
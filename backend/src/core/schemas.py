@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+class LoopStall(BaseModel):
+    detected_at: datetime
+    blocked_ms: float
+    route: str | None = None
+    stack: List[str]
+
+class LoopLagMetrics(BaseModel):
+    interval_ms: float
+    threshold_ms: float
+    samples: int
+    last_lag_ms: float
+    p50_lag_ms: float
+    p99_lag_ms: float
+    max_lag_ms: float
+    stalls: int
+    recent_stalls: List[LoopStall]
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    hit_ratio: float
+
+class LogQueueMetrics(BaseModel):
+    queued: int
+    maxsize: int
+    dropped: int
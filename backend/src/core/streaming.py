@@ -0,0 +1,60 @@
+from enum import Enum
+from typing import AsyncIterator
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from src.core.fast_json import dumps
+from src.db.database import async_session_factory
+
+STREAM_BATCH_SIZE = 500
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
+MEDIA_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.JSON: "application/json",
+}
+
+
+async def stream_rows(
+    query: Select,
+    fmt: StreamFormat,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """Encode rows from a server-side cursor one bounded batch at a time.
+
+    The generator owns its session because request-scoped dependencies are
+    closed before the response body is streamed. The next batch is only
+    fetched once the previous chunk has been handed to the client, so a slow
+    reader holds back the cursor instead of growing a buffer.
+    """
+    async with async_session_factory() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        first = True
+        if fmt == StreamFormat.JSON:
+            yield b"["
+        async for batch in result.mappings().partitions(batch_size):
+            if fmt == StreamFormat.NDJSON:
+                yield b"".join(dumps(dict(row)) + b"\n" for row in batch)
+            else:
+                chunk = b",".join(dumps(dict(row)) for row in batch)
+                yield chunk if first else b"," + chunk
+                first = False
+        if fmt == StreamFormat.JSON:
+            yield b"]"
+
+
+def streaming_response(
+    query: Select,
+    fmt: StreamFormat,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(query, fmt, batch_size),
+        media_type=MEDIA_TYPES[fmt]
+    )
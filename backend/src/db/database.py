@@ -2,11 +2,17 @@ from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from src.core.config import settings
+from src.db.query_stats import instrument_engine
 
 async_engine = create_async_engine(
     settings.DATABASE_URL_asyncpg,
-    echo=True
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=0,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=True
 )
+instrument_engine(async_engine.sync_engine)
 
 async_session_factory = async_sessionmaker(
     async_engine,
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30
+
+NotifyCallback = Callable[[Optional[str]], None]
+
+
+class PgListener:
+    """One dedicated asyncpg connection that LISTENs on behalf of the process.
+
+    Subscribers register plain callbacks per channel; they run on the event
+    loop and must not block. NOTIFY is lost while the connection is down, so
+    after a reconnect every subscriber is called with payload None and should
+    resynchronise from the tables.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn or settings.DATABASE_DSN
+        self._connection: Optional[asyncpg.Connection] = None
+        self._subscribers: Dict[str, List[NotifyCallback]] = defaultdict(list)
+        self._lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def start(self):
+        """Connect, or keep trying in the background; subscribers fall back to
+        their own polling until the connection is up."""
+        self._closed = False
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("LISTEN connection failed: %s", e)
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def stop(self):
+        self._closed = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def subscribe(self, channel: str, callback: NotifyCallback):
+        async with self._lock:
+            first = not self._subscribers[channel]
+            self._subscribers[channel].append(callback)
+            if first and self.connected:
+                await self._connection.add_listener(channel, self._dispatch)
+
+    async def unsubscribe(self, channel: str, callback: NotifyCallback):
+        async with self._lock:
+            callbacks = self._subscribers.get(channel, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscribers.pop(channel, None)
+                if self.connected:
+                    await self._connection.remove_listener(channel, self._dispatch)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str):
+        for callback in list(self._subscribers.get(channel, [])):
+            callback(payload)
+
+    async def _connect(self):
+        async with self._lock:
+            self._connection = await asyncpg.connect(self.dsn)
+            self._connection.add_termination_listener(self._on_terminated)
+            for channel in self._subscribers:
+                await self._connection.add_listener(channel, self._dispatch)
+
+    def _on_terminated(self, connection):
+        if not self._closed and (self._reconnect_task is None or self._reconnect_task.done()):
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = RECONNECT_MIN_DELAY
+        while not self._closed:
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("LISTEN connection lost, retrying in %.1fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            for channel, callbacks in list(self._subscribers.items()):
+                for callback in list(callbacks):
+                    callback(None)
+            return
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = ""):
+    """NOTIFY from the session's transaction; listeners only hear it on commit"""
+    await db.execute(select(func.pg_notify(channel, payload)))
@@ -0,0 +1,92 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_RECORDED_STATEMENTS = 200
+
+
+@dataclass
+class QueryStats:
+    """Database work done on behalf of one request"""
+    statements: int = 0
+    transactions: int = 0
+    duration: float = 0.0
+    timings: List[Tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def round_trips(self) -> int:
+        # BEGIN and COMMIT/ROLLBACK are separate trips on asyncpg
+        return self.statements + 2 * self.transactions
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.round_trips} round trips"'
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def track_queries() -> QueryStats:
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.duration += elapsed
+    if len(stats.timings) < MAX_RECORDED_STATEMENTS:
+        stats.timings.append((statement, elapsed))
+
+
+def _begin(conn):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.transactions += 1
+
+
+def instrument_engine(engine: Engine):
+    """Attribute every statement the engine runs to the current request.
+
+    The async engine runs its sync core in greenlets spawned from the calling
+    task, so the request's ContextVar is visible inside these hooks.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "begin", _begin)
+
+
+class QueryStatsMiddleware:
+    """Report per-request database round trips in a Server-Timing header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = track_queries()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,58 @@
+import asyncio
+import random
+from typing import Awaitable, Callable
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import get_async_session
+from src.idempotency.service import mark_committed
+
+# serialization_failure, deadlock_detected
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.05
+
+
+async def get_unit_of_work(
+    session: AsyncSession = Depends(get_async_session)
+):
+    """The request's transaction: services flush, this commits once.
+
+    Shares the session with other dependencies (e.g. the current user
+    lookup) through FastAPI's per-request dependency cache.
+    """
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    await mark_committed(session)
+    await session.commit()
+
+
+def is_retryable(error: DBAPIError) -> bool:
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    return sqlstate in RETRYABLE_SQLSTATES
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Re-run the whole request when its transaction loses a serialization race.
+
+    Each attempt solves dependencies again, so it gets a fresh session; the
+    request body is cached on the Request and can be read again.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+
+        async def retrying_handler(request: Request) -> Response:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    return await handler(request)
+                except DBAPIError as e:
+                    if attempt == MAX_ATTEMPTS or not is_retryable(e):
+                        raise
+                    await asyncio.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(1, 2))
+
+        return retrying_handler
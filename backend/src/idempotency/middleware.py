@@ -0,0 +1,203 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.routing import compile_path
+from src.core.config import settings
+from src.db.database import async_session_factory
+from src.idempotency.service import (
+    current_idempotency_key,
+    digest,
+    claim_key,
+    get_key,
+    store_response,
+    release_key
+)
+
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 1024 * 1024
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+STORED_HEADERS = {"content-type", "location", "etag", "last-modified", "cache-control"}
+
+# requests holding a key in this process; duplicates wait on the event
+# instead of polling the table
+_in_flight: Dict[bytes, asyncio.Event] = {}
+
+
+def should_store(status_code: int, committed: bool) -> bool:
+    # a conflict may resolve on retry; a server error that wrote nothing too
+    return committed or (status_code < 500 and status_code != status.HTTP_409_CONFLICT)
+
+
+def error_response(status_code: int, detail: str, retry_after: int | None = None) -> Response:
+    headers = {"Retry-After": str(retry_after)} if retry_after else None
+    return JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+
+
+def replay_response(record) -> Response:
+    response = Response(content=record.response_body or b"", status_code=record.response_status)
+    for name, value in record.response_headers or []:
+        response.headers[name] = value
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotencyMiddleware:
+    """Execute a POST at most once per Idempotency-Key and replay its response.
+
+    The key is scoped to the caller's Authorization header, the method and
+    the path; reusing it with a different body is rejected with 422. A
+    duplicate that arrives while the first request is still running waits
+    for it (up to IDEMPOTENCY_WAIT_SECONDS) instead of running in parallel.
+    """
+
+    def __init__(self, app, routes: Iterable[Tuple[str, str]]):
+        self.app = app
+        self.routes = [(method, compile_path(path)[0]) for method, path in routes]
+
+    def _applies(self, scope) -> bool:
+        return any(
+            scope["method"] == method and pattern.match(scope["path"])
+            for method, pattern in self.routes
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._applies(scope):
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if idempotency_key is None:
+            return await self.app(scope, receive, send)
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            response = error_response(
+                status.HTTP_400_BAD_REQUEST,
+                f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"
+            )
+            return await response(scope, receive, send)
+
+        body = await self._read_body(receive)
+        key = digest(
+            headers.get("authorization", ""),
+            scope["method"],
+            scope["path"],
+            idempotency_key
+        )
+        fingerprint = digest(body)
+
+        while True:
+            async with async_session_factory() as db:
+                claimed = await claim_key(db, key, fingerprint)
+                await db.commit()
+            if claimed:
+                return await self._execute(key, body, scope, receive, send)
+
+            response = await self._wait_for_response(key, fingerprint)
+            if response is not None:
+                return await response(scope, receive, send)
+            # the in-flight attempt failed without writing anything: take over
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _execute(self, key: bytes, body: bytes, scope, receive, send):
+        event = _in_flight[key] = asyncio.Event()
+        token = current_idempotency_key.set(key)
+        replayed = False
+        captured = {"status": None, "headers": [], "body": [], "size": 0}
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.decode("latin-1").lower() in STORED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                captured["size"] += len(chunk)
+                if captured["size"] <= MAX_STORED_BODY:
+                    captured["body"].append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self._finish(key, None, [], None)
+            raise
+        else:
+            stored_body = b"".join(captured["body"]) if captured["size"] <= MAX_STORED_BODY else None
+            await self._finish(key, captured["status"], captured["headers"], stored_body)
+        finally:
+            current_idempotency_key.reset(token)
+            _in_flight.pop(key, None)
+            event.set()
+
+    @staticmethod
+    async def _finish(key: bytes, status_code: Optional[int], headers, body: Optional[bytes]):
+        async with async_session_factory() as db:
+            record = await get_key(db, key)
+            committed = record is not None and record.committed
+            if status_code is not None and body is not None and should_store(status_code, committed):
+                await store_response(db, key, status_code, headers, body)
+            elif not committed:
+                await release_key(db, key)
+            await db.commit()
+
+    @staticmethod
+    async def _wait_for_response(key: bytes, fingerprint: bytes) -> Optional[Response]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+        interval = POLL_INTERVAL
+        while True:
+            async with async_session_factory() as db:
+                record = await get_key(db, key)
+            if record is None:
+                return None
+            if record.fingerprint != fingerprint:
+                return error_response(
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    "Idempotency-Key was already used with a different request body"
+                )
+            if record.response_status is not None:
+                return replay_response(record)
+            if record.committed and record.locked_until < datetime.utcnow():
+                return error_response(
+                    status.HTTP_409_CONFLICT,
+                    "Request was already processed but its response is not available"
+                )
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return error_response(
+                    status.HTTP_409_CONFLICT,
+                    "A request with this Idempotency-Key is still in progress",
+                    retry_after=1
+                )
+            event = _in_flight.get(key)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(min(interval, remaining))
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
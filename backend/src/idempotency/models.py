@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, LargeBinary, SmallInteger
+from datetime import datetime
+from src.db.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # blake2b digests of (principal, method, path, Idempotency-Key) and of the body
+    key: Mapped[bytes] = mapped_column(LargeBinary(16), primary_key=True)
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary(16), nullable=False)
+    committed: Mapped[bool] = mapped_column(default=False, server_default="false")
+    locked_until: Mapped[datetime] = mapped_column(nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+
+    response_status: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    response_headers: Mapped[list] = mapped_column(JSON, nullable=True)
+    response_body: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+
+    def __repr__(self):
+        return f"IdempotencyKey(key={self.key.hex()}, status={self.response_status})"
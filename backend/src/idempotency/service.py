@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import logging
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import Row, and_, delete, null, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.db.database import async_session_factory
+from src.idempotency.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+# key of the idempotent request being handled in this task, if any
+current_idempotency_key: ContextVar[bytes | None] = ContextVar("idempotency_key", default=None)
+
+
+def digest(*parts: bytes | str) -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part.encode() if isinstance(part, str) else part)
+        hasher.update(b"\0")
+    return hasher.digest()
+
+
+async def claim_key(db: AsyncSession, key: bytes, fingerprint: bytes) -> bool:
+    """Insert the key as in-flight, or take over an expired or abandoned one.
+
+    One statement: ON CONFLICT only overwrites a row whose TTL has passed or
+    whose owner died before committing (lock expired, nothing committed).
+    """
+    now = datetime.utcnow()
+    stmt = insert(IdempotencyKey).values(
+        key=key,
+        fingerprint=fingerprint,
+        committed=False,
+        locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "committed": False,
+            "locked_until": stmt.excluded.locked_until,
+            "expires_at": stmt.excluded.expires_at,
+            "response_status": null(),
+            "response_headers": null(),
+            "response_body": null(),
+        },
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(
+                IdempotencyKey.response_status.is_(None),
+                IdempotencyKey.committed.is_(False),
+                IdempotencyKey.locked_until < now
+            )
+        )
+    ).returning(IdempotencyKey.key)
+    result = await db.execute(stmt)
+    return result.first() is not None
+
+
+async def get_key(db: AsyncSession, key: bytes) -> Optional[Row]:
+    result = await db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.committed,
+            IdempotencyKey.locked_until,
+            IdempotencyKey.response_status,
+            IdempotencyKey.response_headers,
+            IdempotencyKey.response_body
+        )
+        .where(IdempotencyKey.key == key)
+    )
+    return result.first()
+
+
+async def mark_committed(db: AsyncSession):
+    """Record inside the request's own transaction that its writes happened.
+
+    Called by the unit of work right before COMMIT, so a crash between the
+    commit and storing the response can never lead to a second execution.
+    """
+    key = current_idempotency_key.get()
+    if key is not None:
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(committed=True)
+        )
+
+
+async def store_response(
+    db: AsyncSession,
+    key: bytes,
+    status_code: int,
+    headers: List[List[str]],
+    body: Optional[bytes]
+):
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(
+            response_status=status_code,
+            response_headers=headers,
+            response_body=body
+        )
+    )
+
+
+async def release_key(db: AsyncSession, key: bytes):
+    """Forget an attempt that changed nothing so a retry runs it again"""
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.committed.is_(False))
+    )
+
+
+async def purge_expired_keys(db: AsyncSession, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Delete expired keys in short batches so the purge never holds many locks"""
+    purged = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < datetime.utcnow())
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired))
+        )
+        await db.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+
+async def purge_expired_keys_periodically(interval: float):
+    while True:
+        try:
+            async with async_session_factory() as db:
+                await purge_expired_keys(db)
+        except Exception as e:
+            logger.warning("Failed to purge idempotency keys: %s", e)
+        await asyncio.sleep(interval)
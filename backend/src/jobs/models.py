@@ -0,0 +1,41 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, BigInteger, Index, SmallInteger, Text, text
+from datetime import datetime
+from src.jobs.schemas import JobStatus
+from src.db.database import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    kind: Mapped[str] = mapped_column(nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=0, server_default="0")
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.queued, server_default=JobStatus.queued.name)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(nullable=False)
+    run_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+    locked_at: Mapped[datetime] = mapped_column(nullable=True)
+    locked_by: Mapped[str] = mapped_column(nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    __table_args__ = (
+        # the dequeue scan: only runnable rows, in the order they are taken
+        Index(
+            "ix_jobs_dequeue",
+            priority.desc(),
+            "run_at",
+            "id",
+            postgresql_where=text("status = 'queued'")
+        ),
+        Index(
+            "ix_jobs_running",
+            "locked_at",
+            postgresql_where=text("status = 'running'")
+        ),
+    )
+
+    def __repr__(self):
+        return f"Job(id={self.id}, kind={self.kind}, status={self.status})"
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import get_async_session
+from src.auth.service import require_admin
+from src.auth.models import User
+from src.jobs.schemas import JobQueueMetrics
+from src.jobs.service import get_queue_depth
+
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs admin"])
+
+@jobs_router.get("/metrics", response_model=JobQueueMetrics)
+async def get_job_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(require_admin)
+):
+    """Queue depth by status, plus this process's worker counters if it runs one"""
+    pool = getattr(request.app.state, "job_workers", None)
+    return JobQueueMetrics(
+        queue=await get_queue_depth(db),
+        worker=pool.metrics() if pool else None
+    )
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Dict
+from enum import Enum
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    failed = "failed"
+
+class JobKindMetrics(BaseModel):
+    succeeded: int = 0
+    retried: int = 0
+    dead: int = 0
+    total_seconds: float = 0.0
+
+class WorkerMetrics(BaseModel):
+    worker_id: str
+    concurrency: int
+    uptime_seconds: float
+    in_flight: int
+    succeeded: int
+    retried: int
+    dead: int
+    throughput_per_second: float
+    by_kind: Dict[str, JobKindMetrics]
+
+class JobQueueMetrics(BaseModel):
+    queue: Dict[JobStatus, int]
+    worker: WorkerMetrics | None = None
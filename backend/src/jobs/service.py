@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.jobs.models import Job
+from src.jobs.schemas import JobStatus
+
+JOBS_CHANNEL = "jobs"
+RETRY_BASE_DELAY_SECONDS = 5
+RETRY_MAX_DELAY_SECONDS = 3600
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    """Register the coroutine that runs jobs of `kind`"""
+    def decorator(handler: JobHandler) -> JobHandler:
+        if kind in HANDLERS:
+            raise ValueError(f"Duplicate job handler: {kind}")
+        HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Dict[str, Any],
+    priority: int = 0,
+    delay: Optional[timedelta] = None,
+    max_attempts: Optional[int] = None
+) -> int:
+    """Add a job in the caller's transaction and wake the workers.
+
+    Insert and NOTIFY are one statement. Both only become visible when the
+    caller commits, so a rolled back request never leaves a job behind.
+    """
+    job = (
+        insert(Job)
+        .values(
+            kind=kind,
+            payload=payload,
+            priority=priority,
+            status=JobStatus.queued,
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_at=datetime.utcnow() + (delay or timedelta()),
+            created_at=datetime.utcnow()
+        )
+        .returning(Job.id, Job.kind)
+        .cte("job")
+    )
+    result = await db.execute(
+        select(job.c.id, func.pg_notify(JOBS_CHANNEL, job.c.kind))
+    )
+    return result.scalar_one()
+
+
+async def dequeue(db: AsyncSession, worker_id: str, limit: int) -> List[Job]:
+    """Claim up to `limit` runnable jobs; rows locked by other workers are skipped"""
+    now = datetime.utcnow()
+    runnable = (
+        select(Job.id)
+        .where(Job.status == JobStatus.queued, Job.run_at <= now)
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id.in_(runnable.scalar_subquery()))
+        .values(
+            status=JobStatus.running,
+            attempts=Job.attempts + 1,
+            locked_at=now,
+            locked_by=worker_id
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = list(result.scalars().all())
+    await db.commit()
+    return jobs
+
+
+async def complete_job(db: AsyncSession, job_id: int):
+    # finished jobs are not kept: the table stays as small as the backlog
+    await db.execute(delete(Job).where(Job.id == job_id))
+    await db.commit()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BASE_DELAY_SECONDS * 2 ** (attempts - 1), RETRY_MAX_DELAY_SECONDS))
+
+
+async def fail_job(db: AsyncSession, job: Job, error: str) -> bool:
+    """Schedule a retry with exponential backoff; returns False once the job
+    has used up its attempts and is parked as failed."""
+    retry = job.attempts < job.max_attempts
+    await db.execute(
+        update(Job)
+        .where(Job.id == job.id)
+        .values(
+            status=JobStatus.queued if retry else JobStatus.failed,
+            run_at=datetime.utcnow() + retry_delay(job.attempts) if retry else Job.run_at,
+            locked_at=None,
+            locked_by=None,
+            last_error=error[:2000]
+        )
+    )
+    await db.commit()
+    return retry
+
+
+async def requeue_stale_jobs(db: AsyncSession, timeout_seconds: int) -> int:
+    """Put back jobs whose worker died while running them"""
+    result = await db.execute(
+        update(Job)
+        .where(
+            Job.status == JobStatus.running,
+            Job.locked_at < datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        )
+        .values(status=JobStatus.queued, locked_at=None, locked_by=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def next_run_at(db: AsyncSession) -> Optional[datetime]:
+    result = await db.execute(
+        select(func.min(Job.run_at)).where(Job.status == JobStatus.queued)
+    )
+    return result.scalar()
+
+
+async def get_queue_depth(db: AsyncSession) -> Dict[JobStatus, int]:
+    result = await db.execute(
+        select(Job.status, func.count()).group_by(Job.status)
+    )
+    depth = {status: 0 for status in JobStatus}
+    depth.update(dict(result.all()))
+    return depth
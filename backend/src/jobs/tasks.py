@@ -0,0 +1,9 @@
+from typing import Any, Dict
+from src.auth.service import EmailService
+from src.jobs.service import job_handler
+
+
+@job_handler("send_email")
+async def send_email(payload: Dict[str, Any]):
+    if not await EmailService.send_email(**payload):
+        raise RuntimeError(f"Email to {payload['to']} was not sent")
@@ -0,0 +1,225 @@
+"""Background job workers.
+
+Runs inside the API process when JOBS_IN_PROCESS is set (see src.main), or
+on its own:
+
+    python -m src.jobs.worker --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, Set
+from src.core.config import settings
+from src.core.logging_config import request_id, setup_logging
+from src.db.database import async_session_factory
+from src.db.notify import PgListener
+from src.jobs.models import Job
+from src.jobs.schemas import JobKindMetrics, WorkerMetrics
+from src.jobs.service import (
+    HANDLERS,
+    JOBS_CHANNEL,
+    dequeue,
+    complete_job,
+    fail_job,
+    requeue_stale_jobs,
+    next_run_at
+)
+# register handlers
+import src.jobs.tasks
+import src.project.tasks
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """Runs up to `concurrency` jobs at a time from the shared jobs table.
+
+    Sleeps until a NOTIFY on the jobs channel, the next delayed job, or the
+    poll interval (a safety net for missed notifications), whichever is first.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.JOBS_CONCURRENCY,
+        listener: Optional[PgListener] = None
+    ):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.listener = listener
+        self._owns_listener = listener is None
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._main_task: Optional[asyncio.Task] = None
+        self._started_at = time.monotonic()
+        self._by_kind = defaultdict(JobKindMetrics)
+
+    def metrics(self) -> WorkerMetrics:
+        uptime = time.monotonic() - self._started_at
+        succeeded = sum(m.succeeded for m in self._by_kind.values())
+        return WorkerMetrics(
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+            uptime_seconds=uptime,
+            in_flight=len(self._running),
+            succeeded=succeeded,
+            retried=sum(m.retried for m in self._by_kind.values()),
+            dead=sum(m.dead for m in self._by_kind.values()),
+            throughput_per_second=succeeded / uptime if uptime else 0.0,
+            by_kind=dict(self._by_kind)
+        )
+
+    def _on_notify(self, payload: Optional[str]):
+        self._wakeup.set()
+
+    async def start(self):
+        if self.listener is None:
+            self.listener = PgListener()
+            await self.listener.start()
+        await self.listener.subscribe(JOBS_CHANNEL, self._on_notify)
+        self._started_at = time.monotonic()
+        self._main_task = asyncio.create_task(self._run())
+
+    async def stop(self, drain_timeout: float = settings.JOBS_DRAIN_SECONDS):
+        """Stop taking jobs and give running ones `drain_timeout` to finish.
+
+        Jobs still running after that are cancelled and picked up again by
+        requeue_stale_jobs once their lock times out.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._main_task:
+            # the loop may be waiting for a free slot
+            done, pending = await asyncio.wait({self._main_task}, timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+        if self._running:
+            done, pending = await asyncio.wait(self._running, timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+        await self.listener.unsubscribe(JOBS_CHANNEL, self._on_notify)
+        if self._owns_listener:
+            await self.listener.stop()
+
+    async def _run(self):
+        last_reap = 0.0
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                if time.monotonic() - last_reap > settings.JOB_LOCK_TIMEOUT_SECONDS / 2:
+                    async with async_session_factory() as db:
+                        await requeue_stale_jobs(db, settings.JOB_LOCK_TIMEOUT_SECONDS)
+                    last_reap = time.monotonic()
+                claimed = await self._fill_slots()
+            except Exception as e:
+                logger.warning("Job worker %s failed to dequeue: %s", self.worker_id, e)
+                claimed = 0
+
+            if claimed:
+                # there may be more runnable jobs; look again as soon as a slot frees up
+                continue
+            await self._sleep()
+
+    async def _fill_slots(self) -> int:
+        await self._slots.acquire()
+        free = 1
+        while not self._slots.locked() and free < self.concurrency:
+            await self._slots.acquire()
+            free += 1
+        if self._stopping:
+            for _ in range(free):
+                self._slots.release()
+            return 0
+
+        async with async_session_factory() as db:
+            jobs = await dequeue(db, self.worker_id, free)
+        for _ in range(free - len(jobs)):
+            self._slots.release()
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(jobs)
+
+    async def _sleep(self):
+        timeout = settings.JOBS_POLL_SECONDS
+        try:
+            async with async_session_factory() as db:
+                run_at = await next_run_at(db)
+            if run_at is not None:
+                timeout = max(0.0, min(timeout, (run_at - datetime.utcnow()).total_seconds()))
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(self, job: Job):
+        # runs in its own task, so this only tags the job's log records
+        request_id.set(f"job-{job.id}")
+        metrics = self._by_kind[job.kind]
+        started = time.perf_counter()
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler for job kind {job.kind}")
+            await asyncio.wait_for(handler(job.payload), timeout=settings.JOB_TIMEOUT_SECONDS)
+        except Exception as e:
+            async with async_session_factory() as db:
+                retried = await fail_job(db, job, f"{type(e).__name__}: {e}")
+            if retried:
+                metrics.retried += 1
+            else:
+                metrics.dead += 1
+                logger.error("Job %s (%s) failed permanently: %s", job.id, job.kind, e)
+        else:
+            async with async_session_factory() as db:
+                await complete_job(db, job.id)
+            metrics.succeeded += 1
+        finally:
+            metrics.total_seconds += time.perf_counter() - started
+            self._slots.release()
+            self._wakeup.set()
+
+
+async def run_worker(concurrency: int):
+    pool = JobWorkerPool(concurrency)
+    await pool.start()
+    logger.info("Job worker %s started with %s slots", pool.worker_id, concurrency)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await pool.stop()
+    metrics = pool.metrics()
+    logger.info(
+        "Job worker %s stopped: %s succeeded, %s retried, %s dead, %.1f jobs/s",
+        pool.worker_id,
+        metrics.succeeded,
+        metrics.retried,
+        metrics.dead,
+        metrics.throughput_per_second
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--concurrency", type=int, default=settings.JOBS_CONCURRENCY)
+    args = parser.parse_args()
+    setup_logging()
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
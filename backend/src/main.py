@@ -1,24 +1,77 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.db.database import get_async_session
+from src.db.query_stats import QueryStatsMiddleware
+from src.core.profiling import ProfilingMiddleware
+from src.core.loop_monitor import LoopLagMonitor, RouteTrackingMiddleware
+from src.core.routes import metrics_router
+from src.core.config import settings
+from src.idempotency.middleware import IdempotencyMiddleware
+from src.idempotency.service import purge_expired_keys_periodically
+from src.db.notify import PgListener
+from src.core.cache import listen_for_invalidations
+from src.jobs.worker import JobWorkerPool
+from src.jobs.routes import jobs_router
 from src.auth.routes import auth_router
 from src.user.routes import user_router
 from src.accelerator.routes import accelerator_router
 from src.project.routes import project_router
-from src.project.project_research.routes import project_research_router
-from src.core.openapi_config import setup_openapi_config
+from src.project.project_research.routes import project_research_router, questionnaire_router, statistics_router
+from src.search.routes import search_router
+from src.project.project_research.progress import ProgressBroadcaster
+from src.core.openapi_config import setup_openapi_config, openapi_document
+from src.core.logging_config import setup_logging, RequestIdMiddleware
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print(f'server is starting ...')
+    logger.info('server is starting ...')
+    openapi_document(app)
+    app.state.loop_monitor = LoopLagMonitor()
+    await app.state.loop_monitor.start()
+    purge_task = asyncio.create_task(
+        purge_expired_keys_periodically(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+    )
+    app.state.pg_listener = PgListener()
+    await app.state.pg_listener.start()
+    await listen_for_invalidations(app.state.pg_listener)
+    app.state.progress_broadcaster = ProgressBroadcaster()
+    await app.state.progress_broadcaster.start(app.state.pg_listener)
+    app.state.job_workers = None
+    if settings.JOBS_IN_PROCESS:
+        app.state.job_workers = JobWorkerPool(listener=app.state.pg_listener)
+        await app.state.job_workers.start()
     async for session in get_async_session():
         yield
-    print(f'server is stopped')
+    if app.state.job_workers:
+        await app.state.job_workers.stop()
+    await app.state.progress_broadcaster.stop()
+    await app.state.pg_listener.stop()
+    purge_task.cancel()
+    await app.state.loop_monitor.stop()
+    logger.info('server is stopped')
 
 app = FastAPI(lifespan=lifespan)
 
+app.add_middleware(
+    IdempotencyMiddleware,
+    routes=[
+        ("POST", "/auth/register"),
+        ("POST", "/projects/"),
+        ("POST", "/projects/{project_id}/research/answers"),
+    ]
+)
+
+app.add_middleware(QueryStatsMiddleware)
+
+app.add_middleware(RouteTrackingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -27,11 +80,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(accelerator_router)
 app.include_router(project_router)
 app.include_router(project_research_router)
+app.include_router(questionnaire_router)
+app.include_router(statistics_router)
+app.include_router(search_router)
+app.include_router(jobs_router)
+app.include_router(metrics_router)
 
 
 setup_openapi_config(app)
\ No newline at end of file
@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 import os
+import re
 import sys
 
 sys.path.append(os.path.join(sys.path[0],'src'))
@@ -14,9 +15,11 @@ from src.core.config import settings
 # add models
 from src.auth.models import User, VerificationToken, PasswordResetToken
 from src.user.models import UserInfo
-from src.accelerator.models import Accelerator
+from src.accelerator.models import Accelerator, AcceleratorStageCount
 from src.project.models import Project
 from src.project.project_research.models import ResearchProject, ResearchQuestion, ResearchAnswer
+from src.idempotency.models import IdempotencyKey
+from src.jobs.models import Job
 
 from src.db.database import Base
 
@@ -35,6 +38,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# research_answers may be partitioned (revision 0b6e1f4c9d83); its partitions
+# and partition-only indexes are not in the models and must not be dropped
+PARTITION_OBJECTS = re.compile(r"research_answers_(a\d+|default|id_idx)")
+
+
+def include_name(name, type_, parent_names):
+    if type_ in ("table", "index") and name and PARTITION_OBJECTS.fullmatch(name):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +72,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -80,7 +94,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,201 @@
+"""partition research answers
+
+Optional: research_answers stays a plain table unless requested with
+
+    alembic -x partition_answers=true [-x partition_min_answers=10000] upgrade head
+
+It is then rebuilt as a table LIST-partitioned by accelerator_id while the
+app keeps running: a trigger mirrors writes into the new table, existing
+rows are copied in short batches, and only the final swap takes an
+exclusive lock. Accelerators with at least partition_min_answers answers
+get their own partition, all others (and projects without an accelerator)
+share research_answers_default; see src.project.project_research.partitions.
+
+To partition a database that went through this revision without the flag,
+downgrade to 9f4b2d7e1c05 and upgrade again with it.
+
+Every step can be re-run. If the swap gives up on its lock_timeout, the new
+table and the mirror trigger stay behind and keep the copy current; run the
+upgrade again to resume, or without the flag to drop them.
+
+Revision ID: 0b6e1f4c9d83
+Revises: 9f4b2d7e1c05
+Create Date: 2026-10-19 19:20:51.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e1f4c9d83'
+down_revision: Union[str, None] = '9f4b2d7e1c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_BATCH = 10000
+COLUMNS = "id, answer_text, question_id, research_project_id, accelerator_id"
+
+
+def _partitioned(connection) -> bool:
+    return connection.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = 'research_answers'::regclass)"
+    )).scalar_one()
+
+
+def _exists(connection, relation: str) -> bool:
+    return connection.execute(sa.text("SELECT to_regclass(:name) IS NOT NULL"), {'name': relation}).scalar_one()
+
+
+def _has_mirror(connection) -> bool:
+    return connection.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'research_answers_mirror' "
+        "AND tgrelid = 'research_answers'::regclass)"
+    )).scalar_one()
+
+
+def _drop_leftovers() -> None:
+    """What an attempt that stopped before the swap leaves behind"""
+    op.execute("DROP TRIGGER IF EXISTS research_answers_mirror ON research_answers")
+    op.execute("DROP FUNCTION IF EXISTS mirror_research_answers()")
+    op.execute("DROP TABLE IF EXISTS research_answers_partitioned")
+
+
+def upgrade() -> None:
+    options = context.get_x_argument(as_dictionary=True)
+    if options.get('partition_answers', '').lower() not in ('1', 'true', 'yes'):
+        _drop_leftovers()
+        return
+    min_answers = int(options.get('partition_min_answers', 10000))
+
+    connection = op.get_bind()
+    if _partitioned(connection):
+        return
+
+    # 1. the new table, empty, with the same columns, constraints and indexes;
+    # kept as is when an earlier attempt got as far as creating it
+    if not _exists(connection, 'research_answers_partitioned'):
+        _create_partitioned_table(connection, min_answers)
+
+    # 2. from now on every write to the old table is repeated on the new one
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION mirror_research_answers() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM research_answers_partitioned WHERE id = OLD.id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO research_answers_partitioned ({COLUMNS})
+                VALUES (NEW.id, NEW.answer_text, NEW.question_id, NEW.research_project_id, NEW.accelerator_id);
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    if not _has_mirror(connection):
+        op.execute("""
+            CREATE TRIGGER research_answers_mirror
+            AFTER INSERT OR UPDATE OR DELETE ON research_answers
+            FOR EACH ROW EXECUTE FUNCTION mirror_research_answers()
+        """)
+
+    # 3. copy what was there before the trigger, one short transaction per batch
+    # (a DO block is one); SHARE mode keeps writers out of a batch so that a
+    # row cannot be both copied and mirrored. Rows already copied are skipped.
+    bounds = connection.execute(sa.text("SELECT min(id), max(id) FROM research_answers")).one()
+    with op.get_context().autocommit_block():
+        if bounds[0] is not None:
+            for start in range(bounds[0], bounds[1] + 1, COPY_BATCH):
+                connection.execute(sa.text(f"""
+                    DO $$ BEGIN
+                        LOCK TABLE research_answers IN SHARE MODE;
+                        INSERT INTO research_answers_partitioned ({COLUMNS})
+                        SELECT {COLUMNS} FROM research_answers a
+                        WHERE a.id >= {start} AND a.id < {start + COPY_BATCH}
+                        AND NOT EXISTS (SELECT 1 FROM research_answers_partitioned p WHERE p.id = a.id);
+                    END $$
+                """))
+        connection.execute(sa.text("ANALYZE research_answers_partitioned"))
+
+    # 4. swap; the migration's own transaction holds the exclusive lock only
+    # for renames. On lock_timeout all of it rolls back and steps 1-3 stay done.
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute("LOCK TABLE research_answers IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER research_answers_mirror ON research_answers")
+    op.execute("DROP FUNCTION mirror_research_answers()")
+    op.execute("ALTER TABLE research_answers RENAME TO research_answers_unpartitioned")
+    op.execute("ALTER TABLE research_answers_partitioned RENAME TO research_answers")
+    # the sequence belongs to the old table and would be dropped with it
+    op.execute("ALTER SEQUENCE research_answers_id_seq OWNED BY research_answers.id")
+    op.execute("DROP TABLE research_answers_unpartitioned")
+    op.execute(
+        "ALTER INDEX research_answers_partitioned_research_project_id_idx "
+        "RENAME TO ix_research_answers_research_project_id"
+    )
+    op.execute("ALTER INDEX research_answers_partitioned_id_idx RENAME TO research_answers_id_idx")
+
+
+def _create_partitioned_table(connection, min_answers: int) -> None:
+    op.execute("""
+        CREATE TABLE research_answers_partitioned (
+            id integer NOT NULL DEFAULT nextval('research_answers_id_seq'),
+            answer_text varchar NOT NULL,
+            question_id integer NOT NULL,
+            research_project_id integer NOT NULL,
+            accelerator_id integer,
+            CONSTRAINT research_answers_question_id_fkey FOREIGN KEY (question_id)
+                REFERENCES research_questions (id) ON DELETE CASCADE,
+            CONSTRAINT research_answers_research_project_id_fkey FOREIGN KEY (research_project_id)
+                REFERENCES research_projects (id) ON DELETE CASCADE
+        ) PARTITION BY LIST (accelerator_id)
+    """)
+    # a primary key would have to include the nullable partition key;
+    # ids stay unique through the sequence
+    op.execute("CREATE INDEX research_answers_partitioned_id_idx ON research_answers_partitioned (id)")
+    op.execute(
+        "CREATE INDEX research_answers_partitioned_research_project_id_idx "
+        "ON research_answers_partitioned (research_project_id)"
+    )
+    large = connection.execute(
+        sa.text(
+            "SELECT accelerator_id FROM research_answers WHERE accelerator_id IS NOT NULL "
+            "GROUP BY accelerator_id HAVING count(*) >= :min_answers ORDER BY accelerator_id"
+        ),
+        {'min_answers': min_answers}
+    ).scalars().all()
+    for accelerator_id in large:
+        op.execute(
+            f"CREATE TABLE research_answers_a{accelerator_id} "
+            f"PARTITION OF research_answers_partitioned FOR VALUES IN ({accelerator_id})"
+        )
+    op.execute("CREATE TABLE research_answers_default PARTITION OF research_answers_partitioned DEFAULT")
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if not _partitioned(connection):
+        return
+
+    # not online: writes wait while the rows are copied back
+    op.execute("LOCK TABLE research_answers IN EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TABLE research_answers_unpartitioned (
+            id integer NOT NULL DEFAULT nextval('research_answers_id_seq'),
+            answer_text varchar NOT NULL,
+            question_id integer NOT NULL,
+            research_project_id integer NOT NULL,
+            accelerator_id integer,
+            CONSTRAINT research_answers_question_id_fkey FOREIGN KEY (question_id)
+                REFERENCES research_questions (id) ON DELETE CASCADE,
+            CONSTRAINT research_answers_research_project_id_fkey FOREIGN KEY (research_project_id)
+                REFERENCES research_projects (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute(f"INSERT INTO research_answers_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM research_answers")
+    op.execute("ALTER SEQUENCE research_answers_id_seq OWNED BY research_answers_unpartitioned.id")
+    op.execute("DROP TABLE research_answers")
+    op.execute("ALTER TABLE research_answers_unpartitioned RENAME TO research_answers")
+    op.execute("ALTER TABLE research_answers ADD CONSTRAINT research_answers_pkey PRIMARY KEY (id)")
+    op.execute("CREATE INDEX ix_research_answers_research_project_id ON research_answers (research_project_id)")
@@ -0,0 +1,103 @@
+"""full text search
+
+Projects get a generated tsvector over name and description (adding it
+rewrites projects, which is small). research_answers can be large and
+partitioned, so its tsvector is a plain column set by a trigger and filled
+in batches, and both GIN indexes are built concurrently.
+
+Revision ID: 4d8c1a6e2f97
+Revises: c2e7a9f05b14
+Create Date: 2026-10-19 20:31:07.448215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8c1a6e2f97'
+down_revision: Union[str, None] = 'c2e7a9f05b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 50000
+
+# the russian configuration stems Cyrillic words as Russian and Latin ones as English
+PROJECT_DOCUMENT = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def _answer_partitions(connection) -> list:
+    return connection.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'research_answers'::regclass ORDER BY c.relname"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    op.execute(
+        f"ALTER TABLE projects ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({PROJECT_DOCUMENT}) STORED"
+    )
+
+    op.add_column('research_answers', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # the built-in trigger function; a row-level BEFORE trigger on a
+    # partitioned table is cloned to every partition, split ones included
+    op.execute("""
+        CREATE TRIGGER research_answers_search_vector
+        BEFORE INSERT OR UPDATE OF answer_text ON research_answers
+        FOR EACH ROW EXECUTE FUNCTION
+        tsvector_update_trigger(search_vector, 'pg_catalog.russian', answer_text)
+    """)
+
+    connection = op.get_bind()
+    partitions = _answer_partitions(connection)
+    bounds = connection.execute(sa.text("SELECT min(id), max(id) FROM research_answers")).one()
+    with op.get_context().autocommit_block():
+        # rows written from here on are covered by the trigger
+        if bounds[0] is not None:
+            for start in range(bounds[0], bounds[1] + 1, BACKFILL_BATCH):
+                connection.execute(
+                    sa.text(
+                        "UPDATE research_answers SET search_vector = to_tsvector('russian'::regconfig, answer_text) "
+                        "WHERE id >= :start AND id < :end AND search_vector IS NULL"
+                    ),
+                    {'start': start, 'end': start + BACKFILL_BATCH}
+                )
+
+        connection.execute(sa.text(
+            "CREATE INDEX CONCURRENTLY ix_projects_search_vector ON projects USING gin (search_vector)"
+        ))
+        if not partitions:
+            connection.execute(sa.text(
+                "CREATE INDEX CONCURRENTLY ix_research_answers_search_vector "
+                "ON research_answers USING gin (search_vector)"
+            ))
+        else:
+            # a partitioned index cannot be built concurrently; build one per
+            # partition and attach it, the parent becomes valid with the last
+            connection.execute(sa.text(
+                "CREATE INDEX ix_research_answers_search_vector "
+                "ON ONLY research_answers USING gin (search_vector)"
+            ))
+            for partition in partitions:
+                connection.execute(sa.text(
+                    f"CREATE INDEX CONCURRENTLY {partition}_search_vector_idx "
+                    f"ON {partition} USING gin (search_vector)"
+                ))
+                connection.execute(sa.text(
+                    f"ALTER INDEX ix_research_answers_search_vector ATTACH PARTITION {partition}_search_vector_idx"
+                ))
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_research_answers_search_vector")
+    op.execute("DROP TRIGGER research_answers_search_vector ON research_answers")
+    op.drop_column('research_answers', 'search_vector')
+    op.execute("DROP INDEX IF EXISTS ix_projects_search_vector")
+    op.drop_column('projects', 'search_vector')
@@ -0,0 +1,68 @@
+"""research question key
+
+Revision ID: 6c4f4e68f4b1
+Revises: 8adc95458407
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c4f4e68f4b1'
+down_revision: Union[str, None] = '8adc95458407'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keys of the questionnaire as it stood at this revision, frozen here so the
+# backfilled rows match what sync_research_questions will look them up by.
+# (phase, stage, order) -> key; anything else gets a unique placeholder key
+# and is treated as removed by the next pruning sync.
+QUESTION_KEYS = {
+    ('planning', 'stage_1', 1): 'planning.stage_1.main_question',
+}
+
+
+def upgrade() -> None:
+    op.add_column('research_questions', sa.Column('key', sa.String(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            WITH known_keys (phase, stage, "order", key) AS (
+                SELECT * FROM unnest(
+                    CAST(:phases AS varchar[]), CAST(:stages AS varchar[]),
+                    CAST(:orders AS integer[]), CAST(:keys AS varchar[])
+                )
+            ),
+            first_questions AS (
+                SELECT DISTINCT ON (q.phase, q.stage, q."order") q.id, known_keys.key
+                FROM research_questions q
+                JOIN known_keys USING (phase, stage, "order")
+                ORDER BY q.phase, q.stage, q."order", q.id
+            )
+            UPDATE research_questions q
+            SET key = coalesce(
+                first_questions.key,
+                q.phase || '.' || q.stage || '.' || q."order" || '.' || q.id
+            )
+            FROM research_questions r
+            LEFT JOIN first_questions ON first_questions.id = r.id
+            WHERE q.id = r.id
+            """
+        ).bindparams(
+            phases=[phase for phase, _, _ in QUESTION_KEYS],
+            stages=[stage for _, stage, _ in QUESTION_KEYS],
+            orders=[order for _, _, order in QUESTION_KEYS],
+            keys=list(QUESTION_KEYS.values()),
+        )
+    )
+    op.alter_column('research_questions', 'key', nullable=False)
+    op.create_index(op.f('ix_research_questions_key'), 'research_questions', ['key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_research_questions_key'), table_name='research_questions')
+    op.drop_column('research_questions', 'key')
@@ -0,0 +1,65 @@
+"""answer accelerator
+
+Revision ID: 9f4b2d7e1c05
+Revises: a5d2e8c47f19
+Create Date: 2026-10-19 19:02:37.218460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b2d7e1c05'
+down_revision: Union[str, None] = 'a5d2e8c47f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 50000
+
+
+def upgrade() -> None:
+    # nullable and without a default: no table rewrite
+    op.add_column('research_answers', sa.Column('accelerator_id', sa.Integer(), nullable=True))
+
+    # moving a project to another accelerator (or detaching it) moves its answers
+    op.execute("""
+        CREATE FUNCTION sync_answer_accelerator() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE research_answers a SET accelerator_id = NEW.accelerator_id
+            FROM research_projects rp
+            WHERE rp.project_id = NEW.id AND a.research_project_id = rp.id;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE TRIGGER projects_sync_answer_accelerator
+        AFTER UPDATE OF accelerator_id ON projects
+        FOR EACH ROW WHEN (OLD.accelerator_id IS DISTINCT FROM NEW.accelerator_id)
+        EXECUTE FUNCTION sync_answer_accelerator()
+    """)
+
+    # backfill in committed batches so no lock is held on the whole table
+    connection = op.get_bind()
+    bounds = connection.execute(sa.text("SELECT min(id), max(id) FROM research_answers")).one()
+    if bounds[0] is None:
+        return
+    with op.get_context().autocommit_block():
+        for start in range(bounds[0], bounds[1] + 1, BACKFILL_BATCH):
+            connection.execute(
+                sa.text(
+                    "UPDATE research_answers a SET accelerator_id = p.accelerator_id "
+                    "FROM research_projects rp JOIN projects p ON p.id = rp.project_id "
+                    "WHERE a.research_project_id = rp.id AND p.accelerator_id IS NOT NULL "
+                    "AND a.id >= :start AND a.id < :end"
+                ),
+                {'start': start, 'end': start + BACKFILL_BATCH}
+            )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER projects_sync_answer_accelerator ON projects")
+    op.execute("DROP FUNCTION sync_answer_accelerator()")
+    op.drop_column('research_answers', 'accelerator_id')
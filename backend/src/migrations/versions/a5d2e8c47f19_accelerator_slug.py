@@ -0,0 +1,58 @@
+"""accelerator slug
+
+Revision ID: a5d2e8c47f19
+Revises: f3a7d9e2b610
+Create Date: 2026-10-19 18:31:02.551873
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d2e8c47f19'
+down_revision: Union[str, None] = 'f3a7d9e2b610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def slugify(value: str) -> str:
+    # frozen copy of src.core.normalization.slugify as of this revision
+    slug = re.sub(r"[\W_]+", "-", unicodedata.normalize("NFKC", value).casefold()).strip("-")
+    if slug.isdigit():
+        slug = f"n-{slug}"
+    return slug or "-"
+
+
+def upgrade() -> None:
+    op.add_column('accelerators', sa.Column('slug', sa.String(), nullable=True))
+
+    accelerators = sa.table('accelerators', sa.column('id', sa.Integer), sa.column('university', sa.String), sa.column('slug', sa.String))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(accelerators.c.id, accelerators.c.university).order_by(accelerators.c.id)).all()
+    taken = set()
+    slugs = []
+    for accelerator_id, university in rows:
+        slug = slugify(university)
+        # names that only differed in case or punctuation keep the older one's slug
+        if slug in taken:
+            slug = f"{slug}-{accelerator_id}"
+        taken.add(slug)
+        slugs.append({'row_id': accelerator_id, 'slug': slug})
+    if slugs:
+        connection.execute(
+            accelerators.update().where(accelerators.c.id == sa.bindparam('row_id')).values(slug=sa.bindparam('slug')),
+            slugs
+        )
+
+    op.alter_column('accelerators', 'slug', nullable=False)
+    op.create_index('ix_accelerators_slug', 'accelerators', ['slug'], unique=True, postgresql_include=['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accelerators_slug', table_name='accelerators')
+    op.drop_column('accelerators', 'slug')
@@ -0,0 +1,44 @@
+"""row versions
+
+Revision ID: b3e1d0c27a95
+Revises: 6c4f4e68f4b1
+Create Date: 2026-10-19 11:40:07.218455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1d0c27a95'
+down_revision: Union[str, None] = '6c4f4e68f4b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('projects', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('user_info', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('research_projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('research_projects', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.alter_column('projects', 'updated_at', server_default=None)
+    op.alter_column('research_projects', 'updated_at', server_default=None)
+
+    op.create_index('ix_projects_version', 'projects', ['id'], unique=False, postgresql_include=['user_id', 'version', 'updated_at'])
+    op.create_index('ix_user_info_version', 'user_info', ['user_id'], unique=False, postgresql_include=['id', 'version', 'updated_at'])
+    op.create_index('ix_research_projects_version', 'research_projects', ['project_id'], unique=False, postgresql_include=['id', 'version', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_research_projects_version', table_name='research_projects')
+    op.drop_index('ix_user_info_version', table_name='user_info')
+    op.drop_index('ix_projects_version', table_name='projects')
+
+    op.drop_column('research_projects', 'updated_at')
+    op.drop_column('research_projects', 'version')
+    op.drop_column('user_info', 'version')
+    op.drop_column('projects', 'updated_at')
+    op.drop_column('projects', 'version')
@@ -0,0 +1,127 @@
+"""accelerator stage counts
+
+Revision ID: c2e7a9f05b14
+Revises: 0b6e1f4c9d83
+Create Date: 2026-10-19 19:48:15.630592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a9f05b14'
+down_revision: Union[str, None] = '0b6e1f4c9d83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Adds up the +1/-1 rows of one write. Keys are locked in sorted order so two
+# transactions moving projects between the same stages cannot deadlock; a
+# key whose deltas cancel out is not touched at all.
+APPLY_DELTAS = """
+    INSERT INTO accelerator_stage_counts AS c (accelerator_id, funnel, category, stage, projects)
+    SELECT accelerator_id, funnel, category, stage, sum(delta)
+    FROM ({deltas}) AS d (accelerator_id, funnel, category, stage, delta)
+    WHERE accelerator_id IS NOT NULL
+    GROUP BY accelerator_id, funnel, category, stage
+    HAVING sum(delta) <> 0
+    ORDER BY accelerator_id, funnel, category, stage
+    ON CONFLICT (accelerator_id, funnel, category, stage)
+    DO UPDATE SET projects = c.projects + EXCLUDED.projects
+"""
+
+# a project leaves its old place in both funnels and enters the new one;
+# soft-deleted projects are not counted
+PROJECT_DELTAS = """
+    SELECT OLD.accelerator_id, 'project', lower(OLD.type::text), OLD.stage, -1
+    WHERE TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL
+    UNION ALL
+    SELECT OLD.accelerator_id, 'research', rp.current_phase, rp.current_stage, -1
+    FROM research_projects rp
+    WHERE TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL AND rp.project_id = OLD.id
+    UNION ALL
+    SELECT NEW.accelerator_id, 'project', lower(NEW.type::text), NEW.stage, 1
+    WHERE TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL
+    UNION ALL
+    SELECT NEW.accelerator_id, 'research', rp.current_phase, rp.current_stage, 1
+    FROM research_projects rp
+    WHERE TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL AND rp.project_id = NEW.id
+"""
+
+# a research project that is deleted together with its project finds no
+# project here; the project's BEFORE DELETE trigger has counted it already
+RESEARCH_DELTAS = """
+    SELECT p.accelerator_id, 'research', OLD.current_phase, OLD.current_stage, -1
+    FROM projects p
+    WHERE TG_OP <> 'INSERT' AND p.id = OLD.project_id AND p.deleted_at IS NULL
+    UNION ALL
+    SELECT p.accelerator_id, 'research', NEW.current_phase, NEW.current_stage, 1
+    FROM projects p
+    WHERE TG_OP <> 'DELETE' AND p.id = NEW.project_id AND p.deleted_at IS NULL
+"""
+
+
+def upgrade() -> None:
+    op.create_table('accelerator_stage_counts',
+    sa.Column('accelerator_id', sa.Integer(), nullable=False),
+    sa.Column('funnel', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('projects', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('accelerator_id', 'funnel', 'category', 'stage')
+    )
+
+    for table, deltas in (('projects', PROJECT_DELTAS), ('research_projects', RESEARCH_DELTAS)):
+        op.execute(f"""
+            CREATE FUNCTION {table}_stage_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                {APPLY_DELTAS.format(deltas=deltas)};
+                IF TG_OP = 'DELETE' THEN
+                    RETURN OLD;
+                END IF;
+                RETURN NULL;
+            END $$
+        """)
+
+    op.execute("""
+        CREATE TRIGGER projects_stage_counts
+        AFTER INSERT OR UPDATE OF type, stage, accelerator_id, deleted_at ON projects
+        FOR EACH ROW EXECUTE FUNCTION projects_stage_counts()
+    """)
+    # BEFORE: the research project is still there, its cascade delete runs after
+    op.execute("""
+        CREATE TRIGGER projects_stage_counts_delete
+        BEFORE DELETE ON projects
+        FOR EACH ROW EXECUTE FUNCTION projects_stage_counts()
+    """)
+    op.execute("""
+        CREATE TRIGGER research_projects_stage_counts
+        AFTER INSERT OR DELETE OR UPDATE OF current_phase, current_stage, project_id ON research_projects
+        FOR EACH ROW EXECUTE FUNCTION research_projects_stage_counts()
+    """)
+
+    # initial counts; the table lock keeps writes from slipping between fill and triggers
+    op.execute("LOCK TABLE projects, research_projects IN SHARE MODE")
+    op.execute("""
+        INSERT INTO accelerator_stage_counts (accelerator_id, funnel, category, stage, projects)
+        SELECT accelerator_id, 'project', lower(type::text), stage, count(*)
+        FROM projects
+        WHERE accelerator_id IS NOT NULL AND deleted_at IS NULL
+        GROUP BY accelerator_id, lower(type::text), stage
+        UNION ALL
+        SELECT p.accelerator_id, 'research', rp.current_phase, rp.current_stage, count(*)
+        FROM research_projects rp JOIN projects p ON p.id = rp.project_id
+        WHERE p.accelerator_id IS NOT NULL AND p.deleted_at IS NULL
+        GROUP BY p.accelerator_id, rp.current_phase, rp.current_stage
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER research_projects_stage_counts ON research_projects")
+    op.execute("DROP TRIGGER projects_stage_counts_delete ON projects")
+    op.execute("DROP TRIGGER projects_stage_counts ON projects")
+    op.execute("DROP FUNCTION research_projects_stage_counts()")
+    op.execute("DROP FUNCTION projects_stage_counts()")
+    op.drop_table('accelerator_stage_counts')
@@ -0,0 +1,38 @@
+"""idempotency keys
+
+Revision ID: c71e5a0d2f43
+Revises: b3e1d0c27a95
+Create Date: 2026-10-19 14:12:51.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e5a0d2f43'
+down_revision: Union[str, None] = 'b3e1d0c27a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('idempotency_keys',
+    sa.Column('key', sa.LargeBinary(length=16), nullable=False),
+    sa.Column('fingerprint', sa.LargeBinary(length=16), nullable=False),
+    sa.Column('committed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('locked_until', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('response_status', sa.SmallInteger(), nullable=True),
+    sa.Column('response_headers', sa.JSON(), nullable=True),
+    sa.Column('response_body', sa.LargeBinary(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_expires_at'), 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_idempotency_keys_expires_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,45 @@
+"""jobs
+
+Revision ID: d4a9e3b17c58
+Revises: c71e5a0d2f43
+Create Date: 2026-10-19 16:03:27.918240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9e3b17c58'
+down_revision: Union[str, None] = 'c71e5a0d2f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('priority', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'failed', name='jobstatus'), server_default='queued', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_dequeue', 'jobs', [sa.text('priority DESC'), 'run_at', 'id'], unique=False, postgresql_where=sa.text("status = 'queued'"))
+    op.create_index('ix_jobs_running', 'jobs', ['locked_at'], unique=False, postgresql_where=sa.text("status = 'running'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_running', table_name='jobs', postgresql_where=sa.text("status = 'running'"))
+    op.drop_index('ix_jobs_dequeue', table_name='jobs', postgresql_where=sa.text("status = 'queued'"))
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,47 @@
+"""database cascades
+
+Revision ID: e8b2c4f61a37
+Revises: d4a9e3b17c58
+Create Date: 2026-10-19 17:42:10.384519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2c4f61a37'
+down_revision: Union[str, None] = 'd4a9e3b17c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_FOREIGN_KEYS = [
+    ('projects_user_id_fkey', 'projects'),
+    ('verification_tokens_user_id_fkey', 'verification_tokens'),
+    ('password_reset_tokens_user_id_fkey', 'password_reset_tokens'),
+]
+
+
+def upgrade() -> None:
+    for name, table in USER_FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+    # cascaded and batched deletes look children up by these columns
+    op.create_index(op.f('ix_projects_user_id'), 'projects', ['user_id'], unique=False)
+    op.create_index(op.f('ix_research_answers_research_project_id'), 'research_answers', ['research_project_id'], unique=False)
+
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'deleted_at')
+
+    op.drop_index(op.f('ix_research_answers_research_project_id'), table_name='research_answers')
+    op.drop_index(op.f('ix_projects_user_id'), table_name='projects')
+
+    for name, table in USER_FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'users', ['user_id'], ['id'])
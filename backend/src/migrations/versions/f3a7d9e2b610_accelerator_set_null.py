@@ -0,0 +1,30 @@
+"""accelerator set null
+
+Revision ID: f3a7d9e2b610
+Revises: e8b2c4f61a37
+Create Date: 2026-10-19 18:05:44.127903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7d9e2b610'
+down_revision: Union[str, None] = 'e8b2c4f61a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('projects_accelerator_id_fkey', 'projects', type_='foreignkey')
+    op.create_foreign_key('projects_accelerator_id_fkey', 'projects', 'accelerators', ['accelerator_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_projects_accelerator_id'), 'projects', ['accelerator_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_projects_accelerator_id'), table_name='projects')
+    op.drop_constraint('projects_accelerator_id_fkey', 'projects', type_='foreignkey')
+    op.create_foreign_key('projects_accelerator_id_fkey', 'projects', 'accelerators', ['accelerator_id'], ['id'])
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from datetime import datetime
 from src.project.schemas import ProjectType
 from src.db.database import Base
 
@@ -12,13 +14,29 @@ class Project(Base):
     description: Mapped[str] = mapped_column(nullable=True)
     type: Mapped[ProjectType] = mapped_column(nullable=False)
     stage: Mapped[str] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+    # set when the project is deleted in the background; the row goes once its answers are purged
+    deleted_at: Mapped[datetime] = mapped_column(nullable=True)
+    # full-text document for search: the name outranks the description
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True,
+        deferred=True
+    )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     user: Mapped["User"] = relationship(back_populates="projects")
     
     accelerator_id: Mapped[int] = mapped_column(
-        ForeignKey("accelerators.id"), 
-        nullable=True
+        ForeignKey("accelerators.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
     )
     accelerator: Mapped["Accelerator"] = relationship(back_populates="projects")
 
@@ -26,7 +44,18 @@ class Project(Base):
         "ResearchProject",
         back_populates="project",
         uselist=False,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index(
+            "ix_projects_version",
+            "id",
+            postgresql_include=["user_id", "version", "updated_at"]
+        ),
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     def __repr__(self):
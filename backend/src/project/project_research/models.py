@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, JSON
+from sqlalchemy import ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from datetime import datetime
 from src.db.database import Base
 from typing import List, Dict, Any
 
@@ -9,6 +11,8 @@ class ResearchProject(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     current_phase: Mapped[str] = mapped_column(default="planning")
     current_stage: Mapped[str] = mapped_column(default="stage_1")
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
     project: Mapped["Project"] = relationship(back_populates="research_project")
@@ -16,13 +20,23 @@ class ResearchProject(Base):
     answers: Mapped[List["ResearchAnswer"]] = relationship(
         back_populates="research_project",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index(
+            "ix_research_projects_version",
+            "project_id",
+            postgresql_include=["id", "version", "updated_at"]
+        ),
     )
 
 class ResearchQuestion(Base):
     __tablename__ = "research_questions"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str] = mapped_column(unique=True, nullable=False, index=True)
     phase: Mapped[str] = mapped_column(nullable=False, index=True)
     stage: Mapped[str] = mapped_column(nullable=False, index=True)
     question_text: Mapped[str] = mapped_column(nullable=False)
@@ -33,7 +47,8 @@ class ResearchQuestion(Base):
 
     answers: Mapped[List["ResearchAnswer"]] = relationship(
         back_populates="question",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
 class ResearchAnswer(Base):
@@ -48,6 +63,18 @@ class ResearchAnswer(Base):
     question: Mapped["ResearchQuestion"] = relationship(back_populates="answers")
     
     research_project_id: Mapped[int] = mapped_column(
-        ForeignKey("research_projects.id", ondelete="CASCADE")
+        ForeignKey("research_projects.id", ondelete="CASCADE"),
+        index=True
+    )
+    research_project: Mapped["ResearchProject"] = relationship(back_populates="answers")
+
+    # copy of the project's accelerator, kept in step by a trigger on projects;
+    # the partition key when research_answers is partitioned (see partitions.py)
+    accelerator_id: Mapped[int] = mapped_column(nullable=True)
+
+    # to_tsvector('russian', answer_text), set by a trigger (revision 4d8c1a6e2f97)
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+
+    __table_args__ = (
+        Index("ix_research_answers_search_vector", "search_vector", postgresql_using="gin"),
     )
-    research_project: Mapped["ResearchProject"] = relationship(back_populates="answers")
\ No newline at end of file
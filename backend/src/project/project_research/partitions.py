@@ -0,0 +1,136 @@
+"""Inspect and split the accelerator partitions of research_answers.
+
+Partitioning is optional and enabled by migration 0b6e1f4c9d83
+(`alembic -x partition_answers=true upgrade head`). Accelerators that had
+enough answers at that point get their own partition; all others share
+research_answers_default. Split an accelerator out once it grows:
+
+    python -m src.project.project_research.partitions list [--min-answers 10000]
+    python -m src.project.project_research.partitions split <accelerator id>
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import async_session_factory
+
+DEFAULT_PARTITION = "research_answers_default"
+# the default partition is locked while rows move out; do not queue behind long transactions
+SPLIT_LOCK_TIMEOUT = "5s"
+
+
+def partition_name(accelerator_id: int) -> str:
+    return f"research_answers_a{accelerator_id}"
+
+
+async def answers_partitioned(db: AsyncSession) -> bool:
+    result = await db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = 'research_answers'::regclass)"
+    ))
+    return result.scalar_one()
+
+
+async def answer_partitions(db: AsyncSession) -> List[dict]:
+    """Every partition with its bound and size"""
+    result = await db.execute(text(
+        "SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound, "
+        "c.reltuples::bigint AS rows, pg_total_relation_size(c.oid) AS bytes "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'research_answers'::regclass ORDER BY c.relname"
+    ))
+    return [dict(row) for row in result.mappings()]
+
+
+async def split_candidates(db: AsyncSession, min_answers: int) -> List[dict]:
+    """Accelerators in the default partition with at least `min_answers` answers"""
+    result = await db.execute(
+        text(
+            f"SELECT accelerator_id, count(*) AS answers FROM {DEFAULT_PARTITION} "
+            "WHERE accelerator_id IS NOT NULL GROUP BY accelerator_id "
+            "HAVING count(*) >= :min_answers ORDER BY answers DESC"
+        ),
+        {"min_answers": min_answers}
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def split_answer_partition(db: AsyncSession, accelerator_id: int) -> Optional[int]:
+    """Move one accelerator's answers out of the default partition into their own.
+
+    The default partition is locked while the rows move and while ATTACH
+    checks it, so split accelerators while they are still small. Returns the
+    number of rows moved, or None if the accelerator already has a partition.
+    """
+    name = partition_name(accelerator_id)
+    exists = await db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    if exists.scalar_one():
+        return None
+
+    await db.execute(text(f"SET LOCAL lock_timeout = '{SPLIT_LOCK_TIMEOUT}'"))
+    await db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    await db.execute(text(f"CREATE TABLE {name} (LIKE research_answers INCLUDING DEFAULTS)"))
+    result = await db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE accelerator_id = {accelerator_id} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ))
+    # lets ATTACH skip the scan of the new partition
+    await db.execute(text(
+        f"ALTER TABLE {name} ADD CONSTRAINT {name}_bound "
+        f"CHECK (accelerator_id IS NOT NULL AND accelerator_id = {accelerator_id})"
+    ))
+    await db.execute(text(
+        f"ALTER TABLE research_answers ATTACH PARTITION {name} FOR VALUES IN ({accelerator_id})"
+    ))
+    await db.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bound"))
+    return result.rowcount
+
+
+async def list_partitions(min_answers: int):
+    async with async_session_factory() as db:
+        if not await answers_partitioned(db):
+            print("research_answers is not partitioned")
+            return
+        for partition in await answer_partitions(db):
+            print(f"{partition['name']:<32} {partition['bound']:<24} ~{partition['rows']:>10} rows {partition['bytes'] / 2**20:10.1f} MiB")
+        for candidate in await split_candidates(db, min_answers):
+            print(f"split candidate: accelerator {candidate['accelerator_id']} with {candidate['answers']} answers")
+
+
+async def split(accelerator_id: int):
+    async with async_session_factory() as db:
+        if not await answers_partitioned(db):
+            print("research_answers is not partitioned")
+            return
+        started = time.perf_counter()
+        moved = await split_answer_partition(db, accelerator_id)
+        await db.commit()
+        elapsed = time.perf_counter() - started
+
+    if moved is None:
+        print(f"{partition_name(accelerator_id)} already exists")
+    else:
+        print(f"Moved {moved} answers to {partition_name(accelerator_id)} in {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the accelerator partitions of research answers")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="show partitions and accelerators worth splitting out")
+    list_parser.add_argument("--min-answers", type=int, default=10000)
+    split_parser = commands.add_parser("split", help="give an accelerator its own partition")
+    split_parser.add_argument("accelerator_id", type=int)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        asyncio.run(list_partitions(args.min_answers))
+    else:
+        asyncio.run(split(args.accelerator_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Set
+from src.core.config import settings
+from src.db.database import async_session_factory
+from src.db.notify import PgListener
+from src.project.project_research.schemas import ResearchProgress
+from src.project.project_research.service import (
+    RESEARCH_PROGRESS_CHANNEL,
+    get_research_progress_by_id
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressBroadcaster:
+    """Fans research progress changes out to the SSE subscribers of this process.
+
+    Writers NOTIFY the research project id on commit. Progress is recomputed
+    once per notification and project, however many clients watch it, and an
+    idle subscriber costs one queue and one suspended coroutine, no database
+    connection. Notifications arriving during a recompute are coalesced into
+    one more recompute.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._refreshing: Dict[int, bool] = {}
+        self._listener: Optional[PgListener] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def start(self, listener: PgListener):
+        self._listener = listener
+        await listener.subscribe(RESEARCH_PROGRESS_CHANNEL, self._on_notify)
+
+    async def stop(self):
+        if self._listener:
+            await self._listener.unsubscribe(RESEARCH_PROGRESS_CHANNEL, self._on_notify)
+
+    def subscribe(self, research_project_id: int) -> asyncio.Queue:
+        # only the latest progress matters, so a slow client never queues more than one
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers[research_project_id].add(queue)
+        return queue
+
+    def unsubscribe(self, research_project_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(research_project_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[research_project_id]
+
+    def _on_notify(self, payload: Optional[str]):
+        # None: the LISTEN connection was re-established and may have missed some
+        ids = list(self._subscribers) if payload is None else [int(payload)]
+        for research_project_id in ids:
+            if research_project_id not in self._subscribers:
+                continue
+            if research_project_id in self._refreshing:
+                self._refreshing[research_project_id] = True
+                continue
+            self._refreshing[research_project_id] = False
+            asyncio.get_running_loop().create_task(self._refresh(research_project_id))
+
+    async def _refresh(self, research_project_id: int):
+        try:
+            while True:
+                async with async_session_factory() as db:
+                    progress = await get_research_progress_by_id(db, research_project_id)
+                if progress is not None:
+                    self._publish(research_project_id, progress)
+                if not self._refreshing.get(research_project_id):
+                    break
+                self._refreshing[research_project_id] = False
+        except Exception as e:
+            logger.exception("Failed to refresh research progress %s", research_project_id)
+        finally:
+            self._refreshing.pop(research_project_id, None)
+
+    def _publish(self, research_project_id: int, progress: ResearchProgress):
+        for queue in self._subscribers.get(research_project_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(progress)
+
+
+def sse_event(progress: ResearchProgress) -> str:
+    return f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+
+
+async def progress_events(
+    broadcaster: ProgressBroadcaster,
+    research_project_id: int
+) -> AsyncIterator[str]:
+    """Current progress first, then every change, with comment heartbeats so
+    proxies keep the connection open."""
+    queue = broadcaster.subscribe(research_project_id)
+    try:
+        async with async_session_factory() as db:
+            last = await get_research_progress_by_id(db, research_project_id)
+        yield f"retry: {settings.SSE_RETRY_MILLISECONDS}\n\n"
+        if last is not None:
+            yield sse_event(last)
+        while True:
+            try:
+                progress = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if progress != last:
+                last = progress
+                yield sse_event(progress)
+    finally:
+        broadcaster.unsubscribe(research_project_id, queue)
@@ -0,0 +1,42 @@
+"""Sync the research questionnaire from a YAML/JSON definition.
+
+    python -m src.project.project_research.questionnaire questions.yaml [--dry-run] [--keep-missing]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from src.db.database import async_session_factory
+# register related models for mapper configuration
+from src.auth.models import User
+from src.accelerator.models import Accelerator
+from src.project.models import Project
+from src.project.project_research.service import parse_questionnaire, sync_research_questions
+
+
+async def sync_from_file(path: str, prune: bool, dry_run: bool):
+    with open(path, "rb") as file:
+        definitions = parse_questionnaire(file.read())
+
+    async with async_session_factory() as db:
+        started = time.perf_counter()
+        diff = await sync_research_questions(db, definitions, prune=prune, dry_run=dry_run)
+        await db.commit()
+        elapsed = time.perf_counter() - started
+
+    print(json.dumps(diff.model_dump(), ensure_ascii=False, indent=2))
+    print(f"{len(definitions)} questions synced in {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync research questions by key")
+    parser.add_argument("path", help="YAML or JSON questionnaire definition")
+    parser.add_argument("--dry-run", action="store_true", help="report the diff without applying it")
+    parser.add_argument("--keep-missing", action="store_true", help="do not delete questions missing from the file")
+    args = parser.parse_args()
+    asyncio.run(sync_from_file(args.path, prune=not args.keep_missing, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
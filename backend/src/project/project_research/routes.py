@@ -1,31 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
 from src.db.database import get_async_session
-from src.auth.service import AuthService
+from src.db.unit_of_work import UnitOfWorkRoute, get_unit_of_work
+from src.core.fast_json import FastJSONResponse
+from src.core.streaming import StreamFormat, streaming_response
+from src.core.conditional import (
+    make_etag,
+    has_conditional_headers,
+    is_not_modified,
+    if_match_version,
+    not_modified_response,
+    set_validators
+)
+from src.auth.service import AuthService, allow_staff, require_admin
 from src.auth.models import User
+from src.project.repository import ProjectScope, VersionConflictError, get_project_scope
+from src.project.project_research.models import ResearchProject
 from src.project.project_research.schemas import (
     ResearchQuestionResponse,
     ResearchAnswerCreate,
     ResearchAnswerResponse,
+    ResearchAnswerFields,
+    ResearchProjectHeader,
     ResearchProjectResponse,
     ResearchProgress,
-    StageInfo
+    ResearchInclude,
+    AnswerField,
+    QuestionnaireDiff,
+    StageInfo,
+    AnswerStatistics
 )
 from src.project.project_research.service import (
     get_research_questions,
-    get_research_project_with_answers,
+    get_research_project,
+    get_research_project_version,
+    get_research_answers,
+    research_answers_query,
     create_research_project,
     save_research_answers,
     advance_research_stage,
-    check_stage_completion
+    check_stage_completion,
+    get_research_progress,
+    parse_questionnaire,
+    sync_research_questions,
+    get_answer_statistics
 )
+from src.project.project_research.progress import progress_events
+from src.accelerator.service import resolve_accelerator_id
 
 project_research_router = APIRouter(
     prefix="/projects/{project_id}/research",
-    tags=["research"]
+    tags=["research"],
+    route_class=UnitOfWorkRoute
+)
+
+questionnaire_router = APIRouter(
+    prefix="/research/questionnaire",
+    tags=["research admin"],
+    route_class=UnitOfWorkRoute
 )
 
+statistics_router = APIRouter(
+    prefix="/research/statistics",
+    tags=["research"],
+    route_class=UnitOfWorkRoute
+)
+
+async def get_scoped_research_project(
+    db: AsyncSession,
+    project_id: int,
+    scope: ProjectScope
+) -> ResearchProject | None:
+    try:
+        return await get_research_project(db, project_id, scope)
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
+
+async def get_or_create_research_project(
+    db: AsyncSession,
+    project_id: int,
+    scope: ProjectScope
+) -> ResearchProject:
+    research_project = await get_scoped_research_project(db, project_id, scope)
+    if not research_project:
+        research_project = await create_research_project(db, project_id)
+    return research_project
+
 @project_research_router.get("/questions/{phase}/{stage}", response_model=List[ResearchQuestionResponse])
 async def get_questions_for_stage(
     project_id: int,
@@ -42,27 +113,118 @@ async def get_questions_for_stage(
         )
     return questions
 
-@project_research_router.get("/", response_model=ResearchProjectResponse)
+@project_research_router.get(
+    "/",
+    response_model=ResearchProjectResponse,
+    response_model_exclude_none=True
+)
 async def get_project_research(
     project_id: int,
+    request: Request,
+    response: Response,
+    include: List[ResearchInclude] = Query([]),
+    phase: str | None = None,
+    stage: str | None = None,
+    fields: List[AnswerField] | None = Query(None),
+    skip: int = 0,
+    limit: int = Query(100, le=500),
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
+):
+    variant = request.url.query
+    if has_conditional_headers(request):
+        version = await get_research_project_version(db, project_id, scope)
+        if version:
+            etag = make_etag("research", version.id, version.version, variant)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+
+    research_project = await get_or_create_research_project(db, project_id, scope)
+    set_validators(
+        response,
+        make_etag("research", research_project.id, research_project.version, variant),
+        research_project.updated_at
+    )
+
+    research = ResearchProjectResponse(
+        id=research_project.id,
+        current_phase=research_project.current_phase,
+        current_stage=research_project.current_stage,
+        project_id=research_project.project_id
+    )
+    if ResearchInclude.ANSWERS in include:
+        research.answers = await get_research_answers(
+            db,
+            research_project.id,
+            phase=phase,
+            stage=stage,
+            fields=fields,
+            skip=skip,
+            limit=limit
+        )
+    return research
+
+@project_research_router.get(
+    "/answers",
+    response_model=List[ResearchAnswerFields],
+    response_model_exclude_none=True
+)
+async def get_answers(
+    project_id: int,
+    phase: str | None = None,
+    stage: str | None = None,
+    fields: List[AnswerField] | None = Query(None),
+    skip: int = 0,
+    limit: int = Query(100, le=500),
+    fast: bool = False,
     db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    scope: ProjectScope = Depends(get_project_scope)
 ):
-    research_project = await get_research_project_with_answers(db, project_id)
+    research_project = await get_scoped_research_project(db, project_id, scope)
+    answers = []
+    if research_project:
+        answers = await get_research_answers(
+            db,
+            research_project.id,
+            phase=phase,
+            stage=stage,
+            fields=fields,
+            skip=skip,
+            limit=limit
+        )
+    if fast:
+        return FastJSONResponse(answers)
+    return answers
+
+@project_research_router.get("/answers/export")
+async def export_answers(
+    project_id: int,
+    format: StreamFormat = StreamFormat.NDJSON,
+    phase: str | None = None,
+    stage: str | None = None,
+    fields: List[AnswerField] | None = Query(None),
+    db: AsyncSession = Depends(get_async_session),
+    scope: ProjectScope = Depends(get_project_scope)
+):
+    research_project = await get_scoped_research_project(db, project_id, scope)
     if not research_project:
-        research_project = await create_research_project(db, project_id)
-    return research_project
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Research project not found"
+        )
+    return streaming_response(
+        research_answers_query(research_project.id, phase, stage, fields),
+        format
+    )
 
 @project_research_router.post("/answers", response_model=List[ResearchAnswerResponse])
 async def save_answers(
     project_id: int,
     answers: List[ResearchAnswerCreate],
-    db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
 ):
-    research_project = await get_research_project_with_answers(db, project_id)
-    if not research_project:
-        research_project = await create_research_project(db, project_id)
+    research_project = await get_or_create_research_project(db, project_id, scope)
     
     try:
         return await save_research_answers(
@@ -70,26 +232,41 @@ async def save_answers(
             research_project.id,
             answers
         )
+    except DBAPIError:
+        # UnitOfWorkRoute retries serialization failures and deadlocks
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@project_research_router.post("/progress", response_model=ResearchProjectResponse)
+@project_research_router.post("/progress", response_model=ResearchProjectHeader)
 async def update_progress(
     project_id: int,
     next_phase: str,
     next_stage: str,
-    db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
 ):
-    research_project = await get_research_project_with_answers(db, project_id)
+    research_project = await get_scoped_research_project(db, project_id, scope)
     if not research_project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Research project not found"
         )
+
+    expected_version = if_match_version(request)
+    if expected_version is None:
+        expected_version = research_project.version
+    elif expected_version != research_project.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Research project was modified by another request",
+            headers={"ETag": make_etag("research", research_project.id, research_project.version)}
+        )
     
     required_answered, answered, total, full_completion = await check_stage_completion(
         db,
@@ -105,40 +282,108 @@ async def update_progress(
         )
     
     try:
-        return await advance_research_stage(
+        research_project = await advance_research_stage(
             db,
             research_project.id,
             next_phase,
-            next_stage
+            next_stage,
+            expected_version
+        )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
+    except DBAPIError:
+        # UnitOfWorkRoute retries serialization failures and deadlocks
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    set_validators(
+        response,
+        make_etag("research", research_project.id, research_project.version),
+        research_project.updated_at
+    )
+    return research_project
 
 @project_research_router.get("/progress", response_model=ResearchProgress)
 async def check_progress(
     project_id: int,
-    db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
 ):
-    research_project = await get_research_project_with_answers(db, project_id)
-    if not research_project:
-        research_project = await create_research_project(db, project_id)
-    
-    required_answered, answered, total, full_completion = await check_stage_completion(
-        db,
-        research_project.id,
-        research_project.current_phase,
-        research_project.current_stage
+    research_project = await get_or_create_research_project(db, project_id, scope)
+    return await get_research_progress(db, research_project)
+
+@project_research_router.get(
+    "/progress/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+async def stream_progress(
+    project_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
+):
+    """Server-sent `progress` events whenever answers are saved or the stage advances"""
+    research_project = await get_or_create_research_project(db, project_id, scope)
+    return StreamingResponse(
+        progress_events(request.app.state.progress_broadcaster, research_project.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    
-    return ResearchProgress(
-        phase=research_project.current_phase,
-        stage=research_project.current_stage,
-        completed=full_completion,
-        answered_count=answered,
-        total_questions=total,
-        required_answered=required_answered
-    )
\ No newline at end of file
+
+@questionnaire_router.put(
+    "/",
+    response_model=QuestionnaireDiff,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-yaml": {"schema": {"type": "string"}},
+            },
+        }
+    }
+)
+async def sync_questionnaire(
+    request: Request,
+    dry_run: bool = False,
+    prune: bool = True,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: User = Depends(require_admin)
+):
+    try:
+        definitions = parse_questionnaire(await request.body())
+        return await sync_research_questions(db, definitions, prune=prune, dry_run=dry_run)
+    except DBAPIError:
+        # UnitOfWorkRoute retries serialization failures and deadlocks
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@statistics_router.get("/", response_model=AnswerStatistics)
+async def get_answer_statistics_endpoint(
+    accelerator: str | None = Query(None, description="Accelerator id or slug; all projects if omitted"),
+    phase: str | None = Query(None),
+    stage: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(allow_staff)
+):
+    """Per-question answer distributions, with mean and percentiles for scale questions"""
+    accelerator_id = None
+    if accelerator is not None:
+        accelerator_id = await resolve_accelerator_id(db, accelerator)
+        if accelerator_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Accelerator not found"
+            )
+    return await get_answer_statistics(db, accelerator_id, phase, stage)
@@ -26,6 +26,9 @@ class ResearchQuestionBase(BaseModel):
 class ResearchQuestionCreate(ResearchQuestionBase):
     pass
 
+class ResearchQuestionDefinition(ResearchQuestionBase):
+    key: str = Field(..., min_length=1, example="planning.stage_1.main_question")
+
 class ResearchQuestionResponse(ResearchQuestionBase):
     id: int
 
@@ -40,12 +43,29 @@ class ResearchAnswerResponse(ResearchAnswerBase):
     id: int
     research_project_id: int
 
-class ResearchProjectResponse(BaseModel):
+class AnswerField(str, Enum):
+    ID = "id"
+    QUESTION_ID = "question_id"
+    RESEARCH_PROJECT_ID = "research_project_id"
+    ANSWER_TEXT = "answer_text"
+
+class ResearchInclude(str, Enum):
+    ANSWERS = "answers"
+
+class ResearchAnswerFields(BaseModel):
+    id: Optional[int] = None
+    question_id: Optional[int] = None
+    research_project_id: Optional[int] = None
+    answer_text: Optional[str] = None
+
+class ResearchProjectHeader(BaseModel):
     id: int
     current_phase: str
     current_stage: str
     project_id: int
-    answers: List[ResearchAnswerResponse] = []
+
+class ResearchProjectResponse(ResearchProjectHeader):
+    answers: Optional[List[ResearchAnswerFields]] = None
 
 class ResearchProgress(BaseModel):
     phase: str
@@ -55,8 +75,40 @@ class ResearchProgress(BaseModel):
     total_questions: int
     required_answered: bool
 
+class QuestionnaireDiff(BaseModel):
+    inserted: List[str] = []
+    updated: List[str] = []
+    deleted: List[str] = []
+    unchanged: int = 0
+    dry_run: bool = False
+
 class StageInfo(BaseModel):
     phase: str
     stage: str
     name: str
-    description: str
\ No newline at end of file
+    description: str
+
+class ChoiceCount(BaseModel):
+    option: str
+    respondents: int
+    share: float
+
+class ScaleSummary(BaseModel):
+    mean: float
+    min: float
+    max: float
+    percentiles: Dict[str, float]
+
+class QuestionStatistics(BaseModel):
+    question_id: int
+    key: str
+    phase: str
+    stage: str
+    question_type: QuestionType
+    respondents: int = 0
+    distribution: List[ChoiceCount] = []
+    summary: Optional[ScaleSummary] = None
+
+class AnswerStatistics(BaseModel):
+    accelerator_id: Optional[int] = None
+    questions: List[QuestionStatistics] = []
@@ -1,35 +1,233 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select, delete
+import yaml
+from datetime import datetime
+from typing import List, Optional, Tuple, Dict, Any
+from sqlalchemy import select, insert, update, delete, func, Select, Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.fast_json import rows_to_dicts
+from src.db.notify import notify
+from src.core.cache import LocalCache, invalidate
+from src.project.models import Project
+from src.project.repository import ProjectScope, VersionConflictError
 from src.project.project_research.models import ResearchProject, ResearchQuestion, ResearchAnswer
-from src.project.project_research.schemas import ResearchAnswerCreate, QuestionType
+from src.project.project_research.schemas import (
+    ResearchAnswerCreate,
+    ResearchQuestionResponse,
+    ResearchQuestionDefinition,
+    QuestionnaireDiff,
+    QuestionType,
+    AnswerField,
+    ResearchProgress,
+    AnswerStatistics,
+    QuestionStatistics,
+    ChoiceCount,
+    ScaleSummary
+)
+from src.project.project_research.statistics import parse_scale, scale_order, choice_counts, scale_summaries
+
+RESEARCH_PROGRESS_CHANNEL = "research_progress"
+
+# questions per (phase, stage); only the questionnaire sync changes them
+question_cache = LocalCache("research_questions", maxsize=256, ttl=3600)
+# per accelerator id, or "all"; dropped by answer saves in that scope, and
+# whole by anything that moves or removes projects or accelerators
+statistics_cache = LocalCache("answer_statistics", maxsize=1024, ttl=300)
+
+STATISTICS_QUESTION_TYPES = (QuestionType.SCALE, QuestionType.MULTIPLE_CHOICE, QuestionType.CHECKBOX)
+
+ANSWER_COLUMNS = {
+    AnswerField.ID: ResearchAnswer.id,
+    AnswerField.QUESTION_ID: ResearchAnswer.question_id,
+    AnswerField.RESEARCH_PROJECT_ID: ResearchAnswer.research_project_id,
+    AnswerField.ANSWER_TEXT: ResearchAnswer.answer_text,
+}
 
 async def get_research_questions(
     db: AsyncSession,
     phase: str,
     stage: str
-) -> List[ResearchQuestion]:
+) -> List[ResearchQuestionResponse]:
+    async def load():
+        result = await db.execute(
+            select(ResearchQuestion)
+            .where(
+                ResearchQuestion.phase == phase,
+                ResearchQuestion.stage == stage
+            )
+            .order_by(ResearchQuestion.order)
+        )
+        # schemas, not ORM instances: those belong to the session that loaded them
+        return [
+            ResearchQuestionResponse.model_validate(question, from_attributes=True)
+            for question in result.scalars()
+        ]
+
+    return await question_cache.get_or_load((phase, stage), load)
+
+async def get_research_project(
+    db: AsyncSession,
+    project_id: int,
+    scope: ProjectScope
+) -> Optional[ResearchProject]:
+    """Load the research project header only; answers are fetched separately.
+
+    Project existence and access are checked in the same statement: raises
+    LookupError for a missing project and PermissionError outside the scope.
+    Returns None when the project has no research project yet.
+    """
     result = await db.execute(
-        select(ResearchQuestion)
+        select(ResearchProject, scope.allows().label("allowed"))
+        .select_from(Project)
+        .outerjoin(ResearchProject, ResearchProject.project_id == Project.id)
+        .where(Project.id == project_id, Project.deleted_at.is_(None))
+    )
+    row = result.first()
+    if row is None:
+        raise LookupError("Project not found")
+    if not row.allowed:
+        raise PermissionError("Not authorized to access this project")
+    return row.ResearchProject
+
+async def get_research_project_version(
+    db: AsyncSession,
+    project_id: int,
+    scope: ProjectScope
+) -> Optional[Row]:
+    """Research project id, version and modification time from ix_research_projects_version"""
+    result = await db.execute(
+        select(ResearchProject.id, ResearchProject.version, ResearchProject.updated_at)
+        .join(Project, Project.id == ResearchProject.project_id)
         .where(
-            ResearchQuestion.phase == phase,
-            ResearchQuestion.stage == stage
+            ResearchProject.project_id == project_id,
+            Project.deleted_at.is_(None),
+            scope.allows()
         )
-        .order_by(ResearchQuestion.order)
     )
-    return result.scalars().all()
+    return result.first()
+
+def research_answers_query(
+    research_project_id: int,
+    phase: Optional[str] = None,
+    stage: Optional[str] = None,
+    fields: Optional[List[AnswerField]] = None
+) -> Select:
+    columns = [ANSWER_COLUMNS[field] for field in (fields or ANSWER_COLUMNS)]
+    query = select(*columns).where(
+        ResearchAnswer.research_project_id == research_project_id
+    )
+
+    if phase or stage:
+        query = query.join(
+            ResearchQuestion,
+            ResearchQuestion.id == ResearchAnswer.question_id
+        )
+        if phase:
+            query = query.where(ResearchQuestion.phase == phase)
+        if stage:
+            query = query.where(ResearchQuestion.stage == stage)
+
+    return query.order_by(ResearchAnswer.id)
 
-async def get_research_project_with_answers(
+async def get_research_answers(
     db: AsyncSession,
-    project_id: int
-) -> Optional[ResearchProject]:
+    research_project_id: int,
+    phase: Optional[str] = None,
+    stage: Optional[str] = None,
+    fields: Optional[List[AnswerField]] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """Fetch a page of answers as plain rows with only the requested columns"""
     result = await db.execute(
-        select(ResearchProject)
-        .options(selectinload(ResearchProject.answers))
-        .where(ResearchProject.project_id == project_id)
+        research_answers_query(research_project_id, phase, stage, fields)
+        .offset(skip)
+        .limit(limit)
+    )
+    return rows_to_dicts(result)
+
+async def _answer_statistics(
+    db: AsyncSession,
+    accelerator_id: Optional[int]
+) -> AnswerStatistics:
+    result = await db.execute(
+        select(ResearchQuestion)
+        .where(ResearchQuestion.question_type.in_([t.value for t in STATISTICS_QUESTION_TYPES]))
+        .order_by(ResearchQuestion.phase, ResearchQuestion.stage, ResearchQuestion.order)
+    )
+    questions = result.scalars().all()
+    statistics = AnswerStatistics(accelerator_id=accelerator_id)
+    if not questions:
+        return statistics
+
+    # one row per question and distinct answer: the database does the counting
+    # and only a few hundred rows come back, however many answers there are
+    # answers of soft-deleted projects stay until purged; they no longer count
+    query = (
+        select(ResearchAnswer.question_id, ResearchAnswer.answer_text, func.count())
+        .join(ResearchProject, ResearchProject.id == ResearchAnswer.research_project_id)
+        .join(Project, Project.id == ResearchProject.project_id)
+        .where(
+            ResearchAnswer.question_id.in_([q.id for q in questions]),
+            Project.deleted_at.is_(None)
+        )
+        .group_by(ResearchAnswer.question_id, ResearchAnswer.answer_text)
+    )
+    if accelerator_id is not None:
+        query = query.where(ResearchAnswer.accelerator_id == accelerator_id)
+    counts: Dict[int, List[Tuple[str, int]]] = {}
+    for question_id, answer_text, count in await db.execute(query):
+        counts.setdefault(question_id, []).append((answer_text, count))
+
+    scale_rows = [
+        (question_id, value, count)
+        for question_id, answers in counts.items()
+        for answer_text, count in answers
+        if (value := parse_scale(answer_text)) is not None
+    ]
+    summaries = scale_summaries(scale_rows)
+
+    for question in questions:
+        answers = counts.get(question.id, [])
+        respondents = sum(count for _, count in answers)
+        if question.question_type == QuestionType.SCALE:
+            answers = sorted(answers, key=lambda answer: scale_order(answer[0]))
+            options = []
+        else:
+            options = [option for values in (question.options or {}).values() for option in values]
+        distribution = choice_counts(answers, options, multiple=question.question_type == QuestionType.CHECKBOX)
+        summary = summaries.get(question.id)
+        statistics.questions.append(QuestionStatistics(
+            question_id=question.id,
+            key=question.key,
+            phase=question.phase,
+            stage=question.stage,
+            question_type=question.question_type,
+            respondents=respondents,
+            distribution=[
+                ChoiceCount(option=option, respondents=count, share=count / respondents if respondents else 0.0)
+                for option, count in distribution.items()
+            ],
+            summary=ScaleSummary(**summary) if summary else None
+        ))
+    return statistics
+
+async def get_answer_statistics(
+    db: AsyncSession,
+    accelerator_id: Optional[int] = None,
+    phase: Optional[str] = None,
+    stage: Optional[str] = None
+) -> AnswerStatistics:
+    """Answer distributions of the scale and choice questions, for one
+    accelerator's projects or for all of them"""
+    statistics = await statistics_cache.get_or_load(
+        "all" if accelerator_id is None else str(accelerator_id),
+        lambda: _answer_statistics(db, accelerator_id)
     )
-    return result.scalars().first()
+    if phase or stage:
+        statistics = statistics.model_copy(update={"questions": [
+            question for question in statistics.questions
+            if (not phase or question.phase == phase) and (not stage or question.stage == stage)
+        ]})
+    return statistics
 
 async def create_research_project(
     db: AsyncSession,
@@ -37,8 +235,7 @@ async def create_research_project(
 ) -> ResearchProject:
     db_research_project = ResearchProject(project_id=project_id)
     db.add(db_research_project)
-    await db.commit()
-    await db.refresh(db_research_project)
+    await db.flush()
     return db_research_project
 
 async def save_research_answers(
@@ -46,6 +243,30 @@ async def save_research_answers(
     research_project_id: int,
     answers: List[ResearchAnswerCreate]
 ) -> List[ResearchAnswer]:
+    # Answers are part of the research project representation; the same
+    # statement returns the accelerator the new answers are filed under.
+    # FOR SHARE holds off a concurrent reassign until this transaction ends
+    # (its trigger then moves these answers too) or, if the reassign came
+    # first, waits for it and reads the new accelerator. Taken before any
+    # answer row is locked, so it cannot deadlock with that trigger.
+    project = (
+        select(Project.accelerator_id)
+        .join(ResearchProject, ResearchProject.project_id == Project.id)
+        .where(ResearchProject.id == research_project_id)
+        .with_for_update(read=True, of=Project)
+        .cte("project")
+    )
+    result = await db.execute(
+        update(ResearchProject)
+        .where(ResearchProject.id == research_project_id)
+        .values(
+            version=ResearchProject.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .returning(select(project.c.accelerator_id).scalar_subquery())
+    )
+    accelerator_id = result.scalar_one_or_none()
+
     # Delete existing answers for these questions
     question_ids = [a.question_id for a in answers]
     await db.execute(
@@ -55,40 +276,55 @@ async def save_research_answers(
             ResearchAnswer.question_id.in_(question_ids)
         )
     )
-    
+
     # Add new answers
     db_answers = [
         ResearchAnswer(
             research_project_id=research_project_id,
             question_id=answer.question_id,
-            answer_text=answer.answer_text
+            answer_text=answer.answer_text,
+            accelerator_id=accelerator_id
         )
         for answer in answers
     ]
     
     db.add_all(db_answers)
-    await db.commit()
-    
-    # Refresh all answers
-    for answer in db_answers:
-        await db.refresh(answer)
-    
+    await notify(db, RESEARCH_PROGRESS_CHANNEL, str(research_project_id))
+    await invalidate(db, "answer_statistics", "all")
+    if accelerator_id is not None:
+        await invalidate(db, "answer_statistics", str(accelerator_id))
+    # Ids come back from the INSERT ... RETURNING of the flush
+    await db.flush()
     return db_answers
 
 async def advance_research_stage(
     db: AsyncSession,
     research_project_id: int,
     next_phase: str,
-    next_stage: str
+    next_stage: str,
+    expected_version: int
 ) -> ResearchProject:
-    db_research_project = await db.get(ResearchProject, research_project_id)
+    """Move to the next stage only if nobody changed the project since
+    expected_version was read (compare-and-swap, no row lock held)."""
+    result = await db.execute(
+        update(ResearchProject)
+        .where(
+            ResearchProject.id == research_project_id,
+            ResearchProject.version == expected_version
+        )
+        .values(
+            current_phase=next_phase,
+            current_stage=next_stage,
+            version=ResearchProject.version + 1,
+            updated_at=datetime.utcnow()
+        )
+        .returning(ResearchProject)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    db_research_project = result.scalars().first()
     if not db_research_project:
-        raise ValueError("Research project not found")
-    
-    db_research_project.current_phase = next_phase
-    db_research_project.current_stage = next_stage
-    await db.commit()
-    await db.refresh(db_research_project)
+        raise VersionConflictError("Research project was modified by another request")
+    await notify(db, RESEARCH_PROGRESS_CHANNEL, str(research_project_id))
     return db_research_project
 
 async def check_stage_completion(
@@ -102,19 +338,19 @@ async def check_stage_completion(
     required_questions = [q for q in questions if q.required]
     question_ids = [q.id for q in required_questions]
     
-    # Check answers for required questions
+    # Count answers for required questions without loading their text
     result = await db.execute(
-        select(ResearchAnswer)
+        select(func.count())
+        .select_from(ResearchAnswer)
         .where(
             ResearchAnswer.research_project_id == research_project_id,
             ResearchAnswer.question_id.in_(question_ids)
         )
     )
-    answers = result.scalars().all()
+    total_answered = result.scalar_one()
     
     # Calculate completion status
-    required_answered = len(answers) >= len(required_questions)
-    total_answered = len(answers)
+    required_answered = total_answered >= len(required_questions)
     total_questions = len(questions)
     
     # Check if all required questions are answered
@@ -125,22 +361,132 @@ async def check_stage_completion(
         required_answered and (total_answered == total_questions)
     )
 
-async def initialize_research_questions(db: AsyncSession):
+async def get_research_progress(
+    db: AsyncSession,
+    research_project: ResearchProject
+) -> ResearchProgress:
+    required_answered, answered, total, full_completion = await check_stage_completion(
+        db,
+        research_project.id,
+        research_project.current_phase,
+        research_project.current_stage
+    )
+    return ResearchProgress(
+        phase=research_project.current_phase,
+        stage=research_project.current_stage,
+        completed=full_completion,
+        answered_count=answered,
+        total_questions=total,
+        required_answered=required_answered
+    )
+
+async def get_research_progress_by_id(
+    db: AsyncSession,
+    research_project_id: int
+) -> Optional[ResearchProgress]:
+    result = await db.execute(
+        select(ResearchProject)
+        .where(ResearchProject.id == research_project_id)
+    )
+    research_project = result.scalars().first()
+    if not research_project:
+        return None
+    return await get_research_progress(db, research_project)
+
+QUESTION_FIELDS = (
+    "phase",
+    "stage",
+    "question_text",
+    "question_type",
+    "options",
+    "order",
+    "required",
+)
+
+DEFAULT_QUESTIONNAIRE = [
+    ResearchQuestionDefinition(
+        key="planning.stage_1.main_question",
+        phase="planning",
+        stage="stage_1",
+        question_text="What is the main research question?",
+        question_type=QuestionType.TEXT,
+        order=1,
+        required=True
+    ),
+    # Add other questions similarly...
+]
+
+def parse_questionnaire(raw: bytes | str) -> List[ResearchQuestionDefinition]:
+    """Parse a YAML or JSON questionnaire: a list of questions or {"questions": [...]}"""
+    data = yaml.safe_load(raw) or []
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    if not isinstance(data, list):
+        raise ValueError("Questionnaire must be a list of questions")
+    return [ResearchQuestionDefinition.model_validate(item) for item in data]
+
+async def sync_research_questions(
+    db: AsyncSession,
+    definitions: List[ResearchQuestionDefinition],
+    prune: bool = True,
+    dry_run: bool = False
+) -> QuestionnaireDiff:
+    """Apply only the changed questions, keyed by ResearchQuestion.key.
+
+    Existing question ids are kept, so answers to unchanged or updated
+    questions survive. Only questions removed from the definition (when
+    prune is set) are deleted, together with their answers.
+    """
+    wanted = {}
+    for definition in definitions:
+        if definition.key in wanted:
+            raise ValueError(f"Duplicate question key: {definition.key}")
+        wanted[definition.key] = definition.model_dump(mode="json", include=set(QUESTION_FIELDS))
+
+    result = await db.execute(
+        select(
+            ResearchQuestion.id,
+            ResearchQuestion.key,
+            *(getattr(ResearchQuestion, field) for field in QUESTION_FIELDS)
+        )
+    )
+    existing = {row.key: row for row in result}
+
+    inserts = []
+    updates = []
+    unchanged = 0
+    for key, values in wanted.items():
+        row = existing.get(key)
+        if row is None:
+            inserts.append({"key": key, **values})
+        elif any(getattr(row, field) != value for field, value in values.items()):
+            updates.append({"id": row.id, **values})
+        else:
+            unchanged += 1
+    deletes = [key for key in existing if key not in wanted] if prune else []
+
+    if not dry_run:
+        if deletes:
+            await db.execute(
+                delete(ResearchQuestion)
+                .where(ResearchQuestion.key.in_(deletes))
+            )
+        if inserts:
+            await db.execute(insert(ResearchQuestion), inserts)
+        if updates:
+            await db.execute(update(ResearchQuestion), updates)
+        if inserts or updates or deletes:
+            await invalidate(db, "research_questions")
+
+    ids_to_keys = {row.id: key for key, row in existing.items()}
+    return QuestionnaireDiff(
+        inserted=[item["key"] for item in inserts],
+        updated=[ids_to_keys[item["id"]] for item in updates],
+        deleted=deletes,
+        unchanged=unchanged,
+        dry_run=dry_run
+    )
+
+async def initialize_research_questions(db: AsyncSession) -> QuestionnaireDiff:
     """Initialize the database with research questions"""
-    # First clear existing questions
-    await db.execute(delete(ResearchQuestion))
-    
-    questions = [
-        ResearchQuestion(
-            phase="planning",
-            stage="stage_1",
-            question_text="What is the main research question?",
-            question_type=QuestionType.TEXT.value,
-            order=1,
-            required=True
-        ),
-        # Add other questions similarly...
-    ]
-    
-    db.add_all(questions)
-    await db.commit()
\ No newline at end of file
+    return await sync_research_questions(db, DEFAULT_QUESTIONNAIRE, prune=False)
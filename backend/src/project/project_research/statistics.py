@@ -0,0 +1,79 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+import orjson
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def parse_scale(answer_text: str) -> float | None:
+    try:
+        value = float(answer_text)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def scale_order(answer_text: str) -> Tuple[bool, float]:
+    """Sort key: numeric answers ascending, anything else after them"""
+    value = parse_scale(answer_text)
+    return (value is None, value or 0.0)
+
+
+def split_choices(answer_text: str) -> List[str]:
+    """Options of a checkbox answer, stored as a JSON array of strings"""
+    if answer_text.startswith("["):
+        try:
+            choices = orjson.loads(answer_text)
+        except orjson.JSONDecodeError:
+            return [answer_text]
+        if isinstance(choices, list):
+            return [str(choice) for choice in choices]
+    return [answer_text]
+
+
+def choice_counts(
+    counts: Iterable[Tuple[str, int]],
+    options: Sequence[str],
+    multiple: bool
+) -> Dict[str, int]:
+    """Respondents per option: every option of the question, in the question's
+    order, then any other answer given"""
+    distribution = dict.fromkeys(options, 0)
+    for answer_text, count in counts:
+        for choice in (split_choices(answer_text) if multiple else [answer_text]):
+            distribution[choice] = distribution.get(choice, 0) + count
+    return distribution
+
+
+def scale_summaries(rows: Sequence[Tuple[int, float, int]]) -> Dict[int, dict]:
+    """Mean, min, max and nearest-rank percentiles per question from
+    (question id, value, respondents) rows, one row per distinct value.
+
+    The database has already grouped the answers, so this loops over a few
+    hundred rows at most, not over the answers themselves.
+    """
+    by_question: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+    for question_id, value, count in rows:
+        by_question[question_id].append((value, count))
+
+    summaries = {}
+    for question_id, pairs in by_question.items():
+        pairs.sort()
+        total = sum(count for _, count in pairs)
+        percentiles = {}
+        for p in PERCENTILES:
+            rank = max(math.ceil(total * p / 100), 1)
+            seen = 0
+            for value, count in pairs:
+                seen += count
+                if seen >= rank:
+                    percentiles[f"p{p}"] = value
+                    break
+        summaries[question_id] = {
+            "mean": sum(value * count for value, count in pairs) / total,
+            "min": pairs[0][0],
+            "max": pairs[-1][0],
+            "percentiles": percentiles
+        }
+    return summaries
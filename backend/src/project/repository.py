@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from fastapi import Depends
+from sqlalchemy import ColumnElement, Row, select, update, delete, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from src.auth.schemas import CurrentUser, Role
+from src.auth.service import AuthService
+from src.project.models import Project
+
+projects = Project.__table__
+
+
+class VersionConflictError(Exception):
+    """The row changed since the version the caller based its write on"""
+
+    def __init__(self, message: str, current_version: int | None = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
+class ProjectScope:
+    """Which projects a user may act on, expressed as a SQL predicate"""
+
+    FULL_ACCESS_ROLES = (Role.admin, Role.superadmin)
+    # may find and read every project (search), but change only their own
+    READ_ACCESS_ROLES = FULL_ACCESS_ROLES + (Role.teacher,)
+
+    def __init__(self, user_id: int, role: Role):
+        self.user_id = user_id
+        self.role = role
+
+    @classmethod
+    def for_user(cls, user: CurrentUser) -> "ProjectScope":
+        return cls(user.id, user.role)
+
+    def allows(self) -> ColumnElement[bool]:
+        if self.role in self.FULL_ACCESS_ROLES:
+            return true()
+        return Project.user_id == self.user_id
+
+    def reads(self) -> ColumnElement[bool]:
+        if self.role in self.READ_ACCESS_ROLES:
+            return true()
+        return Project.user_id == self.user_id
+
+
+async def get_project_scope(
+    current_user: CurrentUser = Depends(AuthService.get_current_active_user)
+) -> ProjectScope:
+    return ProjectScope.for_user(current_user)
+
+
+class ProjectRepository:
+    """Project reads and writes with ownership checked inside the statement.
+
+    Every method is a single round trip; only a conflicting update takes a
+    second one. Not found is reported as None and a row outside the scope
+    raises PermissionError, like the service layer.
+    """
+
+    def __init__(self, db: AsyncSession, scope: ProjectScope):
+        self.db = db
+        self.scope = scope
+
+    def _target(self, project_id: int):
+        return (
+            select(
+                projects.c.id,
+                projects.c.version,
+                self.scope.allows().label("allowed")
+            )
+            .where(projects.c.id == project_id, projects.c.deleted_at.is_(None))
+            .cte("target")
+        )
+
+    @staticmethod
+    def _check(row: Optional[Row], action: str) -> bool:
+        if row is None:
+            return False
+        if not row.allowed:
+            raise PermissionError(f"Not authorized to {action} this project")
+        return True
+
+    async def get(self, project_id: int) -> Optional[Project]:
+        result = await self.db.execute(
+            select(Project, self.scope.allows().label("allowed"))
+            .where(Project.id == project_id, Project.deleted_at.is_(None))
+        )
+        row = result.first()
+        return row.Project if self._check(row, "view") else None
+
+    async def get_version(self, project_id: int) -> Optional[Row]:
+        """Version and modification time, served from ix_projects_version"""
+        result = await self.db.execute(
+            select(Project.version, Project.updated_at)
+            .where(Project.id == project_id, Project.deleted_at.is_(None), self.scope.allows())
+        )
+        return result.first()
+
+    async def update(
+        self,
+        project_id: int,
+        values: Dict[str, Any],
+        expected_version: int | None = None
+    ) -> Optional[Project]:
+        """Compare-and-swap update: with expected_version set, a row that has
+        moved on raises VersionConflictError instead of being overwritten."""
+        target = self._target(project_id)
+        conditions = [projects.c.id == target.c.id, target.c.allowed]
+        if expected_version is not None:
+            conditions.append(projects.c.version == expected_version)
+
+        updated = (
+            update(projects)
+            .where(*conditions)
+            .values(
+                **values,
+                version=projects.c.version + 1,
+                updated_at=datetime.utcnow()
+            )
+            .returning(*projects.c)
+            .cte("updated")
+        )
+        updated_project = aliased(Project, updated)
+        result = await self.db.execute(
+            select(updated_project, target.c.allowed)
+            .select_from(target)
+            .outerjoin(updated_project, updated_project.id == target.c.id)
+            .execution_options(populate_existing=True)
+        )
+        row = result.first()
+        if not self._check(row, "update"):
+            return None
+        if row[0] is None:
+            # the statement's own snapshot may predate the write that beat us;
+            # a fresh read gives the client a version it can retry with
+            current = await self.get_version(project_id)
+            if current is None:
+                return None
+            raise VersionConflictError(
+                "Project was modified by another request",
+                current_version=current.version
+            )
+        return row[0]
+
+    async def delete(self, project_id: int) -> bool:
+        target = self._target(project_id)
+        deleted = (
+            delete(projects)
+            .where(projects.c.id == target.c.id, target.c.allowed)
+            .returning(projects.c.id)
+            .cte("deleted")
+        )
+        result = await self.db.execute(
+            select(target.c.allowed, deleted.c.id)
+            .select_from(target)
+            .outerjoin(deleted, deleted.c.id == target.c.id)
+        )
+        return self._check(result.first(), "delete")
+
+    async def soft_delete(self, project_id: int) -> bool:
+        """Hide the project from every read now; its rows are purged later"""
+        target = self._target(project_id)
+        deleted = (
+            update(projects)
+            .where(projects.c.id == target.c.id, target.c.allowed)
+            .values(deleted_at=datetime.utcnow())
+            .returning(projects.c.id)
+            .cte("deleted")
+        )
+        result = await self.db.execute(
+            select(target.c.allowed, deleted.c.id)
+            .select_from(target)
+            .outerjoin(deleted, deleted.c.id == target.c.id)
+        )
+        return self._check(result.first(), "delete")
@@ -1,28 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
 from src.project.service import (
     create_project,
     get_project,
+    get_project_version,
     get_projects,
+    get_project_rows,
+    project_rows_query,
     update_project,
     delete_project
 )
 from src.project.schemas import ProjectCreate, ProjectResponse
+from src.project.repository import ProjectScope, VersionConflictError, get_project_scope
 from src.db.database import get_async_session
+from src.db.unit_of_work import UnitOfWorkRoute, get_unit_of_work
+from src.core.fast_json import FastJSONResponse
+from src.core.conditional import (
+    make_etag,
+    has_conditional_headers,
+    is_not_modified,
+    if_match_version,
+    not_modified_response,
+    set_validators
+)
+from src.core.streaming import StreamFormat, streaming_response
 from src.auth.models import User
 from src.auth.service import AuthService
 
-project_router = APIRouter(prefix="/projects", tags=["projects"])
+project_router = APIRouter(prefix="/projects", tags=["projects"], route_class=UnitOfWorkRoute)
 
 @project_router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_project(
     project: ProjectCreate,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
     try:
         return await create_project(db, project, current_user.id)
+    except DBAPIError:
+        # UnitOfWorkRoute retries serialization failures and deadlocks
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,59 +52,92 @@ async def create_new_project(
 async def read_projects(
     skip: int = 0,
     limit: int = 100,
+    fast: bool = False,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
+    if stream:
+        return streaming_response(project_rows_query(current_user.id, skip, limit), stream)
+    if fast:
+        return FastJSONResponse(await get_project_rows(db, current_user.id, skip, limit))
     return await get_projects(db, current_user.id, skip, limit)
 
 @project_router.get("/{project_id}", response_model=ProjectResponse)
 async def read_single_project(
     project_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    scope: ProjectScope = Depends(get_project_scope)
 ):
-    project = await get_project(db, project_id)
+    if has_conditional_headers(request):
+        version = await get_project_version(db, project_id, scope)
+        if version:
+            etag = make_etag("project", project_id, version.version)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+
+    try:
+        project = await get_project(db, project_id, scope)
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
-    if project.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view this project"
-        )
+    set_validators(response, make_etag("project", project.id, project.version), project.updated_at)
     return project
 
 @project_router.put("/{project_id}", response_model=ProjectResponse)
 async def update_existing_project(
     project_id: int,
     project: ProjectCreate,
-    db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
 ):
     try:
-        db_project = await update_project(db, project_id, project, current_user.id)
+        db_project = await update_project(
+            db,
+            project_id,
+            project,
+            scope,
+            expected_version=if_match_version(request)
+        )
         if not db_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
+        set_validators(response, make_etag("project", db_project.id, db_project.version), db_project.updated_at)
         return db_project
     except PermissionError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=str(e)
         )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"ETag": make_etag("project", project_id, e.current_version)}
+        )
 
 @project_router.delete("/{project_id}")
 async def remove_project(
     project_id: int,
-    db: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(AuthService.get_current_active_user)
+    background: bool = Query(False, description="Hide the project now and purge its research data in the background"),
+    db: AsyncSession = Depends(get_unit_of_work),
+    scope: ProjectScope = Depends(get_project_scope)
 ):
     try:
-        success = await delete_project(db, project_id, current_user.id)
+        success = await delete_project(db, project_id, scope, background=background)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,8 +1,16 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, Row, delete
 from sqlalchemy.future import select
+from src.core.cache import invalidate
+from src.core.config import settings
+from src.core.fast_json import schema_columns, rows_to_dicts
+from src.db.database import async_session_factory
+from src.jobs.service import enqueue
 from src.project.models import Project
-from src.project.schemas import ProjectCreate, STAGE_MAPPING
+from src.project.project_research.models import ResearchProject, ResearchAnswer
+from src.project.repository import ProjectRepository, ProjectScope
+from src.project.schemas import ProjectCreate, ProjectResponse, STAGE_MAPPING
 
 async def create_project(db: AsyncSession, project: ProjectCreate, user_id: int,accelerator_id: Optional[int] = None) -> Project:
     db_project = Project(
@@ -14,44 +22,98 @@ async def create_project(db: AsyncSession, project: ProjectCreate, user_id: int,
         accelerator_id=accelerator_id
     )
     db.add(db_project)
-    await db.commit()
-    await db.refresh(db_project)
+    await db.flush()
     return db_project
 
-async def get_project(db: AsyncSession, project_id: int) -> Optional[Project]:
-    result = await db.execute(select(Project).filter(Project.id == project_id))
-    return result.scalars().first()
+async def get_project(db: AsyncSession, project_id: int, scope: ProjectScope) -> Optional[Project]:
+    return await ProjectRepository(db, scope).get(project_id)
+
+async def get_project_version(db: AsyncSession, project_id: int, scope: ProjectScope) -> Optional[Row]:
+    return await ProjectRepository(db, scope).get_version(project_id)
 
 async def get_projects(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
     result = await db.execute(
         select(Project)
-        .where(Project.user_id == user_id)
+        .where(Project.user_id == user_id, Project.deleted_at.is_(None))
         .offset(skip)
         .limit(limit)
     )
     return result.scalars().all()
 
-async def update_project(db: AsyncSession, project_id: int, project: ProjectCreate,user_id: int) -> Optional[Project]:
-    db_project = await get_project(db, project_id)
-    if not db_project:
-        return None
-    if db_project.user_id != user_id:
-        raise PermissionError("Not authorized to update this project")
-    
-    for field, value in project.model_dump().items():
-        setattr(db_project, field, value)
-    
-    await db.commit()
-    await db.refresh(db_project)
-    return db_project
+def project_rows_query(user_id: int, skip: int = 0, limit: int = 100) -> Select:
+    return (
+        select(*schema_columns(Project, ProjectResponse))
+        .where(Project.user_id == user_id, Project.deleted_at.is_(None))
+        .offset(skip)
+        .limit(limit)
+    )
+
+async def get_project_rows(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    result = await db.execute(project_rows_query(user_id, skip, limit))
+    return rows_to_dicts(result)
 
-async def delete_project(db: AsyncSession, project_id: int, user_id: int) -> bool:
-    db_project = await get_project(db, project_id)
-    if not db_project:
+async def update_project(
+    db: AsyncSession,
+    project_id: int,
+    project: ProjectCreate,
+    scope: ProjectScope,
+    expected_version: Optional[int] = None
+) -> Optional[Project]:
+    values = project.model_dump()
+    values["stage"] = project.stage or STAGE_MAPPING[project.type][0]
+
+    return await ProjectRepository(db, scope).update(project_id, values, expected_version)
+
+async def delete_project(
+    db: AsyncSession,
+    project_id: int,
+    scope: ProjectScope,
+    background: bool = False
+) -> bool:
+    """Delete a project and, through ON DELETE CASCADE, its research data.
+
+    With `background` the project is only marked deleted, which takes the
+    same time however many answers it has, and a job purges it in batches.
+    """
+    repository = ProjectRepository(db, scope)
+    if background:
+        if not await repository.soft_delete(project_id):
+            return False
+        await enqueue(db, "purge_project", {"project_id": project_id})
+    elif not await repository.delete(project_id):
         return False
-    if db_project.user_id != user_id:
-        raise PermissionError("Not authorized to delete this project")
-    
-    await db.delete(db_project)
-    await db.commit()
-    return True
\ No newline at end of file
+    await invalidate(db, "answer_statistics")
+    return True
+
+async def purge_deleted_project(
+    project_id: int,
+    batch_size: int = settings.PURGE_BATCH_SIZE
+) -> int:
+    """Remove a soft-deleted project's answers batch by batch, each batch in
+    its own short transaction, then the project itself. Returns answers removed."""
+    research_project_ids = (
+        select(ResearchProject.id)
+        .where(ResearchProject.project_id == project_id)
+        .scalar_subquery()
+    )
+    purged = 0
+    async with async_session_factory() as db:
+        while True:
+            batch = (
+                select(ResearchAnswer.id)
+                .where(ResearchAnswer.research_project_id.in_(research_project_ids))
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(ResearchAnswer).where(ResearchAnswer.id.in_(batch)))
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                break
+        # only a handful of rows left for the cascade
+        await db.execute(
+            delete(Project).where(Project.id == project_id, Project.deleted_at.is_not(None))
+        )
+        await invalidate(db, "answer_statistics")
+        await db.commit()
+    return purged
\ No newline at end of file
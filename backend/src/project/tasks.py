@@ -0,0 +1,12 @@
+import logging
+from typing import Any, Dict
+from src.jobs.service import job_handler
+from src.project.service import purge_deleted_project
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler("purge_project")
+async def purge_project(payload: Dict[str, Any]):
+    purged = await purge_deleted_project(payload["project_id"])
+    logger.info("Purged project %s", payload["project_id"], extra={"answers": purged})
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import get_async_session
+from src.project.repository import ProjectScope, get_project_scope
+from src.accelerator.service import resolve_accelerator_id
+from src.search.schemas import SearchResults
+from src.search.service import search
+
+search_router = APIRouter(prefix="/search", tags=["search"])
+
+@search_router.get("/", response_model=SearchResults)
+async def search_endpoint(
+    q: str = Query(..., min_length=2, max_length=200, description='Words, "phrases", -excluded, or'),
+    accelerator: str | None = Query(None, description="Accelerator id or slug; all accelerators if omitted"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_session),
+    scope: ProjectScope = Depends(get_project_scope)
+):
+    """Full-text search over projects and research answers, Russian and English.
+
+    Staff find every project, students only their own.
+    """
+    accelerator_id = None
+    if accelerator is not None:
+        accelerator_id = await resolve_accelerator_id(db, accelerator)
+        if accelerator_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Accelerator not found"
+            )
+    return await search(db, q, scope, accelerator_id, limit)
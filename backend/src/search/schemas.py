@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List
+from src.project.schemas import ProjectType
+
+class ProjectHit(BaseModel):
+    id: int
+    name: str
+    type: ProjectType
+    stage: str
+    accelerator_id: int | None = None
+    rank: float
+    # HTML-escaped, matches wrapped in <mark>
+    snippet: str
+
+class AnswerHit(BaseModel):
+    id: int
+    project_id: int
+    project_name: str
+    question_id: int
+    question_text: str
+    rank: float
+    snippet: str
+
+class SearchResults(BaseModel):
+    query: str
+    projects: List[ProjectHit] = []
+    answers: List[AnswerHit] = []
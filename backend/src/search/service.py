@@ -0,0 +1,167 @@
+import html
+from typing import List, Optional
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.project.models import Project
+from src.project.repository import ProjectScope
+from src.project.project_research.models import ResearchProject, ResearchQuestion, ResearchAnswer
+from src.search.schemas import ProjectHit, AnswerHit, SearchResults
+
+# Must match the configuration the search_vector columns are built with
+# (revision 4d8c1a6e2f97): it stems Cyrillic words as Russian and Latin
+# ones as English, so one index serves both languages.
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
+
+# ts_headline marks matches with control characters; the snippet is escaped
+# before they become <mark> tags, so answer text can never inject markup
+MATCH_START, MATCH_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{MATCH_START}", StopSel="{MATCH_STOP}", '
+    'MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def highlight(headline: str) -> str:
+    return (
+        html.escape(headline)
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_STOP, "</mark>")
+    )
+
+
+def _tsquery(query: str):
+    # accepts what people type into a search box: "quoted phrases", -excluded, or
+    return func.websearch_to_tsquery(SEARCH_CONFIG, query)
+
+
+async def search_projects(
+    db: AsyncSession,
+    query: str,
+    scope: ProjectScope,
+    accelerator_id: Optional[int] = None,
+    limit: int = 20
+) -> List[ProjectHit]:
+    tsquery = _tsquery(query)
+    ranked = (
+        select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.type,
+            Project.stage,
+            Project.accelerator_id,
+            func.ts_rank_cd(Project.search_vector, tsquery).label("rank")
+        )
+        .where(
+            Project.search_vector.bool_op("@@")(tsquery),
+            Project.deleted_at.is_(None),
+            scope.reads()
+        )
+    )
+    if accelerator_id is not None:
+        ranked = ranked.where(Project.accelerator_id == accelerator_id)
+    ranked = ranked.order_by(literal_column("rank").desc(), Project.id).limit(limit).subquery()
+
+    # headlines are expensive; only the page being returned gets them
+    result = await db.execute(
+        select(
+            ranked.c.id,
+            ranked.c.name,
+            ranked.c.type,
+            ranked.c.stage,
+            ranked.c.accelerator_id,
+            ranked.c.rank,
+            func.ts_headline(
+                SEARCH_CONFIG,
+                func.coalesce(ranked.c.description, ranked.c.name),
+                tsquery,
+                HEADLINE_OPTIONS
+            ).label("headline")
+        )
+        .order_by(ranked.c.rank.desc(), ranked.c.id)
+    )
+    return [
+        ProjectHit(
+            id=row.id,
+            name=row.name,
+            type=row.type,
+            stage=row.stage,
+            accelerator_id=row.accelerator_id,
+            rank=row.rank,
+            snippet=highlight(row.headline)
+        )
+        for row in result
+    ]
+
+
+async def search_answers(
+    db: AsyncSession,
+    query: str,
+    scope: ProjectScope,
+    accelerator_id: Optional[int] = None,
+    limit: int = 20
+) -> List[AnswerHit]:
+    tsquery = _tsquery(query)
+    ranked = (
+        select(
+            ResearchAnswer.id,
+            ResearchAnswer.answer_text,
+            ResearchAnswer.question_id,
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            func.ts_rank_cd(ResearchAnswer.search_vector, tsquery).label("rank")
+        )
+        .join(ResearchProject, ResearchProject.id == ResearchAnswer.research_project_id)
+        .join(Project, Project.id == ResearchProject.project_id)
+        .where(
+            ResearchAnswer.search_vector.bool_op("@@")(tsquery),
+            Project.deleted_at.is_(None),
+            scope.reads()
+        )
+    )
+    if accelerator_id is not None:
+        # on the answers' own column, so a partitioned table scans one partition
+        ranked = ranked.where(ResearchAnswer.accelerator_id == accelerator_id)
+    ranked = ranked.order_by(literal_column("rank").desc(), ResearchAnswer.id).limit(limit).subquery()
+
+    result = await db.execute(
+        select(
+            ranked.c.id,
+            ranked.c.project_id,
+            ranked.c.project_name,
+            ranked.c.question_id,
+            ResearchQuestion.question_text,
+            ranked.c.rank,
+            func.ts_headline(SEARCH_CONFIG, ranked.c.answer_text, tsquery, HEADLINE_OPTIONS).label("headline")
+        )
+        .join(ResearchQuestion, ResearchQuestion.id == ranked.c.question_id)
+        .order_by(ranked.c.rank.desc(), ranked.c.id)
+    )
+    return [
+        AnswerHit(
+            id=row.id,
+            project_id=row.project_id,
+            project_name=row.project_name,
+            question_id=row.question_id,
+            question_text=row.question_text,
+            rank=row.rank,
+            snippet=highlight(row.headline)
+        )
+        for row in result
+    ]
+
+
+async def search(
+    db: AsyncSession,
+    query: str,
+    scope: ProjectScope,
+    accelerator_id: Optional[int] = None,
+    limit: int = 20
+) -> SearchResults:
+    """Projects by name and description and research answers by text, each
+    ranked separately, limited to what the scope may read"""
+    return SearchResults(
+        query=query,
+        projects=await search_projects(db, query, scope, accelerator_id, limit),
+        answers=await search_answers(db, query, scope, accelerator_id, limit)
+    )
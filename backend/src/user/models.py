@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from datetime import datetime
 from src.db.database import Base
 
@@ -17,10 +17,20 @@ class UserInfo(Base):
         default=datetime.utcnow, 
         onupdate=datetime.utcnow
     )
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), 
         unique=True, 
         index=True
     )
-    user: Mapped["User"] = relationship("User", back_populates="profile")
\ No newline at end of file
+    user: Mapped["User"] = relationship("User", back_populates="profile")
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index(
+            "ix_user_info_version",
+            "user_id",
+            postgresql_include=["id", "version", "updated_at"]
+        ),
+    )
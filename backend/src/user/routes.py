@@ -1,36 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.user.service import (
     get_user_info_by_user_id, 
+    get_profile_version,
     update_or_create_profile,
     delete_user_profile
 )
 from .schemas import UserInfoCreate, UserInfoResponse, UserInfoUpdate
 from src.db.database import get_async_session
+from src.db.unit_of_work import UnitOfWorkRoute, get_unit_of_work
+from src.core.conditional import (
+    make_etag,
+    has_conditional_headers,
+    is_not_modified,
+    not_modified_response,
+    set_validators
+)
 from src.auth.service import AuthService
 from src.auth.models import User
 
-user_router = APIRouter(prefix="/profile", tags=["User Profile"])
+user_router = APIRouter(prefix="/profile", tags=["User Profile"], route_class=UnitOfWorkRoute)
 
 @user_router.get("/", response_model=UserInfoResponse)
 async def get_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(AuthService.get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
 ):
     """Получить профиль текущего пользователя"""
+    if has_conditional_headers(request):
+        version = await get_profile_version(db, current_user.id)
+        if version:
+            etag = make_etag("profile", version.id, version.version)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+
     profile = await get_user_info_by_user_id(db, current_user.id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
+    set_validators(response, make_etag("profile", profile.id, profile.version), profile.updated_at)
     return profile
 
 @user_router.post("/", response_model=UserInfoResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile_data: UserInfoCreate,
     current_user: User = Depends(AuthService.get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_unit_of_work)
 ):
     """Создать профиль пользователя"""
     existing_profile = await get_user_info_by_user_id(db, current_user.id)
@@ -45,7 +64,7 @@ async def create_profile(
 async def update_profile(
     profile_data: UserInfoUpdate,
     current_user: User = Depends(AuthService.get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_unit_of_work)
 ):
     """Полное обновление профиля"""
     return await update_or_create_profile(db, current_user.id, profile_data)
@@ -54,7 +73,7 @@ async def update_profile(
 async def partial_update_profile(
     profile_data: UserInfoUpdate,
     current_user: User = Depends(AuthService.get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_unit_of_work)
 ):
     """Частичное обновление профиля"""
     return await update_or_create_profile(db, current_user.id, profile_data)
@@ -62,7 +81,7 @@ async def partial_update_profile(
 @user_router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_profile(
     current_user: User = Depends(AuthService.get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_unit_of_work)
 ):
     """Удалить профиль пользователя"""
     await delete_user_profile(db, current_user.id)
\ No newline at end of file
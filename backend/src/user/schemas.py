@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator, ConfigDict
-import phonenumbers
 from datetime import datetime
+from src.core.normalization import normalize_phone
 
 
 class UserInfoBase(BaseModel):
@@ -14,16 +14,7 @@ class UserInfoBase(BaseModel):
     def validate_phone(cls, v):
         if not v:
             return v
-        try:
-            parsed = phonenumbers.parse(v, None)
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValueError("Invalid phone number")
-            return phonenumbers.format_number(
-                parsed,
-                phonenumbers.PhoneNumberFormat.E164
-            )
-        except phonenumbers.NumberParseException:
-            raise ValueError("Phone number must be in international format (+XXX...)")
+        return normalize_phone(v)
 
 class UserInfoCreate(UserInfoBase):
     pass
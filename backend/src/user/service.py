@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, Row
 from src.user.models import UserInfo
 from src.user.schemas import UserInfoCreate, UserInfoUpdate
 from fastapi import HTTPException, status
@@ -15,6 +15,17 @@ async def get_user_info_by_user_id(
     )
     return result.scalars().first()
 
+async def get_profile_version(
+    db: AsyncSession,
+    user_id: int
+) -> Row | None:
+    """Версия профиля из индекса ix_user_info_version без загрузки строки"""
+    result = await db.execute(
+        select(UserInfo.id, UserInfo.version, UserInfo.updated_at)
+        .where(UserInfo.user_id == user_id)
+    )
+    return result.first()
+
 async def update_or_create_profile(
     db: AsyncSession,
     user_id: int,
@@ -40,8 +51,7 @@ async def update_or_create_profile(
         )
     
     db.add(existing_profile)
-    await db.commit()
-    await db.refresh(existing_profile)
+    await db.flush()
     return existing_profile
 
 async def delete_user_profile(
@@ -57,5 +67,4 @@ async def delete_user_profile(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
-        )
-    await db.commit()
\ No newline at end of file
+        )
\ No newline at end of file
@@ -0,0 +1,63 @@
+import pytest
+from src.auth.schemas import Role
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def admin(client, make_user):
+    _, headers = make_user(Role.admin)
+    for university in ("MIPT", "MIPT (Dolgoprudny)", "ITMO", "HSE"):
+        assert client.post("/accelerators/", json={"university": university}, headers=headers).status_code == 201
+    return headers
+
+
+def add_projects(client, sql, headers, accelerator_slug: str, count: int):
+    for n in range(count):
+        project = client.post("/projects/", json={"name": f"{accelerator_slug} {n}", "type": "research"},
+                              headers=headers).json()
+        sql("UPDATE projects SET accelerator_id = (SELECT id FROM accelerators WHERE slug = :slug) WHERE id = :id",
+            slug=accelerator_slug, id=project["id"])
+
+
+def projects_by_accelerator(sql) -> dict:
+    return dict(sql("SELECT a.slug, count(p.id) FROM accelerators a "
+                    "LEFT JOIN projects p ON p.accelerator_id = a.id GROUP BY a.slug"))
+
+
+def test_bulk_status_counts_only_changed_rows(client, admin):
+    client.post("/accelerators/bulk/status", json={"universities": ["HSE"], "is_active": False}, headers=admin)
+    response = client.post("/accelerators/bulk/status", headers=admin,
+                           json={"universities": ["  mipt ", "ITMO", "HSE", "Unknown"], "is_active": False})
+    assert response.json() == {"accelerators_updated": 2, "accelerators_removed": 0, "projects_moved": 0}
+
+
+def test_reassign_moves_every_project(client, sql, admin):
+    add_projects(client, sql, admin, "itmo", 3)
+    response = client.post("/accelerators/bulk/reassign", json={"source": "ITMO", "target": "hse"}, headers=admin)
+    assert response.json()["projects_moved"] == 3
+    assert projects_by_accelerator(sql)["hse"] == 3
+    assert sql("SELECT DISTINCT version FROM projects") == [(2,)]
+
+    missing = client.post("/accelerators/bulk/reassign", json={"source": "nowhere", "target": "hse"}, headers=admin)
+    assert missing.status_code == 404
+
+
+def test_reassign_to_itself_changes_nothing(client, sql, admin):
+    add_projects(client, sql, admin, "hse", 2)
+    response = client.post("/accelerators/bulk/reassign", json={"source": "HSE", "target": "hse"}, headers=admin)
+    assert response.json()["projects_moved"] == 0
+    assert sql("SELECT DISTINCT version FROM projects") == [(1,)]
+
+
+def test_merge_folds_duplicates_into_the_target(client, sql, admin):
+    add_projects(client, sql, admin, "mipt", 1)
+    add_projects(client, sql, admin, "mipt-dolgoprudny", 2)
+    response = client.post("/accelerators/bulk/merge", headers=admin,
+                           json={"target": "MIPT", "duplicates": ["MIPT (Dolgoprudny)", "mipt"]})
+    assert response.json() == {"accelerators_updated": 0, "accelerators_removed": 1, "projects_moved": 2}
+    assert projects_by_accelerator(sql) == {"mipt": 3, "itmo": 0, "hse": 0}
+    assert client.get("/accelerators/mipt-dolgoprudny", headers=admin).status_code == 404
+
+    missing = client.post("/accelerators/bulk/merge", json={"target": "nowhere", "duplicates": ["hse"]}, headers=admin)
+    assert missing.status_code == 404
@@ -0,0 +1,46 @@
+import pytest
+from src.accelerator.service import resolve_accelerator_id
+from src.auth.schemas import Role
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("ref", ["1", "42", "999999999", "1000000000", "2147483647"])
+async def test_numeric_refs_are_ids_without_a_lookup(ref):
+    assert await resolve_accelerator_id(None, ref) == int(ref)
+
+
+@pytest.mark.postgres
+def test_accelerators_resolve_by_id_slug_or_name(client, make_user):
+    _, admin = make_user(Role.admin)
+    created = client.post("/accelerators/", json={"university": "МГУ им. Ломоносова"}, headers=admin).json()
+    assert created["slug"] == "мгу-им-ломоносова"
+    for ref in (str(created["id"]), created["slug"], "МГУ им. Ломоносова"):
+        assert client.get(f"/accelerators/{ref}", headers=admin).json()["id"] == created["id"]
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("ref", ["²", "٣", "2147483648", "9999999999", "99999999999999999999", "0"])
+def test_odd_refs_are_not_found_not_errors(client, make_user, ref):
+    _, admin = make_user(Role.admin)
+    assert client.get(f"/accelerators/{ref}", headers=admin).status_code == 404
+
+
+@pytest.mark.postgres
+def test_ten_digit_ids_resolve(client, make_user, sql):
+    _, admin = make_user(Role.admin)
+    sql("INSERT INTO accelerators (id, university, slug, is_active, created_at, updated_at) "
+        "VALUES (2147483647, 'MIPT', 'mipt', true, now(), now())")
+    assert client.get("/accelerators/2147483647", headers=admin).json()["slug"] == "mipt"
+
+
+@pytest.mark.postgres
+def test_rename_moves_the_slug(client, make_user):
+    _, admin = make_user(Role.admin)
+    client.post("/accelerators/", json={"university": "ITMO"}, headers=admin)
+    assert client.get("/accelerators/itmo", headers=admin).status_code == 200
+    renamed = client.put("/accelerators/itmo", json={"university": "ITMO University"}, headers=admin).json()
+    assert renamed["slug"] == "itmo-university"
+    assert client.get("/accelerators/itmo", headers=admin).status_code == 404
+    assert client.get("/accelerators/itmo-university", headers=admin).status_code == 200
+    duplicate = client.post("/accelerators/", json={"university": "itmo  university"}, headers=admin)
+    assert duplicate.status_code == 400
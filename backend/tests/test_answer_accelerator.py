@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+from src.accelerator.models import Accelerator
+from src.auth.models import User
+from src.auth.schemas import Role
+from src.project.models import Project
+from src.project.project_research.models import ResearchAnswer
+from src.project.project_research.schemas import ResearchAnswerCreate
+from src.project.project_research.service import create_research_project, save_research_answers
+
+pytestmark = [pytest.mark.postgres, pytest.mark.anyio]
+
+
+async def setup(factory):
+    """A research project filed under MIPT, and the id of HSE"""
+    async with factory() as session:
+        mipt, hse = Accelerator(university="MIPT", slug="mipt"), Accelerator(university="HSE", slug="hse")
+        user = User(email="ada@example.com", hashed_password="x", role=Role.student)
+        session.add_all([mipt, hse, user])
+        await session.flush()
+        project = Project(name="Kiln", type="research", stage="planning", user_id=user.id, accelerator_id=mipt.id)
+        session.add(project)
+        await session.flush()
+        research = await create_research_project(session, project.id)
+        await session.commit()
+        return project.id, research.id, hse.id
+
+
+async def save(session, research_id: int, questions):
+    await save_research_answers(session, research_id, [
+        ResearchAnswerCreate(question_id=questions["planning.stage_1.goal"], answer_text="Dry timber"),
+    ])
+
+
+def reassign(project_id: int, accelerator_id: int):
+    return update(Project).where(Project.id == project_id).values(accelerator_id=accelerator_id)
+
+
+async def answer_accelerators(factory) -> set:
+    async with factory() as session:
+        return set((await session.execute(select(ResearchAnswer.accelerator_id))).scalars())
+
+
+async def test_reassign_waits_for_answers_being_saved(postgres, questions):
+    project_id, research_id, hse = await setup(postgres)
+    async with postgres() as saving, postgres() as moving:
+        await save(saving, research_id, questions)
+        move = asyncio.create_task(moving.execute(reassign(project_id, hse)))
+        await asyncio.sleep(0.2)
+        assert not move.done()  # held off by FOR SHARE
+        await saving.commit()
+        await asyncio.wait_for(move, timeout=5)
+        await moving.commit()
+    # the reassign's trigger moved the answers saved before it
+    assert await answer_accelerators(postgres) == {hse}
+
+
+async def test_answers_saved_during_a_reassign_take_the_new_accelerator(postgres, questions):
+    project_id, research_id, hse = await setup(postgres)
+    async with postgres() as moving, postgres() as saving:
+        await moving.execute(reassign(project_id, hse))
+        filing = asyncio.create_task(save(saving, research_id, questions))
+        await asyncio.sleep(0.2)
+        assert not filing.done()
+        await moving.commit()
+        await asyncio.wait_for(filing, timeout=5)
+        await saving.commit()
+    assert await answer_accelerators(postgres) == {hse}
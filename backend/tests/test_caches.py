@@ -0,0 +1,46 @@
+import pytest
+from src.accelerator.schemas import AcceleratorInDB
+from src.accelerator.service import accelerator_cache
+from src.auth.schemas import CurrentUser, Role
+from src.auth.service import user_cache
+from src.project.project_research.schemas import ResearchQuestionResponse
+from src.project.project_research.service import question_cache
+
+pytestmark = pytest.mark.postgres
+
+
+def test_current_user_is_cached_as_a_detached_snapshot(client, make_user):
+    user_id, headers = make_user(Role.student, email="ada@example.com")
+    assert client.get("/projects/", headers=headers).status_code == 200
+
+    cached = user_cache.get("ada@example.com")
+    assert cached == CurrentUser(id=user_id, email="ada@example.com", role=Role.student, disabled=False)
+    with pytest.raises(Exception):
+        cached.role = Role.admin
+
+    # a failed request rolls its session back; the cached user must survive it
+    assert client.put("/projects/999999", json={"name": "x", "type": "research"}, headers=headers).status_code == 404
+    assert client.get("/projects/", headers=headers).status_code == 200
+
+
+def test_accelerator_search_caches_schemas(client, make_user, sql):
+    _, headers = make_user(Role.student)
+    sql("INSERT INTO accelerators (university, slug, is_active, created_at, updated_at) "
+        "VALUES ('MIPT', 'mipt', true, now(), now())")
+    first = client.get("/accelerators/", headers=headers).json()
+
+    cached = accelerator_cache.get(("schemas", None, 0, 100, True))
+    assert [type(item) for item in cached] == [AcceleratorInDB]
+    assert client.get("/accelerators/", headers=headers).json() == first
+
+
+def test_stage_questions_are_cached_as_schemas(client, make_user, questions):
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    url = f"/projects/{project['id']}/research/questions/planning/stage_1"
+    first = client.get(url, headers=headers).json()
+    assert [question["id"] for question in first] == [
+        questions["planning.stage_1.goal"], questions["planning.stage_1.score"], questions["planning.stage_1.method"]
+    ]
+    assert {type(item) for item in question_cache.get(("planning", "stage_1"))} == {ResearchQuestionResponse}
+    assert client.get(url, headers=headers).json() == first
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from src.auth.schemas import Role
+from src.project.repository import ProjectRepository, ProjectScope, VersionConflictError
+from tests.conftest import run
+
+pytestmark = pytest.mark.postgres
+
+KILN = {"name": "Kiln", "type": "research"}
+
+
+@pytest.fixture
+def project(client, make_user):
+    user_id, headers = make_user(Role.student)
+    response = client.post("/projects/", json=KILN, headers=headers)
+    return response.json()["id"], user_id, headers
+
+
+def test_if_match_guards_project_updates(client, project):
+    project_id, _, headers = project
+    url = f"/projects/{project_id}"
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    updated = client.put(url, json={**KILN, "name": "Kiln 2"}, headers={**headers, "If-Match": etag})
+    assert updated.status_code == 200 and updated.headers["ETag"] == f'"project-{project_id}-v2"'
+
+    stale = client.put(url, json={**KILN, "name": "Kiln 3"}, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 409
+    assert stale.headers["ETag"] == updated.headers["ETag"]
+    assert client.get(url, headers=headers).json()["name"] == "Kiln 2"
+
+    assert client.put(url, json=KILN, headers={**headers, "If-Match": "v2"}).status_code == 400
+    assert client.put(url, json=KILN, headers={**headers, "If-Match": "*"}).status_code == 200
+
+
+def test_only_one_of_two_racing_updates_wins(postgres, project):
+    project_id, user_id, _ = project
+    scope = ProjectScope(user_id, Role.student)
+
+    async def race():
+        async with postgres() as first, postgres() as second:
+            await ProjectRepository(first, scope).update(project_id, {"name": "first"}, expected_version=1)
+            # blocks on the row lock, then re-checks the version once first commits
+            loser = asyncio.create_task(
+                ProjectRepository(second, scope).update(project_id, {"name": "second"}, expected_version=1)
+            )
+            await asyncio.sleep(0.2)
+            assert not loser.done()
+            await first.commit()
+            with pytest.raises(VersionConflictError) as conflict:
+                await loser
+            # the version first committed, not the one the loser's statement started from
+            assert conflict.value.current_version == 2
+            await second.rollback()
+            return (await ProjectRepository(second, scope).get(project_id)).name
+
+    assert run(race()) == "first"
+
+
+def test_stage_advance_rejects_a_stale_etag(client, project, questions):
+    project_id, _, headers = project
+    base = f"/projects/{project_id}/research"
+    etag = client.get(f"{base}/", headers=headers).headers["ETag"]
+    stage = {"next_phase": "planning", "next_stage": "stage_2"}
+
+    assert client.post(f"{base}/progress", params=stage, headers=headers).status_code == 400
+    client.post(f"{base}/answers", headers=headers, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Dry timber"},
+    ])
+    # saving answers bumped the version the client based its advance on
+    stale = client.post(f"{base}/progress", params=stage, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 409
+
+    current = client.get(f"{base}/", headers=headers).headers["ETag"]
+    advanced = client.post(f"{base}/progress", params=stage, headers={**headers, "If-Match": current})
+    assert advanced.status_code == 200 and advanced.json()["current_stage"] == "stage_2"
+    assert advanced.headers["ETag"] != current
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+from src.auth.schemas import Role
+from src.core.conditional import etag_version, http_date, is_not_modified, make_etag
+
+
+def request_with(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_etag_carries_the_row_version():
+    assert make_etag("project", 7, 3) == '"project-7-v3"'
+    assert etag_version(make_etag("research", 7, 12, variant="include=answers")) == 12
+    assert etag_version('W/"project-7-v3"') is None
+
+
+def test_if_none_match_accepts_lists_and_weak_tags():
+    etag = make_etag("project", 1, 2)
+    assert is_not_modified(request_with(if_none_match=f'"other", W/{etag}'), etag)
+    assert is_not_modified(request_with(if_none_match="*"), etag)
+    assert not is_not_modified(request_with(if_none_match=make_etag("project", 1, 1)), etag)
+
+
+def test_if_modified_since_ignores_sub_second_precision():
+    modified = datetime(2026, 5, 1, 12, 0, 0, 500_000, tzinfo=timezone.utc)
+    etag = make_etag("project", 1, 1)
+    assert is_not_modified(request_with(if_modified_since=http_date(modified)), etag, modified)
+    assert not is_not_modified(request_with(if_modified_since="garbage"), etag, modified)
+
+
+@pytest.mark.postgres
+def test_project_revalidates_until_it_changes(client, make_user):
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    url = f"/projects/{project['id']}"
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+
+    client.put(url, json={"name": "Solar kiln", "type": "research"}, headers=headers)
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    _, stranger = make_user(Role.student)
+    assert client.get(url, headers={**stranger, "If-None-Match": "*"}).status_code == 403
+
+
+@pytest.mark.postgres
+def test_research_etag_depends_on_the_query(client, make_user):
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    url = f"/projects/{project['id']}/research/"
+
+    plain = client.get(url, headers=headers).headers["ETag"]
+    with_answers = client.get(url, params={"include": "answers"}, headers=headers).headers["ETag"]
+    assert plain != with_answers
+    assert client.get(url, params={"include": "answers"},
+                      headers={**headers, "If-None-Match": plain}).status_code == 200
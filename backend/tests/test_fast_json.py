@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import orjson
+import pytest
+from src.auth.schemas import Role
+from src.accelerator.models import Accelerator
+from src.accelerator.schemas import AcceleratorInDB
+from src.core.fast_json import dumps, schema_columns
+
+
+def test_schema_columns_follow_the_response_schema():
+    columns = schema_columns(Accelerator, AcceleratorInDB)
+    assert [column.key for column in columns] == list(AcceleratorInDB.model_fields)
+
+
+def test_dumps_encodes_rows_like_the_schema_path():
+    row = {"id": 1, "created_at": datetime(2026, 1, 2, 3, 4, 5), 7: "non-string key"}
+    assert orjson.loads(dumps(row)) == {"id": 1, "created_at": "2026-01-02T03:04:05", "7": "non-string key"}
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("path", ["/projects/", "/accelerators/", "/projects/{project}/research/answers"])
+def test_fast_path_returns_the_same_json(client, make_user, sql, questions, path):
+    _, headers = make_user(Role.student)
+    sql("INSERT INTO accelerators (university, slug, is_active, created_at, updated_at) "
+        "VALUES ('MIPT', 'mipt', true, now(), now())")
+    project = client.post("/projects/", json={"name": "Drone", "description": "Quadcopter", "type": "research"},
+                          headers=headers).json()
+    client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Fly"},
+    ])
+    url = path.format(project=project["id"])
+
+    regular = client.get(url, headers=headers)
+    fast = client.get(url, params={"fast": True}, headers=headers)
+    assert regular.status_code == fast.status_code == 200
+    assert fast.json() == regular.json() != []
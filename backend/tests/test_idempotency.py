@@ -0,0 +1,50 @@
+import pytest
+from src.auth.schemas import Role
+from src.idempotency.middleware import should_store
+
+KILN = {"name": "Kiln", "type": "research"}
+
+
+def test_only_final_outcomes_are_stored():
+    assert should_store(201, committed=True)
+    assert should_store(422, committed=False)
+    assert not should_store(409, committed=False)
+    assert not should_store(500, committed=False)
+    # the transaction committed before the response failed: never run it twice
+    assert should_store(500, committed=True)
+
+
+@pytest.mark.postgres
+def test_retried_post_is_replayed_not_repeated(client, make_user, sql):
+    _, headers = make_user(Role.student)
+    headers = {**headers, "Idempotency-Key": "create-kiln"}
+
+    first = client.post("/projects/", json=KILN, headers=headers)
+    replay = client.post("/projects/", json=KILN, headers=headers)
+    assert first.status_code == replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert sql("SELECT count(*) FROM projects")[0][0] == 1
+
+    changed = client.post("/projects/", json={**KILN, "name": "Other"}, headers=headers)
+    assert changed.status_code == 422
+
+
+@pytest.mark.postgres
+def test_keys_are_scoped_to_the_caller(client, make_user, sql):
+    _, alice = make_user(Role.student)
+    _, bob = make_user(Role.student)
+    for name, headers in (("Alice's kiln", alice), ("Bob's kiln", bob)):
+        response = client.post("/projects/", json={**KILN, "name": name},
+                               headers={**headers, "Idempotency-Key": "same"})
+        assert response.status_code == 201 and "Idempotent-Replayed" not in response.headers
+    assert sql("SELECT count(*) FROM projects")[0][0] == 2
+
+
+@pytest.mark.postgres
+def test_requests_without_a_valid_key_run_normally(client, make_user, sql):
+    _, headers = make_user(Role.student)
+    assert client.post("/projects/", json=KILN, headers={**headers, "Idempotency-Key": "k" * 256}).status_code == 400
+    client.post("/projects/", json={**KILN, "name": "Kiln 1"}, headers=headers)
+    client.post("/projects/", json={**KILN, "name": "Kiln 2"}, headers=headers)
+    assert sql("SELECT count(*) FROM projects")[0][0] == 2
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from src.jobs.models import Job
+from src.jobs.schemas import JobStatus
+from src.jobs.service import dequeue, enqueue, fail_job, retry_delay
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [retry_delay(n).total_seconds() for n in (1, 2, 3)] == [5, 10, 20]
+    assert retry_delay(30) == timedelta(hours=1)
+
+
+async def enqueue_many(factory, count: int, **options) -> list:
+    async with factory() as session:
+        ids = [await enqueue(session, "test", {"n": n}, **options) for n in range(count)]
+        await session.commit()
+        return ids
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_dequeue_skips_rows_locked_by_another_worker(postgres):
+    ids = await enqueue_many(postgres, 5)
+    async with postgres() as busy, postgres() as worker:
+        await busy.execute(select(Job).where(Job.id.in_(ids[:2])).with_for_update())
+        # would block without SKIP LOCKED
+        jobs = await asyncio.wait_for(dequeue(worker, "worker-b", limit=10), timeout=5)
+        assert sorted(job.id for job in jobs) == ids[2:]
+        assert {job.locked_by for job in jobs} == {"worker-b"}
+        await busy.rollback()
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_concurrent_workers_claim_disjoint_jobs(postgres):
+    ids = await enqueue_many(postgres, 9)
+
+    async def claim(worker_id):
+        async with postgres() as session:
+            return [job.id for job in await dequeue(session, worker_id, limit=4)]
+
+    batches = await asyncio.gather(*(claim(f"worker-{n}") for n in range(3)))
+    claimed = [job_id for batch in batches for job_id in batch]
+    assert sorted(claimed) == ids
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_priority_first_and_delayed_jobs_wait(postgres):
+    low, = await enqueue_many(postgres, 1)
+    high, = await enqueue_many(postgres, 1, priority=5)
+    await enqueue_many(postgres, 1, delay=timedelta(minutes=5))
+    for expected in ([high], [low], []):
+        async with postgres() as session:
+            assert [job.id for job in await dequeue(session, "w", limit=1)] == expected
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_failed_jobs_back_off_then_park(postgres):
+    await enqueue_many(postgres, 1, max_attempts=2)
+    # a fresh session per step, as the worker uses
+    async with postgres() as session:
+        job, = await dequeue(session, "w", limit=1)
+        assert await fail_job(session, job, "boom")
+    async with postgres() as session:
+        assert await dequeue(session, "w", limit=1) == []
+        await session.execute(Job.__table__.update().values(run_at=Job.run_at - timedelta(minutes=1)))
+        await session.commit()
+    async with postgres() as session:
+        job, = await dequeue(session, "w", limit=1)
+        assert job.attempts == 2
+        assert not await fail_job(session, job, "boom again")
+    async with postgres() as session:
+        status, error = (await session.execute(select(Job.status, Job.last_error))).one()
+        assert (status, error) == (JobStatus.failed, "boom again")
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_rolled_back_enqueue_leaves_no_job(postgres):
+    async with postgres() as session:
+        await enqueue(session, "test", {})
+        await session.rollback()
+        assert (await session.execute(select(Job.id))).all() == []
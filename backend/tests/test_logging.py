@@ -0,0 +1,72 @@
+import gc
+import logging
+import queue
+import weakref
+
+import orjson
+import pytest
+from src.auth.schemas import Role
+from src.core.logging_config import ContextFilter, DroppingQueueHandler, JsonFormatter, request_id
+
+
+def record(name: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    entry = logging.LogRecord(name, level, __file__, 1, "hello %s", ("world",), None)
+    entry.__dict__.update(extra)
+    return entry
+
+
+def test_longest_prefix_sets_the_sample_rate():
+    sampling = ContextFilter({"src.db": 0.5, "src.db.notify": 0.0, "httpx": 0.1})
+    assert sampling.sample_rate("src.db.notify") == 0.0
+    assert sampling.sample_rate("src.db.notify.listener") == 0.0
+    assert sampling.sample_rate("src.db") == 0.5
+    assert sampling.sample_rate("src.dbx") == 1.0
+    assert ContextFilter({}).sample_rate("src.db.notify") == 1.0
+
+
+def test_filters_are_not_kept_alive_by_their_cache():
+    sampling = ContextFilter({"src": 0.5})
+    sampling.sample_rate("src.main")
+    reference = weakref.ref(sampling)
+    del sampling
+    gc.collect()
+    assert reference() is None
+
+
+def test_sampled_loggers_keep_warnings_and_tag_request_ids():
+    sampling = ContextFilter({"noisy": 0.0})
+    assert not sampling.filter(record("noisy.child"))
+    warning = record("noisy.child", logging.WARNING)
+    token = request_id.set("req-1")
+    try:
+        assert sampling.filter(warning)
+    finally:
+        request_id.reset(token)
+    assert warning.request_id == "req-1"
+
+
+def test_full_queue_drops_and_counts(monkeypatch):
+    monkeypatch.setattr(DroppingQueueHandler, "dropped", 0)
+    log_queue = queue.SimpleQueue()
+    handler = DroppingQueueHandler(log_queue, maxsize=2)
+    for _ in range(5):
+        handler.emit(record("app"))
+    assert log_queue.qsize() == 2
+    assert DroppingQueueHandler.dropped == 3
+    assert log_queue.get().msg == "hello world"
+
+
+def test_json_lines_carry_extras():
+    line = orjson.loads(JsonFormatter().format(record("app", request_id="req-2", user_id=7)))
+    assert {key: line[key] for key in ("level", "logger", "message", "request_id", "user_id")} == {
+        "level": "INFO", "logger": "app", "message": "hello world", "request_id": "req-2", "user_id": 7
+    }
+
+
+@pytest.mark.postgres
+def test_dropped_records_are_an_admin_metric(client, make_user, monkeypatch):
+    monkeypatch.setattr(DroppingQueueHandler, "dropped", 4)
+    _, admin = make_user(Role.admin)
+    _, student = make_user(Role.student)
+    assert client.get("/metrics/logging", headers=admin).json()["dropped"] == 4
+    assert client.get("/metrics/logging", headers=student).status_code == 403
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+from src.core.loop_monitor import LoopLagMonitor, RouteTrackingMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+async def monitor():
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    await monitor.start()
+    yield monitor
+    await monitor.stop()
+
+
+async def test_an_idle_loop_has_no_stalls(monitor):
+    await asyncio.sleep(0.2)
+    metrics = monitor.metrics()
+    assert metrics.samples > 5
+    assert metrics.stalls == 0 and metrics.recent_stalls == []
+
+
+async def test_a_stall_is_traced_to_its_route_and_stack(monitor):
+    async def slow_app(scope, receive, send):
+        block_the_loop(0.2)
+
+    await asyncio.sleep(0.05)
+    await RouteTrackingMiddleware(slow_app)({"type": "http", "method": "GET", "path": "/slow"}, None, None)
+    await asyncio.sleep(0.05)
+
+    metrics = monitor.metrics()
+    assert metrics.stalls == 1
+    stall, = metrics.recent_stalls
+    assert stall.route == "GET /slow"
+    assert any("block_the_loop" in frame for frame in stall.stack)
+    # corrected by the tick that measured the whole stall
+    assert stall.blocked_ms >= 190
+    assert metrics.max_lag_ms >= 190
@@ -0,0 +1,57 @@
+import pytest
+from src.auth.schemas import Role
+from src.core.normalization import (
+    normalization_cache_stats,
+    normalize_email,
+    normalize_many,
+    normalize_phone,
+    slugify,
+)
+
+
+@pytest.mark.parametrize("value, slug", [
+    ("МГУ им. Ломоносова", "мгу-им-ломоносова"),
+    ("  ITMO University!  ", "itmo-university"),
+    ("Straße_№1", "strasse-no1"),  # casefold, NFKC
+    ("2024", "n-2024"),
+    ("!!!", "-"),
+])
+def test_slugify(value, slug):
+    assert slugify(value) == slug
+
+
+def test_email_and_phone_normalization():
+    assert normalize_email("Ada@Example.COM") == "Ada@example.com"
+    assert normalize_phone("+7 (999) 123-45-67") == "+79991234567"
+    with pytest.raises(ValueError):
+        normalize_email("not an address")
+    with pytest.raises(ValueError):
+        normalize_phone("8 999 123 45 67")
+
+
+def test_batch_collects_every_error_and_reuses_the_cache():
+    normalize_phone.cache_clear()
+    values = ["+7 (999) 123-45-67", "", "8 999 123 45 67", "+7 999 123 45 67", None, "+7 (999) 123-45-67"]
+    normalized, errors = normalize_many(normalize_phone, values)
+    assert normalized == ["+79991234567", None, None, "+79991234567", None, "+79991234567"]
+    assert list(errors) == [2] and "international format" in errors[2]
+    # three distinct non-empty values parsed once each; the repeat is a hit
+    info = normalize_phone.cache_info()
+    assert (info.hits, info.misses) == (1, 3)
+
+
+def test_cache_stats_count_hits():
+    slugify.cache_clear()
+    slugify("Repeat")
+    slugify("Repeat")
+    stats = normalization_cache_stats()["slugify"]
+    assert (stats["hits"], stats["misses"], stats["size"], stats["hit_ratio"]) == (1, 1, 1, 0.5)
+
+
+@pytest.mark.postgres
+def test_cache_stats_are_an_admin_metric(client, make_user):
+    _, admin = make_user(Role.admin)
+    _, student = make_user(Role.student)
+    body = client.get("/metrics/normalization", headers=admin).json()
+    assert set(body) == {"normalize_phone", "normalize_email", "slugify"}
+    assert client.get("/metrics/normalization", headers=student).status_code == 403
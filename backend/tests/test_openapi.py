@@ -0,0 +1,71 @@
+import gzip
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from src.core.openapi_config import OpenAPIDocument
+
+
+@pytest.fixture(scope="module")
+def client():
+    from src.main import app
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("gzip, deflate, br", "br"),
+    ("gzip, deflate", "gzip"),
+    ("br;q=0.1, gzip;q=1.0", "gzip"),
+    ("br;q=0, gzip;q=0.5", "gzip"),
+    ("gzip;q=0.5, identity;q=0.8", "identity"),
+    ("gzip;q=0", "identity"),
+    ("*", "br"),
+    ("*;q=0.2, br;q=0", "gzip"),
+    ("GZIP ; Q=0.7 , br ; q=0.7", "br"),
+    ("br;q=abc, gzip", "gzip"),
+    ("br;q=nan, gzip;q=2", "identity"),
+    ("identity;q=0, *;q=0", "identity"),
+    ("", "identity"),
+])
+def test_negotiate_by_quality(accept, encoding):
+    document = OpenAPIDocument(b"{}")
+    # whether or not brotli is installed here
+    document.variants["br"] = b"br"
+    assert document.negotiate(accept) == encoding
+
+
+def test_negotiate_without_brotli():
+    document = OpenAPIDocument(b"{}")
+    document.variants.pop("br", None)
+    assert document.negotiate("br, gzip;q=0.5") == "gzip"
+    assert document.negotiate("br") == "identity"
+
+
+def test_variants_have_their_own_etags():
+    document = OpenAPIDocument(b'{"openapi": "3.1.0"}')
+    assert gzip.decompress(document.variants["gzip"]) == document.variants["identity"]
+    assert len(set(document.etags.values())) == len(document.variants)
+
+
+def test_served_document_is_the_app_schema(client):
+    from src.main import app
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert orjson.loads(response.content) == orjson.loads(orjson.dumps(app.openapi()))
+
+
+def test_compressed_document_revalidates(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    cached = client.get("/openapi.json", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["etag"] == etag
+    identity = client.get("/openapi.json", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert identity.status_code == 200
+
+
+def test_admin_operations_require_admin_auth(client):
+    schema = client.get("/openapi.json").json()
+    operation = schema["paths"]["/metrics/loop"]["get"]
+    assert operation["security"] == [{"AdminAuth": ["admin"]}]
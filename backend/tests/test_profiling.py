@@ -0,0 +1,62 @@
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.auth.schemas import Role
+from src.auth.service import SecurityService
+from src.core.config import settings
+from src.core.profiling import ProfilingMiddleware
+
+
+def busy_handler():
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return {"ok": True}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_INTERVAL_MS", 2)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0)
+    app = FastAPI()
+
+    @app.get("/busy")
+    async def busy():
+        return busy_handler()
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+def bearer(role: Role) -> dict:
+    token = SecurityService.create_access_token({"email": f"{role.value}@example.com", "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_admin_request_is_profiled(client, tmp_path):
+    response = client.get("/busy", headers={**bearer(Role.admin), "X-Profile": "1"})
+    name = response.headers["x-profile-id"]
+
+    report = json.loads((tmp_path / f"{name}.json").read_text())
+    assert (report["method"], report["path"], report["status"]) == ("GET", "/busy", 200)
+    assert report["samples"] > 10
+    folded = (tmp_path / f"{name}.folded").read_text()
+    assert all(line.startswith("GET_/busy;") for line in folded.splitlines())
+    assert "busy_handler" in folded
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"X-Profile": "0"},
+    {"X-Profile": "1"},
+    {"X-Profile": "1", "Authorization": "Bearer not-a-token"},
+])
+def test_other_requests_are_not_profiled(client, tmp_path, headers):
+    response = client.get("/busy", headers={**bearer(Role.student), **headers})
+    assert response.json() == {"ok": True}
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from src.auth.models import User
+from src.auth.schemas import Role
+from src.db.notify import PgListener
+from src.project.models import Project
+from src.project.project_research.progress import ProgressBroadcaster, progress_events, sse_event
+from src.project.project_research.schemas import ResearchAnswerCreate, ResearchProgress
+from src.project.project_research.service import create_research_project, save_research_answers
+
+
+def progress(answered: int) -> ResearchProgress:
+    return ResearchProgress(phase="planning", stage="stage_1", completed=False,
+                            answered_count=answered, total_questions=3, required_answered=answered > 0)
+
+
+def test_slow_subscribers_only_keep_the_latest_progress():
+    broadcaster = ProgressBroadcaster()
+    queue = broadcaster.subscribe(7)
+    for answered in (1, 2, 3):
+        broadcaster._publish(7, progress(answered))
+    assert queue.qsize() == 1 and queue.get_nowait().answered_count == 3
+
+    broadcaster.unsubscribe(7, queue)
+    assert broadcaster.subscriber_count == 0
+    broadcaster._publish(7, progress(4))
+    assert queue.empty()
+
+
+def test_sse_event_format():
+    event = sse_event(progress(1))
+    assert event.startswith("event: progress\ndata: {") and event.endswith("}\n\n")
+
+
+async def research_project(factory) -> int:
+    async with factory() as session:
+        user = User(email="ada@example.com", hashed_password="x", role=Role.student)
+        session.add(user)
+        await session.flush()
+        project = Project(name="Kiln", type="research", stage="planning", user_id=user.id)
+        session.add(project)
+        await session.flush()
+        research = await create_research_project(session, project.id)
+        await session.commit()
+        return research.id
+
+
+@pytest.fixture
+async def broadcaster(postgres):
+    listener = PgListener()
+    await listener.start()
+    broadcaster = ProgressBroadcaster()
+    await broadcaster.start(listener)
+    yield broadcaster
+    await broadcaster.stop()
+    await listener.stop()
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_committed_answers_reach_subscribers(postgres, questions, broadcaster):
+    research_id = await research_project(postgres)
+    queue = broadcaster.subscribe(research_id)
+
+    async with postgres() as session:
+        await save_research_answers(session, research_id, [
+            ResearchAnswerCreate(question_id=questions["planning.stage_1.goal"], answer_text="Dry timber"),
+        ])
+        await asyncio.sleep(0.2)
+        assert queue.empty()  # NOTIFY is delivered on commit only
+        await session.commit()
+
+    update = await asyncio.wait_for(queue.get(), timeout=5)
+    assert (update.answered_count, update.required_answered) == (1, True)
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_stream_starts_with_the_current_progress(postgres, questions, broadcaster):
+    research_id = await research_project(postgres)
+    events = progress_events(broadcaster, research_id)
+    assert (await anext(events)).startswith("retry: ")
+    first = await anext(events)
+    assert first.startswith("event: progress") and '"answered_count":0' in first
+    assert broadcaster.subscriber_count == 1
+    await events.aclose()
+    assert broadcaster.subscriber_count == 0
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_reconnect_refreshes_every_watched_project(postgres, broadcaster):
+    research_id = await research_project(postgres)
+    queue = broadcaster.subscribe(research_id)
+    # payload None: the LISTEN connection came back and may have missed NOTIFYs
+    broadcaster._on_notify(None)
+    assert (await asyncio.wait_for(queue.get(), timeout=5)).answered_count == 0
@@ -0,0 +1,49 @@
+import pytest
+from src.auth.schemas import Role
+from src.project.service import purge_deleted_project
+from tests.conftest import run
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def answered(client, make_user, questions):
+    """A project with four research answers; (project id, owner headers)"""
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+        {"question_id": question_id, "answer_text": "3"} for question_id in questions.values()
+    ])
+    return project["id"], headers
+
+
+def counts(sql) -> tuple:
+    return sql("SELECT (SELECT count(*) FROM projects), (SELECT count(*) FROM research_projects), "
+               "(SELECT count(*) FROM research_answers)")[0]
+
+
+def test_delete_cascades_in_the_database(client, sql, answered):
+    project_id, headers = answered
+    assert counts(sql) == (1, 1, 4)
+    assert client.delete(f"/projects/{project_id}", headers=headers).status_code == 200
+    assert counts(sql) == (0, 0, 0)
+
+
+def test_background_delete_hides_the_project_then_purges_it(client, sql, answered):
+    project_id, headers = answered
+    assert client.delete(f"/projects/{project_id}", params={"background": True}, headers=headers).status_code == 200
+
+    assert client.get(f"/projects/{project_id}", headers=headers).status_code == 404
+    assert client.get(f"/projects/{project_id}/research/", headers=headers).status_code == 404
+    assert client.get("/projects/", headers=headers).json() == []
+    assert client.delete(f"/projects/{project_id}", headers=headers).status_code == 404
+    assert sql("SELECT kind, payload->>'project_id' FROM jobs") == [("purge_project", str(project_id))]
+    assert counts(sql) == (1, 1, 4)
+
+    assert run(purge_deleted_project(project_id, batch_size=3)) == 4
+    assert counts(sql) == (0, 0, 0)
+
+
+def test_deleting_a_user_removes_their_projects(sql, answered):
+    sql("DELETE FROM users")
+    assert counts(sql) == (0, 0, 0)
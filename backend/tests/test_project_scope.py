@@ -0,0 +1,57 @@
+import pytest
+from src.auth.schemas import Role
+from src.project.repository import ProjectScope
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def owned(client, make_user):
+    """A student's project, its URL and the owner's headers"""
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    return f"/projects/{project['id']}", headers
+
+
+def test_owner_reads_and_writes(client, owned):
+    url, headers = owned
+    assert client.get(url, headers=headers).status_code == 200
+    assert client.get(f"{url}/research/", headers=headers).status_code == 200
+    assert client.put(url, json={"name": "Kiln 2", "type": "research"}, headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("role", [Role.student, Role.teacher])
+def test_others_cannot_change_the_project(client, make_user, owned, role):
+    url, _ = owned
+    _, headers = make_user(role)
+    assert client.put(url, json={"name": "Mine now", "type": "research"}, headers=headers).status_code == 403
+    assert client.delete(url, headers=headers).status_code == 403
+
+
+def test_other_students_cannot_read_the_project(client, make_user, owned):
+    url, _ = owned
+    _, headers = make_user(Role.student)
+    assert client.get(url, headers=headers).status_code == 403
+    assert client.get(f"{url}/research/", headers=headers).status_code == 403
+    assert client.get(f"{url}/research/answers", headers=headers).status_code == 403
+
+
+def test_admin_has_full_access(client, make_user, owned):
+    url, _ = owned
+    _, headers = make_user(Role.admin)
+    assert client.get(url, headers=headers).status_code == 200
+    assert client.put(url, json={"name": "Renamed", "type": "research"}, headers=headers).json()["name"] == "Renamed"
+    assert client.delete(url, headers=headers).status_code == 200
+    assert client.get(url, headers=headers).status_code == 404
+
+
+def test_missing_project_is_not_found_for_everyone(client, make_user):
+    _, headers = make_user(Role.student)
+    assert client.get("/projects/999999", headers=headers).status_code == 404
+    assert client.get("/projects/999999/research/", headers=headers).status_code == 404
+
+
+def test_teacher_reads_but_does_not_write_everything():
+    teacher = ProjectScope(1, Role.teacher)
+    assert str(teacher.reads()) == "true"
+    assert "user_id" in str(teacher.allows())
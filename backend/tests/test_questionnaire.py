@@ -0,0 +1,66 @@
+import orjson
+import pytest
+from src.auth.schemas import Role
+from src.project.project_research.service import (
+    DEFAULT_QUESTIONNAIRE,
+    initialize_research_questions,
+    parse_questionnaire,
+)
+from tests.conftest import QUESTIONNAIRE, run
+
+URL = "/research/questionnaire/"
+
+
+def test_parse_accepts_a_list_or_a_questions_mapping():
+    yaml = "questions:\n  - key: a.b.c\n    phase: planning\n    stage: stage_1\n" \
+           "    question_text: Why?\n    question_type: text\n    order: 1\n"
+    assert [item.key for item in parse_questionnaire(yaml)] == ["a.b.c"]
+    assert len(parse_questionnaire(orjson.dumps(QUESTIONNAIRE))) == len(QUESTIONNAIRE)
+    with pytest.raises(ValueError):
+        parse_questionnaire("just text")
+
+
+@pytest.mark.postgres
+def test_sync_updates_in_place_and_prunes_removed_questions(client, make_user, sql, questions):
+    _, admin = make_user(Role.admin)
+    _, student = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=student).json()
+    client.post(f"/projects/{project['id']}/research/answers", headers=student, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Dry timber"},
+        {"question_id": questions["research.stage_1.tools"], "answer_text": '["excel"]'},
+    ])
+    definition = [dict(QUESTIONNAIRE[0], question_text="What is the goal, exactly?"), *QUESTIONNAIRE[1:3]]
+
+    preview = client.put(URL, params={"dry_run": True}, content=orjson.dumps(definition), headers=admin).json()
+    assert preview == {"inserted": [], "updated": ["planning.stage_1.goal"], "deleted": ["research.stage_1.tools"],
+                       "unchanged": 2, "dry_run": True}
+    assert sql("SELECT count(*) FROM research_questions")[0][0] == 4
+
+    applied = client.put(URL, content=orjson.dumps(definition), headers=admin).json()
+    assert applied["updated"] == ["planning.stage_1.goal"] and not applied["dry_run"]
+    rows = sql("SELECT q.id, q.question_text, count(a.id) FROM research_questions q "
+               "LEFT JOIN research_answers a ON a.question_id = q.id GROUP BY q.id ORDER BY q.id")
+    assert rows[0] == (questions["planning.stage_1.goal"], "What is the goal, exactly?", 1)
+    assert len(rows) == 3
+    assert sql("SELECT count(*) FROM research_answers")[0][0] == 1
+
+    assert client.put(URL, content=orjson.dumps(definition), headers=student).status_code == 403
+
+
+@pytest.mark.postgres
+def test_initialize_matches_the_migrated_default_question(postgres, sql):
+    # the row 6c4f4e68f4b1 backfills for the question seeded before keys existed
+    default = DEFAULT_QUESTIONNAIRE[0]
+    sql("INSERT INTO research_questions (key, phase, stage, question_text, question_type, \"order\", required) "
+        "VALUES ('planning.stage_1.main_question', :phase, :stage, :text, :type, 1, true)",
+        phase=default.phase, stage=default.stage, text=default.question_text, type=default.question_type.value)
+
+    async def initialize():
+        async with postgres() as session:
+            diff = await initialize_research_questions(session)
+            await session.commit()
+            return diff
+
+    diff = run(initialize())
+    assert diff.inserted == [] and diff.deleted == []
+    assert sql("SELECT count(*) FROM research_questions")[0][0] == 1
@@ -0,0 +1,45 @@
+import pytest
+from src.auth.schemas import Role
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def research(client, make_user, questions):
+    """A student's research project with two planning answers and one research answer"""
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Solar kiln", "type": "research"}, headers=headers).json()
+    base = f"/projects/{project['id']}/research"
+    response = client.post(f"{base}/answers", headers=headers, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Dry timber faster"},
+        {"question_id": questions["planning.stage_1.method"], "answer_text": "experiment"},
+        {"question_id": questions["research.stage_1.tools"], "answer_text": '["python"]'},
+    ])
+    assert response.status_code == 200
+    return base, headers
+
+
+def test_header_is_returned_without_answers(client, research):
+    base, headers = research
+    body = client.get(f"{base}/", headers=headers).json()
+    assert set(body) == {"id", "current_phase", "current_stage", "project_id"}
+
+
+def test_answers_are_included_on_request(client, research):
+    base, headers = research
+    body = client.get(f"{base}/", params={"include": "answers"}, headers=headers).json()
+    assert len(body["answers"]) == 3
+
+
+def test_fields_limit_the_answer_columns(client, research):
+    base, headers = research
+    answers = client.get(f"{base}/answers", params={"fields": ["id", "answer_text"]}, headers=headers).json()
+    assert answers and all(set(answer) == {"id", "answer_text"} for answer in answers)
+
+
+def test_answers_filter_by_phase_and_page(client, research):
+    base, headers = research
+    planning = client.get(f"{base}/answers", params={"phase": "planning"}, headers=headers).json()
+    assert [answer["answer_text"] for answer in planning] == ["Dry timber faster", "experiment"]
+    page = client.get(f"{base}/answers", params={"skip": 1, "limit": 1}, headers=headers).json()
+    assert [answer["answer_text"] for answer in page] == ["experiment"]
@@ -0,0 +1,80 @@
+import pytest
+from src.auth.schemas import Role
+from src.search.service import MATCH_START, MATCH_STOP, highlight
+
+
+def test_highlight_escapes_before_marking():
+    headline = f"<b>{MATCH_START}timber{MATCH_STOP}</b> & co"
+    assert highlight(headline) == "&lt;b&gt;<mark>timber</mark>&lt;/b&gt; &amp; co"
+
+
+@pytest.fixture
+def projects(client, make_user, sql, questions):
+    """Two students, each with a project and an answer mentioning timber"""
+    owners = {}
+    for name, text in (("Timber kiln", "We dry timber <img src=x onerror=alert(1)> if 1 < 2 & faster"),
+                       ("Timber dryer", "Solar heat for timber")):
+        _, headers = make_user(Role.student)
+        project = client.post("/projects/", json={"name": name, "type": "research",
+                                                  "description": f"{name} for small workshops"},
+                              headers=headers).json()
+        assert client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+            {"question_id": questions["planning.stage_1.goal"], "answer_text": text},
+        ]).status_code == 200
+        owners[name] = (project["id"], headers)
+    return owners
+
+
+def hits(client, headers, q="timber", **params) -> tuple:
+    response = client.get("/search/", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return ({hit["id"] for hit in body["projects"]},
+            {hit["project_id"] for hit in body["answers"]})
+
+
+@pytest.mark.postgres
+def test_students_only_find_their_own_projects(client, projects):
+    kiln, headers = projects["Timber kiln"]
+    assert hits(client, headers) == ({kiln}, {kiln})
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("role", [Role.teacher, Role.admin])
+def test_staff_find_every_project(client, make_user, projects, role):
+    _, headers = make_user(role)
+    every = {project_id for project_id, _ in projects.values()}
+    assert hits(client, headers) == (every, every)
+
+
+@pytest.mark.postgres
+def test_deleted_projects_are_not_found(client, make_user, projects):
+    kiln, owner = projects["Timber kiln"]
+    dryer, _ = projects["Timber dryer"]
+    client.delete(f"/projects/{kiln}", params={"background": True}, headers=owner)
+    _, teacher = make_user(Role.teacher)
+    assert hits(client, teacher) == ({dryer}, {dryer})
+
+
+@pytest.mark.postgres
+def test_snippets_are_escaped_and_marked(client, projects):
+    _, headers = projects["Timber kiln"]
+    body = client.get("/search/", params={"q": "timber"}, headers=headers).json()
+    snippet, = [hit["snippet"] for hit in body["answers"]]
+    assert "<mark>timber</mark>" in snippet
+    # ts_headline drops well-formed tags itself, but not this one
+    assert "&lt;img src=x onerror=alert(1)&gt;" in snippet and "1 &lt; 2 &amp;" in snippet
+    assert "<" not in snippet.replace("<mark>", "").replace("</mark>", "")
+
+
+@pytest.mark.postgres
+def test_search_syntax_and_accelerator_filter(client, make_user, sql, projects):
+    kiln, _ = projects["Timber kiln"]
+    _, admin = make_user(Role.admin)
+    client.post("/accelerators/", json={"university": "MIPT"}, headers=admin)
+    sql("UPDATE projects SET accelerator_id = (SELECT id FROM accelerators WHERE slug = 'mipt') WHERE id = :id",
+        id=kiln)
+    assert hits(client, admin, accelerator="mipt") == ({kiln}, {kiln})
+    assert hits(client, admin, q="timber -solar")[1] == {kiln}
+    assert client.get("/search/", params={"q": "timber", "accelerator": "nowhere"}, headers=admin).status_code == 404
+    assert client.get("/search/", params={"q": "t"}, headers=admin).status_code == 422
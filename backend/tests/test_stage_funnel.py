@@ -0,0 +1,122 @@
+import pytest
+from src.accelerator.service import rebuild_stage_funnel
+from src.auth.schemas import Role
+from tests.conftest import run
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def staff(client, make_user):
+    _, headers = make_user(Role.admin)
+    for university in ("MIPT", "HSE"):
+        assert client.post("/accelerators/", json={"university": university}, headers=headers).status_code == 201
+    return headers
+
+
+@pytest.fixture
+def student(make_user):
+    return make_user(Role.student)[1]
+
+
+def research_project(client, sql, headers, name: str, accelerator_slug: str) -> int:
+    """A research project of the accelerator with its research record started"""
+    project = client.post("/projects/", json={"name": name, "type": "research"}, headers=headers).json()
+    sql("UPDATE projects SET accelerator_id = (SELECT id FROM accelerators WHERE slug = :slug) WHERE id = :id",
+        slug=accelerator_slug, id=project["id"])
+    assert client.get(f"/projects/{project['id']}/research/", headers=headers).status_code == 200
+    return project["id"]
+
+
+def set_stage(sql, project_id: int, stage: str):
+    # any write path is counted; this one skips the API's stage rules
+    sql("UPDATE projects SET stage = :stage WHERE id = :id", stage=stage, id=project_id)
+
+
+def funnel(client, headers, ref: str) -> dict:
+    response = client.get(f"/accelerators/{ref}/funnel", headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return {(kind, row["category"], row["stage"]): row["projects"]
+            for kind in ("projects", "research") for row in body[kind]}
+
+
+def test_counts_follow_creates_and_stage_changes(client, sql, staff, student):
+    first = research_project(client, sql, student, "Kiln", "mipt")
+    research_project(client, sql, student, "Dryer", "mipt")
+    assert funnel(client, staff, "mipt") == {
+        ("projects", "research", "planning"): 2,
+        ("research", "planning", "stage_1"): 2,
+    }
+
+    set_stage(sql, first, "research")
+    client.post(f"/projects/{first}/research/progress",
+                params={"next_phase": "planning", "next_stage": "stage_2"}, headers=student)
+    assert funnel(client, staff, "mipt") == {
+        ("projects", "research", "planning"): 1,
+        ("projects", "research", "research"): 1,
+        ("research", "planning", "stage_1"): 1,
+        ("research", "planning", "stage_2"): 1,
+    }
+
+
+def test_stages_are_listed_in_funnel_order(client, sql, staff, student):
+    for name, stage in (("Kiln", "implementation"), ("Dryer", "planning"), ("Oven", "research")):
+        project = research_project(client, sql, student, name, "mipt")
+        set_stage(sql, project, stage)
+    rows = client.get("/accelerators/mipt/funnel", headers=staff).json()["projects"]
+    assert [row["stage"] for row in rows] == ["planning", "research", "implementation"]
+
+
+def test_reassign_moves_the_counts(client, sql, staff, student):
+    research_project(client, sql, student, "Kiln", "mipt")
+    client.post("/accelerators/bulk/reassign", json={"source": "MIPT", "target": "HSE"}, headers=staff)
+    assert funnel(client, staff, "mipt") == {}
+    assert funnel(client, staff, "hse") == {
+        ("projects", "research", "planning"): 1,
+        ("research", "planning", "stage_1"): 1,
+    }
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_deleted_projects_leave_the_funnel(client, sql, staff, student, background):
+    kept = research_project(client, sql, student, "Kiln", "mipt")
+    deleted = research_project(client, sql, student, "Dryer", "mipt")
+    set_stage(sql, kept, "research")
+    assert client.delete(f"/projects/{deleted}", params={"background": background},
+                         headers=student).status_code == 200
+    assert funnel(client, staff, "mipt") == {
+        ("projects", "research", "research"): 1,
+        ("research", "planning", "stage_1"): 1,
+    }
+
+
+def test_deleting_the_accelerator_drains_its_counts(client, sql, staff, student):
+    research_project(client, sql, student, "Kiln", "mipt")
+    sql("DELETE FROM accelerators WHERE slug = 'mipt'")
+    assert sql("SELECT coalesce(sum(projects), 0) FROM accelerator_stage_counts")[0][0] == 0
+
+
+def test_rebuild_matches_the_maintained_counts(client, sql, postgres, staff, student):
+    research_project(client, sql, student, "Kiln", "mipt")
+    moved = research_project(client, sql, student, "Dryer", "mipt")
+    deleted = research_project(client, sql, student, "Oven", "hse")
+    set_stage(sql, moved, "research")
+    client.delete(f"/projects/{deleted}", params={"background": True}, headers=student)
+
+    query = ("SELECT accelerator_id, funnel, category, stage, projects FROM accelerator_stage_counts "
+             "WHERE projects > 0 ORDER BY 1, 2, 3, 4")
+    maintained = sql(query)
+
+    async def rebuild():
+        async with postgres() as session:
+            await rebuild_stage_funnel(session)
+            await session.commit()
+
+    run(rebuild())
+    assert sql(query) == maintained
+
+
+def test_funnel_is_for_staff_and_known_accelerators(client, staff, student):
+    assert client.get("/accelerators/mipt/funnel", headers=student).status_code == 403
+    assert client.get("/accelerators/nowhere/funnel", headers=staff).status_code == 404
@@ -0,0 +1,23 @@
+import statistics
+
+from benchmarks.startup import BUDGET_RSS_MB, BUDGET_SECONDS, parse_importtime, probe
+
+RUNS = 3
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    assert parse_importtime(stderr) == [("json.decoder", 120, 120), ("json", 300, 420)]
+
+
+def test_importing_the_app_stays_within_budget():
+    probe("src.main")  # warms the bytecode cache
+    samples = [probe("src.main")[0] for _ in range(RUNS)]
+    seconds = statistics.median(sample["seconds"] for sample in samples)
+    rss_mb = max(sample["rss_mb"] for sample in samples)
+    assert seconds <= BUDGET_SECONDS, f"import src.main took {seconds:.3f}s"
+    assert rss_mb <= BUDGET_RSS_MB, f"import src.main peaked at {rss_mb:.1f} MB"
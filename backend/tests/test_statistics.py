@@ -0,0 +1,92 @@
+import random
+
+import pytest
+from src.auth.schemas import Role
+from src.project.project_research.statistics import PERCENTILES, choice_counts, scale_summaries
+
+
+def expand(pairs):
+    return sorted(value for value, count in pairs for _ in range(count))
+
+
+def nearest_rank(values, p):
+    rank = max(-(-len(values) * p // 100), 1)
+    return values[rank - 1]
+
+
+def test_percentiles_use_nearest_rank():
+    # 1 x1, 2 x3, 5 x4, 10 x2: ten respondents
+    rows = [(7, 5.0, 4), (7, 1.0, 1), (7, 10.0, 2), (7, 2.0, 3)]
+    summary = scale_summaries(rows)[7]
+    assert summary == {"mean": 4.7, "min": 1.0, "max": 10.0,
+                       "percentiles": {"p25": 2.0, "p50": 5.0, "p75": 5.0, "p90": 10.0}}
+
+
+def test_single_respondent_is_every_percentile():
+    summary = scale_summaries([(1, 3.0, 1)])[1]
+    assert set(summary["percentiles"].values()) == {3.0}
+    assert scale_summaries([]) == {}
+
+
+def test_summaries_match_the_expanded_answers():
+    generator = random.Random(7)
+    rows = [(question, float(value), generator.randint(1, 50))
+            for question in range(1, 6) for value in generator.sample(range(-5, 11), generator.randint(1, 8))]
+    for question, summary in scale_summaries(rows).items():
+        values = expand((value, count) for q, value, count in rows if q == question)
+        assert summary["mean"] == pytest.approx(sum(values) / len(values))
+        assert summary["percentiles"] == {f"p{p}": nearest_rank(values, p) for p in PERCENTILES}
+
+
+def test_choice_counts_keep_option_order_then_other_answers():
+    counts = choice_counts([('["excel", "python"]', 2), ('["r"]', 1)], ["python", "excel", "julia"], multiple=True)
+    assert counts == {"python": 2, "excel": 2, "julia": 0, "r": 1}
+
+
+@pytest.fixture
+def answered(client, make_user, sql, questions):
+    """Two students' projects under MIPT with score answers 2 and 4; staff headers"""
+    _, staff = make_user(Role.admin)
+    for university in ("MIPT", "HSE"):
+        client.post("/accelerators/", json={"university": university}, headers=staff)
+    projects = []
+    for name, score in (("Kiln", "2"), ("Dryer", "4")):
+        _, headers = make_user(Role.student)
+        project = client.post("/projects/", json={"name": name, "type": "research"}, headers=headers).json()
+        sql("UPDATE projects SET accelerator_id = (SELECT id FROM accelerators WHERE slug = 'mipt') "
+            "WHERE id = :id", id=project["id"])
+        assert client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+            {"question_id": questions["planning.stage_1.score"], "answer_text": score},
+        ]).status_code == 200
+        projects.append((project["id"], headers))
+    return staff, projects
+
+
+def score(client, staff, **params) -> tuple:
+    body = client.get("/research/statistics/", params={"phase": "planning", **params}, headers=staff).json()
+    question, = [q for q in body["questions"] if q["key"] == "planning.stage_1.score"]
+    return question["respondents"], question["summary"] and question["summary"]["mean"]
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("background", [False, True])
+def test_deleted_projects_drop_out_of_cached_statistics(client, answered, background):
+    staff, projects = answered
+    assert score(client, staff) == score(client, staff, accelerator="mipt") == (2, 3.0)
+
+    project_id, headers = projects[0]
+    client.delete(f"/projects/{project_id}", params={"background": background}, headers=headers)
+    # a soft-deleted project's answers are still there until purged
+    assert score(client, staff) == score(client, staff, accelerator="mipt") == (1, 4.0)
+
+
+@pytest.mark.postgres
+def test_reassign_and_merge_refresh_cached_statistics(client, answered):
+    staff, _ = answered
+    assert score(client, staff, accelerator="hse") == (0, None)
+    client.post("/accelerators/bulk/reassign", json={"source": "MIPT", "target": "HSE"}, headers=staff)
+    assert score(client, staff, accelerator="mipt") == (0, None)
+    assert score(client, staff, accelerator="hse") == (2, 3.0)
+
+    client.post("/accelerators/bulk/merge", json={"target": "MIPT", "duplicates": ["HSE"]}, headers=staff)
+    assert score(client, staff, accelerator="mipt") == (2, 3.0)
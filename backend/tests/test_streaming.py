@@ -0,0 +1,56 @@
+import orjson
+import pytest
+from sqlalchemy import select
+from src.auth.schemas import Role
+from src.accelerator.models import Accelerator
+from src.core.streaming import StreamFormat, stream_rows
+
+pytestmark = pytest.mark.postgres
+
+
+async def collect(query, fmt, batch_size):
+    return [chunk async for chunk in stream_rows(query, fmt, batch_size)]
+
+
+@pytest.fixture
+def accelerators(sql):
+    sql("INSERT INTO accelerators (university, slug, is_active, created_at, updated_at) "
+        "SELECT 'University ' || n, 'university-' || n, true, now(), now() FROM generate_series(1, 7) n")
+
+
+@pytest.mark.anyio
+async def test_ndjson_streams_every_row_in_bounded_batches(accelerators):
+    query = select(Accelerator.id, Accelerator.university).order_by(Accelerator.id)
+    chunks = await collect(query, StreamFormat.NDJSON, batch_size=3)
+    assert [chunk.count(b"\n") for chunk in chunks] == [3, 3, 1]
+    rows = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["university"] for row in rows] == [f"University {n}" for n in range(1, 8)]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("batch_size", [1, 3, 500])
+async def test_json_array_is_valid_at_any_batch_size(accelerators, batch_size):
+    query = select(Accelerator.id).order_by(Accelerator.id)
+    body = b"".join(await collect(query, StreamFormat.JSON, batch_size))
+    assert orjson.loads(body) == [{"id": n} for n in range(1, 8)]
+
+
+@pytest.mark.anyio
+async def test_empty_result_is_an_empty_array(postgres):
+    query = select(Accelerator.id)
+    assert b"".join(await collect(query, StreamFormat.JSON, 10)) == b"[]"
+    assert await collect(query, StreamFormat.NDJSON, 10) == []
+
+
+def test_answer_export_streams_the_scoped_project(client, make_user, questions):
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Hydroponics", "type": "research"}, headers=headers).json()
+    client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Grow lettuce"},
+    ])
+    response = client.get(f"/projects/{project['id']}/research/answers/export", headers=headers)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line)["answer_text"] for line in response.content.splitlines()] == ["Grow lettuce"]
+
+    _, stranger = make_user(Role.student)
+    assert client.get(f"/projects/{project['id']}/research/answers/export", headers=stranger).status_code == 403
@@ -0,0 +1,142 @@
+import re
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError
+from src.auth.schemas import Role
+from src.db import unit_of_work
+from src.db.unit_of_work import UnitOfWorkRoute
+from src.project.project_research import routes as research_routes
+
+
+class DriverError(Exception):
+    def __init__(self, sqlstate: str):
+        self.sqlstate = sqlstate
+
+
+def failing_app(sqlstate: str, failures: int):
+    """An app whose one route fails `failures` times with `sqlstate`"""
+    router = APIRouter(route_class=UnitOfWorkRoute)
+    attempts = []
+
+    @router.post("/")
+    async def handler(payload: dict):
+        attempts.append(payload)
+        if len(attempts) <= failures:
+            raise DBAPIError("COMMIT", None, DriverError(sqlstate))
+        return {"attempts": len(attempts)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app, raise_server_exceptions=False), attempts
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(unit_of_work, "RETRY_BASE_DELAY", 0)
+
+
+@pytest.mark.parametrize("sqlstate", ["40001", "40P01"])
+def test_serialization_failures_rerun_the_request(sqlstate):
+    client, attempts = failing_app(sqlstate, failures=2)
+    response = client.post("/", json={"n": 1})
+    assert response.json() == {"attempts": 3}
+    # the body is read again on every attempt
+    assert attempts == [{"n": 1}] * 3
+
+
+def test_retries_stop_after_max_attempts():
+    client, attempts = failing_app("40001", failures=unit_of_work.MAX_ATTEMPTS)
+    assert client.post("/", json={}).status_code == 500
+    assert len(attempts) == unit_of_work.MAX_ATTEMPTS
+
+
+def test_other_database_errors_are_not_retried():
+    client, attempts = failing_app("23505", failures=1)
+    assert client.post("/", json={}).status_code == 500
+    assert len(attempts) == 1
+
+
+@pytest.mark.postgres
+def test_handlers_let_serialization_failures_reach_the_retry(client, make_user, questions, monkeypatch):
+    # save_answers turns other errors into 400s; this one must be retried instead
+    calls = []
+
+    async def deadlocked_once(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise DBAPIError("INSERT", None, DriverError("40P01"))
+        return await save_research_answers(*args)
+
+    save_research_answers = research_routes.save_research_answers
+    monkeypatch.setattr(research_routes, "save_research_answers", deadlocked_once)
+    _, headers = make_user(Role.student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=headers).json()
+    response = client.post(f"/projects/{project['id']}/research/answers", headers=headers, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Dry timber"},
+    ])
+    assert response.status_code == 200 and len(response.json()) == 1
+    assert len(calls) == 2
+
+
+def round_trips(response) -> int:
+    assert response.is_success, response.text
+    return int(re.search(r'"(\d+) round trips"', response.headers["server-timing"]).group(1))
+
+
+@pytest.mark.postgres
+def test_round_trips_per_write(client, make_user, sql, questions):
+    trips = {}
+    register = client.post("/auth/register", json={"email": "ada@example.com", "password": "Secret123",
+                                                    "role": "student"})
+    trips["POST /auth/register"] = round_trips(register)
+    token = sql("SELECT token FROM verification_tokens")[0][0]
+    trips["POST /auth/verify-email"] = round_trips(client.post("/auth/verify-email", params={"token": token}))
+    trips["POST /auth/request-password-reset"] = round_trips(
+        client.post("/auth/request-password-reset", params={"email": "ada@example.com"}))
+    token = sql("SELECT token FROM password_reset_tokens")[0][0]
+    trips["POST /auth/reset-password"] = round_trips(
+        client.post("/auth/reset-password", json={"token": token, "new_password": "Secret456"}))
+
+    _, admin = make_user(Role.admin)
+    client.get("/projects/", headers=admin)  # caches the user, as on any warm worker
+    trips["POST /profile/"] = round_trips(client.post("/profile/", json={"name": "Ada"}, headers=admin))
+    trips["PATCH /profile/"] = round_trips(client.patch("/profile/", json={"surname": "L"}, headers=admin))
+    trips["DELETE /profile/"] = round_trips(client.delete("/profile/", headers=admin))
+    trips["POST /accelerators/"] = round_trips(client.post("/accelerators/", json={"university": "MIPT"},
+                                                           headers=admin))
+    trips["PUT /accelerators/{ref}"] = round_trips(client.put("/accelerators/mipt", json={"description": "x"},
+                                                              headers=admin))
+    trips["POST /accelerators/{ref}/toggle-status"] = round_trips(
+        client.post("/accelerators/mipt/toggle-status", headers=admin))
+
+    _, student = make_user(Role.student)
+    client.get("/projects/", headers=student)
+    project = client.post("/projects/", json={"name": "Kiln", "type": "research"}, headers=student)
+    trips["POST /projects/"] = round_trips(project)
+    base = f"/projects/{project.json()['id']}/research"
+    client.get(f"{base}/", headers=student)
+    trips["POST /projects/{id}/research/answers"] = round_trips(client.post(f"{base}/answers", headers=student, json=[
+        {"question_id": questions["planning.stage_1.goal"], "answer_text": "Dry timber"},
+        {"question_id": questions["planning.stage_1.method"], "answer_text": "survey"},
+    ]))
+    trips["POST /projects/{id}/research/progress"] = round_trips(client.post(
+        f"{base}/progress", params={"next_phase": "planning", "next_stage": "stage_2"}, headers=student))
+
+    # statements + BEGIN/COMMIT, as reported in Server-Timing
+    assert trips == {
+        "POST /auth/register": 7,
+        "POST /auth/verify-email": 7,
+        "POST /auth/request-password-reset": 6,
+        "POST /auth/reset-password": 7,
+        "POST /profile/": 5,
+        "PATCH /profile/": 4,
+        "DELETE /profile/": 3,
+        "POST /accelerators/": 5,
+        "PUT /accelerators/{ref}": 7,
+        "POST /accelerators/{ref}/toggle-status": 6,
+        "POST /projects/": 3,
+        "POST /projects/{id}/research/answers": 8,
+        "POST /projects/{id}/research/progress": 7,
+    }